@@ -0,0 +1,9 @@
+"""
+Benchmarks for the fuzzy matcher.
+
+synthetic_data generates input and master sheets of any size with controlled
+perturbations; run_benchmarks times the matching pipeline on them.
+
+Usage:
+    python -m benchmarks.run_benchmarks --sizes 1k 100k
+"""
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Benchmark the matching pipeline on synthetic sheets.
+
+For every master size, match type and engine mode, runs the matcher in a fresh process
+and reports throughput (input rows/sec), p50/p99 per-query latency, peak RSS and recall
+against the known source rows.
+
+The 1M master size takes a long time with the default 1000 input rows; lower --input-rows
+for a quick run.
+
+Usage:
+    python -m benchmarks.run_benchmarks
+    python -m benchmarks.run_benchmarks --sizes 1k 100k --modes serial blocked --json bench.json
+"""
+
+import argparse
+import importlib.util
+import json
+import logging
+import multiprocessing
+import os
+import pickle
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from benchmarks.synthetic_data import MASTER_SIZES, generate_sheets
+from fuzzy_matcher import MATCH_TYPES, MasterIndex, preprocess_data, run_all_matches
+
+# run_all_matches options per engine mode
+ENGINE_MODES = {
+    'serial': {},
+    'blocked': {'blocking': ('zip5', 'last_soundex')},
+    'parallel': {'workers': os.cpu_count() or 1},
+    'tfidf': {'candidate_method': 'tfidf'},
+}
+# Optional modules an engine mode needs; modes without them are skipped
+MODE_REQUIREMENTS = {'tfidf': 'sklearn'}
+DEFAULT_INPUT_ROWS = 1000
+DEFAULT_LATENCY_SAMPLES = 100  # Single-row queries timed for the latency percentiles
+
+
+def peak_rss_mb() -> float:
+    """Peak resident memory of this process or any of its finished children, in MB."""
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # ru_maxrss is in bytes on macOS and in kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_case(data_path: str, match_type: str, mode: str, latency_samples: int) -> dict:
+    """Time one match type in one engine mode; meant to run in a fresh process.
+
+    Args:
+        data_path (str): Pickle of (input_raw, master_raw, source_rows) from generate_sheets.
+        match_type (str): Match type to run.
+        mode (str): Engine mode (see ENGINE_MODES).
+        latency_samples (int): Number of single-row queries to time.
+
+    Returns:
+        dict: Measurements for the report.
+    """
+    logging.disable(logging.INFO)
+    with open(data_path, 'rb') as f:
+        input_raw, master_raw, source_rows = pickle.load(f)
+    options = ENGINE_MODES[mode]
+
+    df1 = preprocess_data(input_raw)
+    master = MasterIndex(preprocess_data(master_raw))
+
+    start = time.perf_counter()
+    results = run_all_matches(df1, master, [match_type], **options)[match_type]
+    seconds = time.perf_counter() - start
+
+    # Latency of single-row queries against the already prepared master. Worker processes
+    # are not used for a single row, so 'parallel' measures the serial per-query path.
+    positions = np.random.default_rng(0).choice(len(df1), size=min(latency_samples, len(df1)), replace=False)
+    latencies = []
+    for position in positions:
+        query_start = time.perf_counter()
+        run_all_matches(df1.iloc[[position]], master, [match_type], **options)
+        latencies.append(time.perf_counter() - query_start)
+
+    # A match counts as found if it has the same search string as the source row, since
+    # synthetic names repeat and identical master rows cannot be told apart
+    matched = dict(zip(results['Sheet A Row'] - 2, results['Sheet B Row'] - 2)) if not results.empty else {}
+    search_strings = master.search_strings(match_type)
+    expected = [(row, source) for row, source in enumerate(source_rows) if source >= 0]
+    found = sum(row in matched and search_strings[matched[row]] == search_strings[source]
+                for row, source in expected)
+    return {
+        'master_rows': len(master),
+        'input_rows': len(df1),
+        'match_type': match_type,
+        'mode': mode,
+        'seconds': round(seconds, 3),
+        'rows_per_sec': round(len(df1) / seconds, 1) if seconds > 0 else None,
+        'p50_ms': round(float(np.percentile(latencies, 50)) * 1000, 2) if latencies else None,
+        'p99_ms': round(float(np.percentile(latencies, 99)) * 1000, 2) if latencies else None,
+        'matches': len(results),
+        'recall': round(found / len(expected), 4) if expected else None,
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+    }
+
+
+def available_modes(modes: Sequence[str]) -> List[str]:
+    """Drop the engine modes whose optional requirement is not installed, with a warning."""
+    available = []
+    for mode in modes:
+        module = MODE_REQUIREMENTS.get(mode)
+        if module is not None and importlib.util.find_spec(module) is None:
+            logging.warning(f"Skipping the {mode} mode: {module} is not installed")
+        else:
+            available.append(mode)
+    return available
+
+
+def run_benchmarks(sizes: Sequence[str] = tuple(MASTER_SIZES), match_types: Sequence[str] = MATCH_TYPES,
+                   modes: Sequence[str] = tuple(ENGINE_MODES), input_rows: int = DEFAULT_INPUT_ROWS,
+                   latency_samples: int = DEFAULT_LATENCY_SAMPLES, seed: int = 0) -> List[Dict]:
+    """Run every size / match type / engine mode combination, each in a fresh process.
+
+    A fresh process per case keeps peak RSS and warm caches from leaking between cases.
+
+    Args:
+        sizes (Sequence[str]): Master sizes from MASTER_SIZES ('1k', '100k', '1M').
+        match_types (Sequence[str]): Match types to benchmark.
+        modes (Sequence[str]): Engine modes from ENGINE_MODES. Modes whose requirement
+            (MODE_REQUIREMENTS) is not installed are skipped with a warning.
+        input_rows (int): Input rows per case.
+        latency_samples (int): Single-row queries timed per case.
+        seed (int): Random seed for the synthetic sheets.
+
+    Returns:
+        List[Dict]: One measurement dict per case, in run order.
+    """
+    modes = available_modes(modes)
+    context = multiprocessing.get_context('spawn')
+    report = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in sizes:
+            print(f"Generating {size} master rows and {input_rows} input rows...")
+            data_path = os.path.join(tmp_dir, f'sheets_{size}.pkl')
+            with open(data_path, 'wb') as f:
+                pickle.dump(generate_sheets(MASTER_SIZES[size], input_rows, seed=seed), f)
+            for match_type in match_types:
+                for mode in modes:
+                    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                        result = pool.submit(run_case, data_path, match_type, mode, latency_samples).result()
+                    result['size'] = size
+                    print(format_row(result))
+                    report.append(result)
+    return report
+
+
+def format_row(result: dict) -> str:
+    """Format one measurement as a line of the report table."""
+    recall = '-' if result['recall'] is None else f"{result['recall']:.1%}"
+    return (f"{result['size']:>5} {result['match_type']:<16} {result['mode']:<9} "
+            f"{result['rows_per_sec']:>10} rows/s  p50 {result['p50_ms']:>8} ms  p99 {result['p99_ms']:>8} ms  "
+            f"peak {result['peak_rss_mb']:>8} MB  {result['matches']:>6} matches  recall {recall}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the fuzzy matcher on synthetic sheets.")
+    parser.add_argument('--sizes', nargs='+', choices=list(MASTER_SIZES), default=list(MASTER_SIZES),
+                        help="Master sizes to run")
+    parser.add_argument('--match-types', nargs='+', choices=MATCH_TYPES, default=MATCH_TYPES)
+    parser.add_argument('--modes', nargs='+', choices=list(ENGINE_MODES), default=list(ENGINE_MODES),
+                        help="Engine modes to run")
+    parser.add_argument('--input-rows', type=int, default=DEFAULT_INPUT_ROWS)
+    parser.add_argument('--latency-samples', type=int, default=DEFAULT_LATENCY_SAMPLES)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', help="Also write the measurements to this JSON file")
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.sizes, args.match_types, args.modes, args.input_rows,
+                            args.latency_samples, args.seed)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Measurements saved to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""
+Synthetic input and master sheets for benchmarking the fuzzy matcher.
+
+The master sheet uses the master workbook's column names (FirstName, LastName, Address,
+Address 2, ..., Zip5) and the input sheet the input workbook's (First_Name, Last_Name,
+Address1, ..., Zip), so both go through preprocess_data exactly like real sheets. Most input
+rows are copies of a master row with one controlled perturbation applied, and the source
+row of each is returned so benchmarks can also report recall.
+"""
+
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Master sizes the benchmark runner knows by name
+MASTER_SIZES = {'1k': 1_000, '100k': 100_000, '1M': 1_000_000}
+
+FIRST_NAMES = [
+    'JOHN', 'MARY', 'ROBERT', 'PATRICIA', 'MICHAEL', 'LINDA', 'WILLIAM', 'BARBARA', 'DAVID',
+    'ELIZABETH', 'RICHARD', 'JENNIFER', 'JOSEPH', 'MARIA', 'THOMAS', 'SUSAN', 'CHARLES', 'MARGARET',
+    'CHRISTOPHER', 'DOROTHY', 'DANIEL', 'LISA', 'MATTHEW', 'NANCY', 'ANTHONY', 'KAREN', 'MARK',
+    'BETTY', 'DONALD', 'HELEN', 'STEVEN', 'SANDRA', 'PAUL', 'DONNA', 'ANDREW', 'CAROL', 'JOSHUA',
+    'RUTH', 'KENNETH', 'SHARON', 'KEVIN', 'MICHELLE', 'BRIAN', 'LAURA', 'GEORGE', 'SARAH', 'EDWARD',
+    'KIMBERLY', 'RONALD', 'DEBORAH', 'TIMOTHY', 'JESSICA', 'JASON', 'SHIRLEY', 'JEFFREY', 'CYNTHIA',
+    'RYAN', 'ANGELA', 'JACOB', 'MELISSA', 'GARY', 'BRENDA', 'NICHOLAS', 'AMY', 'ERIC', 'ANNA',
+    'HENRY', 'ALICE', 'VALERIE', 'PAT',
+]
+LAST_NAMES = [
+    'SMITH', 'JOHNSON', 'WILLIAMS', 'BROWN', 'JONES', 'GARCIA', 'MILLER', 'DAVIS', 'RODRIGUEZ',
+    'MARTINEZ', 'HERNANDEZ', 'LOPEZ', 'GONZALEZ', 'WILSON', 'ANDERSON', 'THOMAS', 'TAYLOR', 'MOORE',
+    'JACKSON', 'MARTIN', 'LEE', 'PEREZ', 'THOMPSON', 'WHITE', 'HARRIS', 'SANCHEZ', 'CLARK', 'RAMIREZ',
+    'LEWIS', 'ROBINSON', 'WALKER', 'YOUNG', 'ALLEN', 'KING', 'WRIGHT', 'SCOTT', 'TORRES', 'NGUYEN',
+    'HILL', 'FLORES', 'GREEN', 'ADAMS', 'NELSON', 'BAKER', 'HALL', 'RIVERA', 'CAMPBELL', 'MITCHELL',
+    'CARTER', 'ROBERTS', 'GOMEZ', 'PHILLIPS', 'EVANS', 'TURNER', 'DIAZ', 'PARKER', 'CRUZ', 'EDWARDS',
+    'COLLINS', 'REYES', 'STEWART', 'MORRIS', 'MORALES', 'MURPHY', 'COOK', 'ROGERS', 'GUTIERREZ',
+    'ORTIZ', 'MORGAN', 'COOPER', 'PETERSON', 'BAILEY', 'REED', 'KELLY', 'HOWARD', 'RAMOS', 'KIM',
+    'COX', 'WARD', 'RICHARDSON', 'CARTELL', 'HAUSMANN', 'FULLER',
+]
+STREET_NAMES = [
+    'MAIN', 'CHURCH', 'FLANDERS', 'HAZELNUT HILL', 'ALICE', 'VALERIE', 'CHAPMAN', 'MARION', 'ROMA',
+    'OAK', 'ELM', 'PINE', 'MAPLE', 'CEDAR', 'WASHINGTON', 'LAKE', 'HILL', 'PARK', 'SPRING', 'RIVER',
+    'HIGH', 'SCHOOL', 'MILL', 'WATER', 'BRIDGE', 'CENTER', 'UNION', 'PROSPECT', 'PLEASANT', 'JEFFERSON',
+    'LINCOLN', 'FRANKLIN', 'LAUREL', 'WILLOW', 'BIRCH', 'CHESTNUT', 'SUNSET', 'MEADOW', 'ORCHARD',
+    'FOREST', 'HARBOR', 'OCEAN', 'BAYVIEW', 'COLONIAL', 'LIBERTY', 'QUAKER HILL', 'BOSTON POST',
+    'NORWICH NEW LONDON', 'PEQUOT', 'GOLD STAR',
+]
+# (abbreviated, spelled out) street suffixes; either form may appear in a sheet
+STREET_SUFFIXES = [
+    ('ST', 'STREET'), ('RD', 'ROAD'), ('DR', 'DRIVE'), ('AVE', 'AVENUE'), ('LN', 'LANE'),
+    ('CT', 'COURT'), ('TPKE', 'TURNPIKE'), ('HWY', 'HIGHWAY'),
+]
+CITIES = [
+    ('MYSTIC', 'CT', '06355'), ('NEW LONDON', 'CT', '06320'), ('NORWICH', 'CT', '06360'),
+    ('GROTON', 'CT', '06340'), ('OLD SAYBROOK', 'CT', '06475'), ('WATERFORD', 'CT', '06385'),
+    ('WESTERLY', 'RI', '02891'), ('PROVIDENCE', 'RI', '02903'), ('BOSTON', 'MA', '02101'),
+    ('WORCESTER', 'MA', '01608'), ('NEWARK', 'NJ', '07102'), ('VENICE', 'FL', '34285'),
+    ('ALBANY', 'NY', '12207'), ('BURLINGTON', 'VT', '05401'),
+]
+DESIGNATOR_TYPES = ['APT', 'UNIT', 'TRLR', 'LOT', 'STE']
+DESIGNATOR_RATE = 0.2  # Share of master addresses with an APT/UNIT/TRLR/... designator
+
+PERTURBATIONS = ('typo', 'street_suffix', 'zip_zero', 'designator', 'house_number')
+LETTERS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+
+def generate_master(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    """Generate a master sheet with random people and addresses.
+
+    Args:
+        n_rows (int): Number of master rows.
+        seed (int): Random seed; the same seed always gives the same sheet.
+
+    Returns:
+        pd.DataFrame: Master sheet with FirstName, LastName, Address, Address 2, City,
+        State and Zip5 columns.
+    """
+    rng = np.random.default_rng(seed)
+    suffixes = np.array(STREET_SUFFIXES)
+    suffix_rows = rng.integers(len(STREET_SUFFIXES), size=n_rows)
+    spelled_out = rng.random(n_rows) < 0.3
+    suffix = np.where(spelled_out, suffixes[suffix_rows, 1], suffixes[suffix_rows, 0])
+    cities = np.array(CITIES)[rng.integers(len(CITIES), size=n_rows)]
+
+    house_numbers = pd.Series(rng.integers(1, 2000, size=n_rows)).astype(str)
+    streets = pd.Series(np.array(STREET_NAMES)[rng.integers(len(STREET_NAMES), size=n_rows)])
+    designators = (pd.Series(np.array(DESIGNATOR_TYPES)[rng.integers(len(DESIGNATOR_TYPES), size=n_rows)]) + ' '
+                   + pd.Series(rng.integers(1, 40, size=n_rows)).astype(str))
+    has_designator = rng.random(n_rows) < DESIGNATOR_RATE
+
+    return pd.DataFrame({
+        'FirstName': np.array(FIRST_NAMES)[rng.integers(len(FIRST_NAMES), size=n_rows)],
+        'LastName': np.array(LAST_NAMES)[rng.integers(len(LAST_NAMES), size=n_rows)],
+        'Address': house_numbers + ' ' + streets + ' ' + suffix,
+        'Address 2': designators.where(has_designator, ''),
+        'City': cities[:, 0],
+        'State': cities[:, 1],
+        'Zip5': cities[:, 2],
+    })
+
+
+def add_typo(text: str, rng: np.random.Generator) -> str:
+    """Delete, insert, replace or swap one character of text."""
+    if len(text) < 2:
+        return text + LETTERS[rng.integers(len(LETTERS))]
+    i = int(rng.integers(len(text) - 1))
+    letter = LETTERS[rng.integers(len(LETTERS))]
+    kind = rng.integers(4)
+    if kind == 0:
+        return text[:i] + text[i + 1:]
+    if kind == 1:
+        return text[:i] + letter + text[i:]
+    if kind == 2:
+        return text[:i] + letter + text[i + 1:]
+    return text[:i] + text[i + 1] + text[i] + text[i + 2:]
+
+
+def switch_street_suffix(address: str) -> str:
+    """Swap an abbreviated street suffix for the spelled out one, or back (ST <-> STREET)."""
+    words = address.split(' ')
+    for i, word in enumerate(words):
+        for short, long in STREET_SUFFIXES:
+            if word in (short, long):
+                words[i] = long if word == short else short
+                return ' '.join(words)
+    return address
+
+
+def perturb_record(record: Dict[str, str], kind: str, rng: np.random.Generator) -> Dict[str, str]:
+    """Apply one perturbation to an input record.
+
+    Args:
+        record (Dict[str, str]): Input record with First_Name, Last_Name, Address1, City,
+            State and Zip.
+        kind (str): One of PERTURBATIONS:
+            'typo' - one-character typo in the first name, last name or address.
+            'street_suffix' - ST/STREET, RD/ROAD, ... switched.
+            'zip_zero' - leading zeros dropped (06355 -> 6355), or a ZIP+4 added.
+            'designator' - designator type or number changed, or one added.
+            'house_number' - house number moved by 1, 2 or 5.
+        rng (np.random.Generator): Random generator.
+
+    Returns:
+        Dict[str, str]: The perturbed copy.
+    """
+    record = dict(record)
+    if kind == 'typo':
+        field = ('First_Name', 'Last_Name', 'Address1')[rng.integers(3)]
+        record[field] = add_typo(record[field], rng)
+    elif kind == 'street_suffix':
+        record['Address1'] = switch_street_suffix(record['Address1'])
+    elif kind == 'zip_zero':
+        stripped = record['Zip'].lstrip('0')
+        record['Zip'] = stripped if stripped != record['Zip'] else f"{record['Zip']}-{rng.integers(1000, 10000)}"
+    elif kind == 'designator':
+        words = record['Address1'].split(' ')
+        if len(words) >= 2 and words[-2] in DESIGNATOR_TYPES:
+            if rng.random() < 0.5:
+                words[-2] = DESIGNATOR_TYPES[(DESIGNATOR_TYPES.index(words[-2]) + 1) % len(DESIGNATOR_TYPES)]
+            else:
+                words[-1] = str(int(words[-1]) + 1)
+        else:
+            words += [DESIGNATOR_TYPES[rng.integers(len(DESIGNATOR_TYPES))], str(rng.integers(1, 40))]
+        record['Address1'] = ' '.join(words)
+    elif kind == 'house_number':
+        number, rest = record['Address1'].split(' ', 1)
+        record['Address1'] = f"{max(1, int(number) + int(rng.choice([-5, -2, -1, 1, 2, 5])))} {rest}"
+    else:
+        raise ValueError(f"Unknown perturbation: {kind}")
+    return record
+
+
+def generate_input(master: pd.DataFrame, n_rows: int, match_rate: float = 0.8,
+                   seed: int = 1) -> Tuple[pd.DataFrame, np.ndarray]:
+    """Generate an input sheet from perturbed copies of master rows.
+
+    Args:
+        master (pd.DataFrame): Master sheet from generate_master.
+        n_rows (int): Number of input rows.
+        match_rate (float): Share of input rows copied from the master; the rest are new people.
+        seed (int): Random seed.
+
+    Returns:
+        Tuple[pd.DataFrame, np.ndarray]: Input sheet with First_Name, Last_Name, Address1,
+        City, State and Zip columns, and the master row each input row was copied from
+        (-1 for new people).
+    """
+    rng = np.random.default_rng(seed)
+    source_rows = np.where(rng.random(n_rows) < match_rate, rng.integers(len(master), size=n_rows), -1)
+    strangers = generate_master(n_rows, seed=seed + 1)
+
+    records = []
+    for position, source_row in enumerate(source_rows):
+        row = master.iloc[source_row] if source_row >= 0 else strangers.iloc[position]
+        record = {
+            'First_Name': row['FirstName'],
+            'Last_Name': row['LastName'],
+            'Address1': f"{row['Address']} {row['Address 2']}".strip(),
+            'City': row['City'],
+            'State': row['State'],
+            'Zip': row['Zip5'],
+        }
+        if source_row >= 0:
+            record = perturb_record(record, PERTURBATIONS[rng.integers(len(PERTURBATIONS))], rng)
+        records.append(record)
+    return pd.DataFrame(records), source_rows
+
+
+def generate_sheets(master_rows: int, input_rows: int, match_rate: float = 0.8,
+                    seed: int = 0) -> Tuple[pd.DataFrame, pd.DataFrame, np.ndarray]:
+    """Generate a matching pair of input and master sheets.
+
+    Args:
+        master_rows (int): Number of master rows (see MASTER_SIZES).
+        input_rows (int): Number of input rows.
+        match_rate (float): Share of input rows copied from the master.
+        seed (int): Random seed.
+
+    Returns:
+        Tuple[pd.DataFrame, pd.DataFrame, np.ndarray]: Input sheet, master sheet, and the
+        source master row of each input row (-1 for none).
+
+    Example:
+        >>> input_raw, master_raw, source_rows = generate_sheets(MASTER_SIZES['100k'], 1000)
+        >>> df1, df2 = preprocess_data(input_raw), preprocess_data(master_raw)
+    """
+    master = generate_master(master_rows, seed=seed)
+    input_df, source_rows = generate_input(master, input_rows, match_rate, seed=seed + 1)
+    return input_df, master, source_rows
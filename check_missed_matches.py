@@ -1,8 +1,8 @@
 #!/usr/bin/env python3
 """Check if we're missing legitimate matches due to strict thresholds or other issues."""
 
-import pandas as pd
-from fuzzy_matcher import run_specific_match, preprocess_data
+from fuzzy_matcher import ScoreStore, run_all_matches, preprocess_data
+from workbook_reader import read_data_sheets, read_result_sheets
 
 def analyze_missed_matches():
     """Analyze rows that didn't get matches to see if we missed legitimate ones."""
@@ -10,11 +10,8 @@ def analyze_missed_matches():
     try:
         print("🔍 Analyzing potential missed matches...")
         
-        # Read the actual data sheets
-        all_sheets = pd.read_excel('FuzzyMatch_Tool.xlsm', sheet_name=None, engine='openpyxl')
-        
-        # Find data sheets (not results)
-        data_sheets = {name: df for name, df in all_sheets.items() if not name.startswith('results_')}
+        # Read the actual data sheets (not results)
+        data_sheets = read_data_sheets('FuzzyMatch_Tool.xlsm')
         sheet_names = list(data_sheets.keys())
         
         if len(sheet_names) < 2:
@@ -52,6 +49,11 @@ def analyze_missed_matches():
         current_thresholds = [85.0, 75.0, 80.0]
         test_thresholds = [70.0, 60.0, 65.0]  # Much lower
         
+        # Score once at the lower thresholds; the current thresholds are re-evaluated from the store
+        store = ScoreStore()
+        run_all_matches(df_input, df_master, match_types, dict(zip(match_types, test_thresholds)),
+                        score_store=store)
+        
         for i, match_type in enumerate(match_types):
             print(f"\n{'='*50}")
             print(f"ANALYZING {match_type.upper()}")
@@ -61,10 +63,10 @@ def analyze_missed_matches():
             test_thresh = test_thresholds[i]
             
             # Get results with current threshold
-            current_results = run_specific_match(df_input, df_master, match_type, current_thresh)
+            current_results = store.evaluate(match_type, current_thresh)
             
             # Get results with lower threshold  
-            test_results = run_specific_match(df_input, df_master, match_type, test_thresh)
+            test_results = store.evaluate(match_type, test_thresh)
             
             print(f"Current threshold ({current_thresh}%): {len(current_results)} matches")
             print(f"Lower threshold ({test_thresh}%): {len(test_results)} matches")
@@ -97,7 +99,7 @@ def analyze_missed_matches():
         print(f"{'='*50}")
         
         # Read results to see which input rows got matches
-        results_sheets = {name: df for name, df in all_sheets.items() if name.startswith('results_')}
+        results_sheets = read_result_sheets('FuzzyMatch_Tool.xlsm', columns=['Sheet A Row'])
         
         for match_type in match_types:
             results_name = f'results_{match_type}'
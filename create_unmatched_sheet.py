@@ -1,8 +1,15 @@
 #!/usr/bin/env python3
-"""Create a new sheet with all unmatched rows from the small input sheet."""
+"""Create a new sheet with all unmatched rows from the small input sheet.
 
+The matcher writes this Unmatched_Rows sheet with its results; this script adds it to a
+workbook whose results_* sheets came from an earlier run.
+"""
+
+import numpy as np
 import pandas as pd
 import xlwings as xw
+from fuzzy_matcher import unmatched_rows as build_unmatched_rows
+from workbook_reader import read_data_sheets, read_result_sheets
 
 def create_unmatched_sheet():
     """Create a sheet with rows from small sheet that didn't match anything."""
@@ -10,11 +17,8 @@ def create_unmatched_sheet():
     try:
         print("🔍 Reading data to find unmatched rows...")
         
-        # Read all sheets from the workbook
-        all_sheets = pd.read_excel('FuzzyMatch_Tool.xlsm', sheet_name=None, engine='openpyxl')
-        
-        # Find data sheets (not results)
-        data_sheets = {name: df for name, df in all_sheets.items() if not name.startswith('results_')}
+        # Read data sheets (not results), keeping every column for the unmatched sheet
+        data_sheets = read_data_sheets('FuzzyMatch_Tool.xlsm', columns=None)
         sheet_names = list(data_sheets.keys())
         
         if len(sheet_names) < 2:
@@ -35,51 +39,37 @@ def create_unmatched_sheet():
             print(f"📝 Input sheet: {input_sheet_name} ({len(input_raw)} rows)")
         
         # Find all results sheets
-        results_sheets = {name: df for name, df in all_sheets.items() if name.startswith('results_')}
+        results_sheets = read_result_sheets('FuzzyMatch_Tool.xlsm', columns=['Sheet A Row'])
         print(f"📊 Found {len(results_sheets)} results sheets: {list(results_sheets.keys())}")
         
         if not results_sheets:
             print("❌ No results sheets found! Run the matching first.")
             return
         
-        # Collect all matched row numbers from all results sheets
-        all_matched_rows = set()
-        
         for sheet_name, results_df in results_sheets.items():
-            if not results_df.empty:
-                # Sheet A Row contains the input sheet row numbers (1-based with header)
-                matched_rows = set(results_df['Sheet A Row'].tolist())
-                all_matched_rows.update(matched_rows)
-                print(f"  {sheet_name}: {len(matched_rows)} matched rows")
-        
-        print(f"📈 Total unique matched rows across all sheets: {len(all_matched_rows)}")
+            print(f"  {sheet_name}: {results_df['Sheet A Row'].nunique()} matched rows")
         
-        # Convert to 0-based indexing (subtract 2 because Excel rows are 1-based and have header)
-        matched_indices = {row - 2 for row in all_matched_rows if row >= 2}
+        # Only the written results are available here, so read the matched rows back from
+        # Sheet A Row (1-based with header, so row - 2 is the input position)
+        matched = np.zeros(len(input_raw), dtype=bool)
+        for results_df in results_sheets.values():
+            if not results_df.empty:
+                positions = pd.to_numeric(results_df['Sheet A Row']).to_numpy(dtype=np.int64) - 2
+                matched[positions[(positions >= 0) & (positions < len(input_raw))]] = True
         
-        # Find unmatched rows (all input rows except the matched ones)
-        total_input_rows = set(range(len(input_raw)))
-        unmatched_indices = total_input_rows - matched_indices
+        # Same table the matcher now writes itself with every run
+        unmatched_rows = build_unmatched_rows(input_raw, matched)
+        matched_count = len(input_raw) - len(unmatched_rows)
         
         print(f"📋 Input rows analysis:")
         print(f"  Total input rows: {len(input_raw)}")
-        print(f"  Matched rows: {len(matched_indices)}")
-        print(f"  Unmatched rows: {len(unmatched_indices)} ({len(unmatched_indices)/len(input_raw)*100:.1f}%)")
+        print(f"  Matched rows: {matched_count}")
+        print(f"  Unmatched rows: {len(unmatched_rows)} ({len(unmatched_rows)/len(input_raw)*100:.1f}%)")
         
-        if not unmatched_indices:
+        if unmatched_rows.empty:
             print("✅ All input rows were matched! No unmatched sheet needed.")
             return
         
-        # Create DataFrame with unmatched rows
-        unmatched_rows = input_raw.iloc[list(unmatched_indices)].copy()
-        
-        # Add a column showing the original row number for reference
-        unmatched_rows['Original_Row_Number'] = [idx + 2 for idx in sorted(unmatched_indices)]  # +2 for Excel 1-based + header
-        
-        # Reorder columns to put Original_Row_Number first
-        cols = ['Original_Row_Number'] + [col for col in unmatched_rows.columns if col != 'Original_Row_Number']
-        unmatched_rows = unmatched_rows[cols]
-        
         print(f"📝 Created unmatched dataset with {len(unmatched_rows)} rows")
         print(f"   Sample unmatched rows:")
         for i, (idx, row) in enumerate(unmatched_rows.iterrows()):
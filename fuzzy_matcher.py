@@ -1,31 +1,140 @@
 import pandas as pd
+import numpy as np
 import logging
+import re
+import os
+import json
+import shutil
+import hashlib
+import heapq
+import sys
+import time
+from bisect import bisect_left
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
 from rapidfuzz import fuzz, process
-from typing import Tuple, Dict
+from typing import Callable, Tuple, Dict, List, Iterator, Sequence, NamedTuple, Optional, Union
+from instrumentation import StageEvent, StageTimer, active_timer, instrument, stage, timed_iter
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-def preprocess_data(df: pd.DataFrame) -> pd.DataFrame:
+# Candidate generation settings shared by every match type
+CANDIDATE_LIMIT = 10          # Top candidates per input row sent to verification
+CANDIDATE_CUTOFF_RATIO = 0.8  # Prefilter cutoff as a fraction of the match threshold
+CDIST_CELL_BUDGET = 8_000_000 # Max score-matrix cells per chunk (~64 MB of float64)
+SHARDS_PER_WORKER = 4         # Input shards per worker process, to balance uneven shards
+FIELD_CACHE_SIZE = 100_000    # Max memoized value pairs per field scorer (names, addresses)
+
+# Candidate generators: 'cdist' scores every master string, 'tfidf' searches n-gram neighbors
+CANDIDATE_METHODS = ('cdist', 'tfidf')
+TFIDF_NGRAM_RANGE = (2, 4)    # Character n-gram sizes, as in cosine_similarity_test.py
+TFIDF_NEIGHBORS = 30          # Nearest neighbors re-scored with token_set_ratio per query
+
+# Column name variations in source sheets, mapped to the standard names
+COLUMN_MAP = {
+    'FirstName': 'First_Name',
+    'LastName': 'Last_Name',
+    'Address': 'Address1',
+    'Zip5': 'Zip'
+}
+# Every source column preprocess_data reads, under any of its names
+SOURCE_COLUMNS = ['First_Name', 'Last_Name', 'Address1', 'Address 2', 'City', 'State', 'Zip'] + list(COLUMN_MAP)
+# Text columns preprocess_data fills, upper-cases and strips
+TEXT_COLUMNS = ['First_Name', 'Last_Name', 'Address1', 'City', 'State', 'Zip']
+
+# Preprocessing engines: 'auto' picks 'arrow' when pyarrow is installed, else 'pandas'
+PREPROCESS_ENGINES = ('auto', 'pandas', 'arrow')
+PREPROCESS_CHUNK_ROWS = 250_000  # Rows preprocessed at a time, bounding the intermediate copies
+ASCII_WHITESPACE = ' \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f'  # Characters str.strip() removes from ASCII text
+
+# Match types and their default minimum scores
+MATCH_TYPES = ['FullName', 'LastNameAddress', 'FullAddress']
+DEFAULT_THRESHOLDS = {
+    'FullName': 85.0,        # High threshold - we want actual name matches
+    'LastNameAddress': 75.0, # Medium threshold - addresses can vary
+    'FullAddress': 80.0      # High threshold - we want actual address matches, not geographic area
+}
+# First, last and address weights each match type's combined score is equivalent to
+DEFAULT_WEIGHTS = {
+    'FullName': (0.5, 0.5, 0.0),
+    'LastNameAddress': (0.0, 0.5, 0.5),
+    'FullAddress': (0.0, 0.0, 1.0),
+}
+
+# Address parsing patterns, compiled once
+HOUSE_NUMBER_PATTERN = re.compile(r'^\d+')
+HOUSE_NUMBER_PREFIX_PATTERN = re.compile(r'^\d+\s*')
+# Property designators (apartments, units, trailers, lots, etc.)
+# Must be preceded by space and followed by space+number to avoid matching parts of street names
+DESIGNATOR_PATTERN = re.compile(
+    r'\s(APT|APARTMENT|UNIT|TRLR|TRAILER|LOT|BLDG|BUILDING|STE|SUITE|FLOOR|FL|RM|ROOM|SPACE|SPC|#)\s+([A-Z0-9]+)',
+    re.IGNORECASE
+)
+STREET_ABBREVIATIONS = [
+    (' STREET', ' ST'), (' ROAD', ' RD'), (' AVENUE', ' AVE'), (' LANE', ' LN'),
+    (' DRIVE', ' DR'), (' COURT', ' CT'), (' PLACE', ' PL'),
+]
+# Parsed address columns added by preprocess_data
+ADDRESS_PART_COLUMNS = ['House_Number', 'Street_Name', 'Designator_Type', 'Designator_Value', 'Zip_Normalized']
+# Preprocessed columns every score is derived from; rows equal on these are duplicates
+RECORD_KEY_COLUMNS = ['First_Name', 'Last_Name', 'Address1', 'City', 'State', 'Zip']
+
+# Directory, next to the workbook, where master indexes are cached between runs
+MASTER_INDEX_DIRNAME = '.fuzzy_matcher_index'
+# Compact a master index once this fraction of its rows are tombstones (deleted, not yet removed)
+MAX_TOMBSTONE_FRACTION = 0.2
+# Subdirectory of a cached master index where ResultCache keeps results between runs
+RESULT_CACHE_DIRNAME = 'results'
+
+# Blocking keys supported by BlockingIndex
+BLOCKING_KEYS = ('zip5', 'zip3', 'state', 'last_soundex')
+
+# Soundex digit for each consonant; vowels and H/W/Y have no code
+SOUNDEX_CODES = {letter: digit for digit, letters in {
+    '1': 'BFPV', '2': 'CGJKQSXZ', '3': 'DT', '4': 'L', '5': 'MN', '6': 'R'
+}.items() for letter in letters}
+
+def preprocess_data(df: pd.DataFrame, engine: str = 'auto', chunk_rows: int = PREPROCESS_CHUNK_ROWS) -> pd.DataFrame:
     """Preprocess DataFrame by mapping column names, filling NaNs, and creating FullAddress without altering case or whitespace.
 
-    Handles variations in column names from different sheets.
+    Handles variations in column names from different sheets. Rows are processed in chunks,
+    so the intermediate copies of a multi-million-row sheet stay bounded; only the source
+    columns are copied at all.
 
     Args:
         df (pd.DataFrame): Input DataFrame with raw data.
+        engine (str): 'pandas' uses pandas string methods on object columns; 'arrow' uses
+            pyarrow string arrays and compute kernels, with the same values. 'auto' uses
+            arrow when pyarrow is installed (see PREPROCESS_ENGINES).
+        chunk_rows (int): Rows preprocessed at a time.
 
     Returns:
         pd.DataFrame: Preprocessed DataFrame with standard columns.
     """
+    if engine not in PREPROCESS_ENGINES:
+        raise ValueError(f"Unknown preprocess engine: {engine}")
+    if engine == 'auto':
+        try:
+            import pyarrow.compute  # noqa: F401
+            engine = 'arrow'
+        except ImportError:
+            engine = 'pandas'
+    with stage('preprocess', rows=len(df), engine=engine):
+        # Drop extra columns like MD5, First_Name_CB, etc. before anything is copied
+        df = df[[col for col in df.columns if col in SOURCE_COLUMNS]]
+        preprocess_chunk = preprocess_chunk_arrow if engine == 'arrow' else preprocess_chunk_pandas
+        if len(df) <= chunk_rows:
+            return preprocess_chunk(df)
+        return pd.concat([preprocess_chunk(df.iloc[start:start + chunk_rows])
+                          for start in range(0, len(df), chunk_rows)])
+
+def preprocess_chunk_pandas(df: pd.DataFrame) -> pd.DataFrame:
+    """Preprocess a chunk of rows with pandas string methods (the 'pandas' engine)."""
     df_processed = df.copy()
 
     # Map column names to standard
-    column_map = {
-        'FirstName': 'First_Name',
-        'LastName': 'Last_Name',
-        'Address': 'Address1',
-        'Zip5': 'Zip'
-    }
-    df_processed = df_processed.rename(columns=column_map)
+    df_processed = df_processed.rename(columns=COLUMN_MAP)
 
     # For master sheet, concatenate Address and Address 2 if present
     if 'Address 2' in df_processed.columns:
@@ -33,8 +142,7 @@ def preprocess_data(df: pd.DataFrame) -> pd.DataFrame:
         df_processed = df_processed.drop(columns=['Address 2'], errors='ignore')
 
     # Standard columns to fill and normalize case for fuzzy matching accuracy
-    columns_to_fill = ['First_Name', 'Last_Name', 'Address1', 'City', 'State', 'Zip']
-    for col in columns_to_fill:
+    for col in TEXT_COLUMNS:
         if col in df_processed.columns:
             df_processed[col] = df_processed[col].fillna('').astype(str).str.upper().str.strip()
         else:
@@ -49,10 +157,143 @@ def preprocess_data(df: pd.DataFrame) -> pd.DataFrame:
     ).str.strip(', ')
 
     # Drop extra columns like MD5, First_Name_CB, etc.
-    extra_cols = [col for col in df_processed.columns if col not in columns_to_fill + ['FullAddress']]
+    extra_cols = [col for col in df_processed.columns if col not in TEXT_COLUMNS + ['FullAddress']]
     df_processed = df_processed.drop(columns=extra_cols, errors='ignore')
 
-    return df_processed
+    # Parse address components once so scoring never re-parses strings
+    return add_address_part_columns(df_processed)
+
+def arrow_text(values: pd.Series):
+    """A column as a pyarrow string array, with the values of fillna('').astype(str)."""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    if pd.api.types.is_object_dtype(values) or pd.api.types.is_string_dtype(values):
+        try:
+            return pc.fill_null(pa.array(values, type=pa.string(), from_pandas=True), '')
+        except pa.ArrowException:
+            pass
+    # Non-text values (numbers, dates) are converted by str() as in the pandas engine
+    return pa.array(values.fillna('').astype(str), type=pa.string())
+
+def arrow_upper_strip(array, upper: bool = True):
+    """str.upper().strip() (or strip() alone) of every value of a pyarrow string array.
+
+    ASCII arrays use the compute kernels; anything else goes through Python's str methods,
+    whose case mappings and whitespace differ from Arrow's for some non-ASCII characters.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    if pc.all(pc.string_is_ascii(array)).as_py() is not False:
+        if upper:
+            array = pc.ascii_upper(array)
+        return pc.utf8_trim(array, characters=ASCII_WHITESPACE)
+    return pa.array([(value.upper() if upper else value).strip() for value in array.to_pylist()], type=pa.string())
+
+def preprocess_chunk_arrow(df: pd.DataFrame) -> pd.DataFrame:
+    """Preprocess a chunk of rows with pyarrow compute kernels (the 'arrow' engine).
+
+    Gives the same values as preprocess_chunk_pandas without an object-column copy per step.
+    """
+    import pyarrow.compute as pc
+    df = df.rename(columns=COLUMN_MAP)
+    for col in TEXT_COLUMNS:
+        if col not in df.columns:
+            raise KeyError(f"Missing required column: {col}")
+    text = {col: arrow_text(df[col]) for col in TEXT_COLUMNS}
+    
+    # For master sheet, concatenate Address and Address 2 if present
+    if 'Address 2' in df.columns:
+        address2 = arrow_upper_strip(arrow_text(df['Address 2']), upper=False)
+        text['Address1'] = pc.binary_join_element_wise(text['Address1'], address2, ' ')
+    columns = {col: arrow_upper_strip(array) for col, array in text.items()}
+    
+    full_address = pc.binary_join_element_wise(columns['Address1'], columns['City'], ', ')
+    full_address = pc.binary_join_element_wise(full_address, columns['State'], ', ')
+    full_address = pc.binary_join_element_wise(full_address, columns['Zip'], ' ')
+    columns['FullAddress'] = pc.utf8_trim(full_address, characters=', ')
+    
+    # Standard columns in their sheet order, as in the pandas engine
+    order = [col for col in df.columns if col in TEXT_COLUMNS] + ['FullAddress']
+    df_processed = pd.DataFrame({col: columns[col].to_pandas().to_numpy(dtype=object) for col in order}, index=df.index)
+    
+    # Parse address components once so scoring never re-parses strings
+    return add_address_part_columns(df_processed)
+
+def add_address_part_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Add parsed address component columns, vectorized over the FullAddress column.
+
+    Adds House_Number (nullable integer), Street_Name, Designator_Type, Designator_Value
+    and Zip_Normalized, with the same values parse_address and normalize_zip give per row.
+
+    Args:
+        df (pd.DataFrame): DataFrame with FullAddress and Zip columns.
+
+    Returns:
+        pd.DataFrame: The same DataFrame with the parsed columns added.
+    """
+    stripped = df['FullAddress'].str.strip()
+    
+    # House numbers beyond int64 range are not real house numbers; treat them as missing
+    house_digits = stripped.str.extract(r'^(\d+)', expand=False)
+    house_digits = house_digits.where(house_digits.str.len() <= 18)
+    df['House_Number'] = pd.to_numeric(house_digits).astype('Int64')
+    
+    street = stripped.str.replace(HOUSE_NUMBER_PREFIX_PATTERN, '', regex=True).str.split(',').str[0].str.strip()
+    for suffix, abbreviation in STREET_ABBREVIATIONS:
+        street = street.str.replace(suffix, abbreviation, regex=False)
+    df['Street_Name'] = street.astype(str)
+    
+    designators = df['FullAddress'].str.extract(DESIGNATOR_PATTERN).fillna('')
+    df['Designator_Type'] = designators[0].str.upper()
+    df['Designator_Value'] = designators[1].str.upper()
+    
+    df['Zip_Normalized'] = df['Zip'].map(normalize_zip)
+    return df
+
+class AddressParts(NamedTuple):
+    """Address components used by the address scorers, parsed once per record."""
+    full: str                    # Full address string as compared by rapidfuzz
+    house_number: Optional[int]  # Leading house number, None if the address has none
+    street: str                  # Street name with common suffixes abbreviated
+    designator_type: str         # APT, UNIT, TRLR, LOT, ... or '' if none
+    designator_value: str        # Designator number/identifier, '' if none
+
+def normalize_street(street: str) -> str:
+    """Abbreviate common street suffixes so STREET and ST compare equal.
+
+    Args:
+        street (str): Street name, e.g. 'HAZELNUT HILL ROAD'.
+
+    Returns:
+        str: Normalized street name, e.g. 'HAZELNUT HILL RD'.
+    """
+    for suffix, abbreviation in STREET_ABBREVIATIONS:
+        street = street.replace(suffix, abbreviation)
+    return street
+
+def parse_address(address: str) -> AddressParts:
+    """Parse an address string into the components the address scorers compare.
+
+    Args:
+        address (str): Address string, e.g. '268 FLANDERS RD TRLR 9, MYSTIC, CT 06355'.
+
+    Returns:
+        AddressParts: Parsed components.
+    """
+    stripped = address.strip()
+    number_match = HOUSE_NUMBER_PATTERN.search(stripped)
+    designator_match = DESIGNATOR_PATTERN.search(address)
+    
+    # Street name is between the house number and the first comma
+    street = HOUSE_NUMBER_PREFIX_PATTERN.sub('', stripped).split(',')[0].strip()
+    
+    return AddressParts(
+        full=address,
+        house_number=int(number_match.group()) if number_match else None,
+        street=normalize_street(street),
+        designator_type=designator_match.group(1).upper() if designator_match else '',
+        designator_value=designator_match.group(2).upper() if designator_match else '',
+    )
 
 def compute_address_score(addr1: str, addr2: str) -> float:
     """Compute address similarity score that properly handles house numbers.
@@ -65,119 +306,343 @@ def compute_address_score(addr1: str, addr2: str) -> float:
     Returns:
         float: Address similarity score (0-100).
     """
-    import re
-    
-    # Extract house numbers (first number sequence in each address)
-    num1_match = re.search(r'^\d+', addr1.strip())
-    num2_match = re.search(r'^\d+', addr2.strip())
-    
-    if num1_match and num2_match:
-        num1 = int(num1_match.group())
-        num2 = int(num2_match.group())
-        
+    return compute_address_parts_score(parse_address(addr1), parse_address(addr2))
+
+def compute_address_parts_score(parts1: AddressParts, parts2: AddressParts) -> float:
+    """Compute the address similarity score from pre-parsed address components.
+
+    Same rules as compute_address_score, without re-parsing either address.
+
+    Args:
+        parts1, parts2 (AddressParts): Parsed addresses to compare.
+
+    Returns:
+        float: Address similarity score (0-100).
+    """
+    if parts1.house_number is not None and parts2.house_number is not None:
         # If house numbers are very different, heavily penalize the score
-        num_diff = abs(num1 - num2)
+        num_diff = abs(parts1.house_number - parts2.house_number)
         if num_diff == 0:
             # Same house number - check property designators (APT, UNIT, TRLR, LOT, etc.)
-            return compute_address_with_apartment_check(addr1, addr2)
+            return compute_parts_with_apartment_check(parts1, parts2)
         elif num_diff <= 2:
             # Very close house numbers (might be adjacent properties) - moderate score
-            base_score = fuzz.token_set_ratio(addr1, addr2)
+            base_score = fuzz.token_set_ratio(parts1.full, parts2.full)
             return min(base_score * 0.8, 85.0)  # Cap at 85% for different house numbers
         elif num_diff <= 10:
             # Nearby house numbers - low score  
-            return min(fuzz.token_set_ratio(addr1, addr2) * 0.5, 60.0)
+            return min(fuzz.token_set_ratio(parts1.full, parts2.full) * 0.5, 60.0)
         else:
             # Very different house numbers - very low score
-            return min(fuzz.token_set_ratio(addr1, addr2) * 0.2, 30.0)
+            return min(fuzz.token_set_ratio(parts1.full, parts2.full) * 0.2, 30.0)
     else:
         # No house numbers found - fall back to standard fuzzy matching
-        return fuzz.token_set_ratio(addr1, addr2)
+        return fuzz.token_set_ratio(parts1.full, parts2.full)
 
 def compute_address_with_apartment_check(addr1: str, addr2: str) -> float:
     """Check property designators for FullAddress matching with strict client requirements."""
-    import re
-    
-    # Extract property designators (comprehensive pattern for apartments, units, trailers, lots, etc.)
-    # Must be preceded by space and followed by space+number to avoid matching parts of street names
-    apt_pattern = r'\s(APT|APARTMENT|UNIT|TRLR|TRAILER|LOT|BLDG|BUILDING|STE|SUITE|FLOOR|FL|RM|ROOM|SPACE|SPC|#)\s+([A-Z0-9]+)'
-    apt1_match = re.search(apt_pattern, addr1, re.IGNORECASE)
-    apt2_match = re.search(apt_pattern, addr2, re.IGNORECASE)
-    
+    return compute_parts_with_apartment_check(parse_address(addr1), parse_address(addr2))
+
+def compute_parts_with_apartment_check(parts1: AddressParts, parts2: AddressParts) -> float:
+    """Check property designators and street names of two pre-parsed addresses."""
     # If both have property designators, they must match exactly
-    if apt1_match and apt2_match:
-        type1 = apt1_match.group(1).upper()  # Property type (APT, UNIT, TRLR, LOT, etc.)
-        num1 = apt1_match.group(2).upper()   # Property number/identifier
-        type2 = apt2_match.group(1).upper()
-        num2 = apt2_match.group(2).upper()
-        
+    if parts1.designator_type and parts2.designator_type:
         # Different property types (TRLR vs LOT) or different numbers = no match
-        if type1 != type2 or num1 != num2:
+        if (parts1.designator_type != parts2.designator_type or
+                parts1.designator_value != parts2.designator_value):
             return 0.0
     
     # If only one has property designator, treat as different addresses
-    elif apt1_match or apt2_match:
+    elif parts1.designator_type or parts2.designator_type:
         return 0.0
     
-    # Same property designator or no designators - validate street names first
-    # Extract street names to check if they're actually similar
-    import re
-    
-    # Extract street names (between house number and first comma)
-    street1 = re.sub(r'^\d+\s*', '', addr1.strip()).split(',')[0].strip()
-    street2 = re.sub(r'^\d+\s*', '', addr2.strip()).split(',')[0].strip()
-    
-    # Check if street names are similar with smart abbreviation handling
-    from rapidfuzz import fuzz
-    
-    # First normalize common street abbreviations
-    def normalize_street(street):
-        return (street.replace(' STREET', ' ST')
-                     .replace(' ROAD', ' RD') 
-                     .replace(' AVENUE', ' AVE')
-                     .replace(' LANE', ' LN')
-                     .replace(' DRIVE', ' DR')
-                     .replace(' COURT', ' CT')
-                     .replace(' PLACE', ' PL'))
-    
-    norm_street1 = normalize_street(street1)
-    norm_street2 = normalize_street(street2)
-    
-    # Check similarity after normalization
-    street_similarity = fuzz.token_set_ratio(norm_street1, norm_street2)
+    # Same property designator or no designators - check street similarity after normalization
+    street_similarity = fuzz.token_set_ratio(parts1.street, parts2.street)
     
     # If streets are very different after normalization, cap the score
     if street_similarity < 78:  # Just below the ALICE/VALERIE score (77.78%)
-        return min(fuzz.ratio(addr1, addr2) * 0.7, 65.0)  # Cap at 65% for different streets
+        return min(fuzz.ratio(parts1.full, parts2.full) * 0.7, 65.0)  # Cap at 65% for different streets
     
     # Streets are similar - use full string comparison
-    return fuzz.ratio(addr1, addr2)
+    return fuzz.ratio(parts1.full, parts2.full)
+
+def address_parts_from_row(row: Union[pd.Series, 'Record']) -> AddressParts:
+    """Get the parsed address of a row, reading the preprocessed columns when present.
+
+    Args:
+        row (pd.Series or Record): Row from a DataFrame returned by preprocess_data.
+
+    Returns:
+        AddressParts: Parsed address components.
+    """
+    if isinstance(row, Record) or 'House_Number' not in row.index:
+        return parse_address(row['FullAddress'])
+    house_number = row['House_Number']
+    return AddressParts(
+        full=row['FullAddress'],
+        house_number=None if pd.isna(house_number) else int(house_number),
+        street=row['Street_Name'],
+        designator_type=row['Designator_Type'],
+        designator_value=row['Designator_Value'],
+    )
+
+def address_parts_list(df: pd.DataFrame) -> List[AddressParts]:
+    """Get the parsed address of every row, reading the preprocessed columns when present.
+
+    Args:
+        df (pd.DataFrame): DataFrame returned by preprocess_data.
+
+    Returns:
+        List[AddressParts]: Parsed address components in row order.
+    """
+    if 'House_Number' not in df.columns:
+        return [parse_address(address) for address in df['FullAddress']]
+    house_numbers = [None if pd.isna(number) else int(number) for number in df['House_Number']]
+    return [AddressParts(*fields) for fields in zip(
+        df['FullAddress'], house_numbers, df['Street_Name'], df['Designator_Type'], df['Designator_Value']
+    )]
+
+class Record:
+    """The fields of one preprocessed record that verification reads, in a slotted object.
+
+    Takes a fraction of the memory of a row Series and reads a field without a label
+    lookup. Indexing by column name works as on a row Series, so the scorers and
+    build_result_row accept either.
+    """
+    __slots__ = ('label', 'first_name', 'last_name', 'full_address')
+
+    COLUMNS = {'First_Name': 'first_name', 'Last_Name': 'last_name', 'FullAddress': 'full_address'}
+
+    def __init__(self, label: int, first_name: str, last_name: str, full_address: str):
+        self.label = label
+        self.first_name = first_name
+        self.last_name = last_name
+        self.full_address = full_address
+
+    def __getitem__(self, column: str) -> str:
+        return getattr(self, self.COLUMNS[column])
+
+    def __repr__(self) -> str:
+        return f"Record({self.label!r}, {self.first_name!r}, {self.last_name!r}, {self.full_address!r})"
+
+def record_list(df: pd.DataFrame) -> List[Record]:
+    """Get a Record for every row, with names interned so repeated names share one string.
+
+    Args:
+        df (pd.DataFrame): DataFrame returned by preprocess_data.
+
+    Returns:
+        List[Record]: Records in row order, labelled with the DataFrame index.
+    """
+    return [Record(label, sys.intern(first), sys.intern(last), address) for label, first, last, address in zip(
+        df.index.tolist(), df['First_Name'], df['Last_Name'], df['FullAddress']
+    )]
+
+class RecordBounds(NamedTuple):
+    """House numbers, designators and name presence per record, as numeric arrays.
+
+    These decide the caps compute_address_parts_score and get_combined_score apply, so
+    they give an upper bound on a pair's combined score without any string similarity.
+    """
+    house_numbers: np.ndarray   # int64 leading house number, -1 if none
+    designators: np.ndarray     # int64 (type, value) code: 0 if none, -1 if not in designator_codes
+    first_present: np.ndarray   # bool, first name is not empty
+    last_present: np.ndarray    # bool, last name is not empty
+    designator_codes: Dict[Tuple[str, str], int]  # (type, value) -> code, taken from the master
+
+    @classmethod
+    def build(cls, parts: List[AddressParts], df: pd.DataFrame,
+              designator_codes: Dict[Tuple[str, str], int] = None) -> 'RecordBounds':
+        """Build the arrays from parsed addresses and the preprocessed name columns.
+
+        Args:
+            parts (List[AddressParts]): Parsed address of every row of df.
+            df (pd.DataFrame): Preprocessed DataFrame.
+            designator_codes (Dict[Tuple[str, str], int]): The master's codes, for input rows.
+                If None, codes are assigned to every designator in parts (for the master).
+
+        Returns:
+            RecordBounds: The arrays, in row order.
+        """
+        designators = [(p.designator_type, p.designator_value) if p.designator_type else None for p in parts]
+        if designator_codes is None:
+            designator_codes = {}
+            for designator in designators:
+                if designator is not None and designator not in designator_codes:
+                    designator_codes[designator] = len(designator_codes) + 1
+        # Only house numbers int64 can hold are compared; others are treated as missing
+        house_numbers = [-1 if p.house_number is None or p.house_number >= 1 << 62 else p.house_number
+                         for p in parts]
+        return cls(
+            house_numbers=np.array(house_numbers, dtype=np.int64),
+            designators=np.array([0 if d is None else designator_codes.get(d, -1) for d in designators],
+                                 dtype=np.int64),
+            first_present=(df['First_Name'].str.strip() != '').to_numpy(dtype=bool),
+            last_present=(df['Last_Name'].str.strip() != '').to_numpy(dtype=bool),
+            designator_codes=designator_codes,
+        )
+
+def score_upper_bounds(input_bounds: RecordBounds, position1: int, master_bounds: RecordBounds,
+                       positions: np.ndarray, match_type: str) -> np.ndarray:
+    """Upper bound on the combined score of one input row against master rows.
+
+    Follows the caps of compute_address_parts_score with every string similarity taken as
+    100: house numbers 1-2 apart score at most 80, 3-10 apart at most 50, further apart at
+    most 20, and the same house number with different designators scores 0. An empty name
+    scores 0, which zeroes FullName and LastNameAddress.
+
+    Args:
+        input_bounds (RecordBounds): Bounds of the input sheet.
+        position1 (int): Input row position.
+        master_bounds (RecordBounds): Bounds of the master.
+        positions (np.ndarray): Master positions to bound.
+        match_type (str): Match type whose combined score to bound.
+
+    Returns:
+        np.ndarray: float64 bound per master position; the real score is never higher.
+    """
+    if match_type == 'FullName':
+        present = input_bounds.first_present[position1] and input_bounds.last_present[position1]
+        if not present:
+            return np.zeros(len(positions))
+        return np.where(master_bounds.first_present[positions] & master_bounds.last_present[positions], 100.0, 0.0)
+    
+    address = np.full(len(positions), 100.0)
+    house1 = input_bounds.house_numbers[position1]
+    if house1 >= 0:
+        house2 = master_bounds.house_numbers[positions]
+        difference = np.abs(house2 - house1)
+        numbered = house2 >= 0
+        address[numbered & (difference > 10)] = 20.0
+        address[numbered & (difference > 2) & (difference <= 10)] = 50.0
+        address[numbered & (difference > 0) & (difference <= 2)] = 80.0
+        address[numbered & (difference == 0)
+                & (master_bounds.designators[positions] != input_bounds.designators[position1])] = 0.0
+    if match_type == 'FullAddress':
+        return address
+    elif match_type == 'LastNameAddress':
+        if not input_bounds.last_present[position1]:
+            return np.zeros(len(positions))
+        return np.where(master_bounds.last_present[positions] & (address > 0), (100.0 + address) / 2, 0.0)
+    raise ValueError(f"Unknown match_type: {match_type}")
+
+class PruningStats:
+    """Counts of candidate pairs checked against their score upper bound, and of pairs pruned.
+
+    Pass one to run_all_matches to read the counts afterwards; PruningStats(enabled=False)
+    scores every candidate pair.
+
+    Example:
+        >>> pruning = PruningStats()
+        >>> results = run_all_matches(df1, df2, pruning=pruning)
+        >>> pruning.pruned, pruning.checked
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.checked = 0
+        self.pruned = 0
+
+    def add(self, checked: int, pruned: int):
+        """Add the counts of a batch of rows, e.g. from a worker process."""
+        self.checked += checked
+        self.pruned += pruned
+
+class FieldScoreCache:
+    """Bounded LRU memo of the field scorers, keyed on the (input value, master value) pair.
+
+    Names like JOHN/SMITH and common streets repeat across both sheets, so the same pairs
+    are scored many times. Values are already normalized by preprocess_data, and the scores
+    depend only on the pair, so one cache can be shared by all match types of a run.
+
+    Example:
+        >>> cache = FieldScoreCache()
+        >>> results = run_all_matches(df1, df2, score_cache=cache)
+        >>> cache.stats()['names']['hit_rate']
+    """
+
+    SCORERS = ('names', 'addresses')
+
+    def __init__(self, maxsize: int = FIELD_CACHE_SIZE):
+        """Create empty caches holding up to maxsize pairs per scorer."""
+        self.maxsize = maxsize
+        # First and last names share a cache; both use token_set_ratio
+        self.name_score = lru_cache(maxsize=maxsize)(fuzz.token_set_ratio)
+        self.address_score = lru_cache(maxsize=maxsize)(compute_address_parts_score)
+        self._merged = {scorer: [0, 0] for scorer in self.SCORERS}  # Hits and misses from workers
+
+    def counts(self) -> Dict[str, Tuple[int, int]]:
+        """Hits and misses per scorer, including merged worker counts."""
+        infos = {'names': self.name_score.cache_info(), 'addresses': self.address_score.cache_info()}
+        return {scorer: (infos[scorer].hits + self._merged[scorer][0], infos[scorer].misses + self._merged[scorer][1])
+                for scorer in self.SCORERS}
+
+    def merge_counts(self, counts: Dict[str, Tuple[int, int]]):
+        """Add hits and misses counted by a worker process's cache."""
+        for scorer, (hits, misses) in counts.items():
+            self._merged[scorer][0] += hits
+            self._merged[scorer][1] += misses
 
-def compute_individual_scores(row1: pd.Series, row2: pd.Series) -> Tuple[float, float, float]:
+    def stats(self) -> Dict[str, dict]:
+        """Hits, misses, hit rate and current size per scorer."""
+        sizes = {'names': self.name_score.cache_info().currsize,
+                 'addresses': self.address_score.cache_info().currsize}
+        return {scorer: {'hits': hits, 'misses': misses, 'hit_rate': hits / (hits + misses) if hits + misses else 0.0,
+                         'size': sizes[scorer], 'maxsize': self.maxsize}
+                for scorer, (hits, misses) in self.counts().items()}
+
+    def clear(self):
+        """Empty the caches and reset the statistics."""
+        self.name_score.cache_clear()
+        self.address_score.cache_clear()
+        self._merged = {scorer: [0, 0] for scorer in self.SCORERS}
+
+def compute_individual_scores(row1: Union[pd.Series, Record], row2: Union[pd.Series, Record],
+                              parts1: AddressParts = None, parts2: AddressParts = None,
+                              cache: FieldScoreCache = None) -> Tuple[float, float, float]:
     """Compute fuzzy scores for first name, last name, and full address.
 
     Args:
-        row1, row2 (pd.Series): Rows to compare.
+        row1, row2 (pd.Series or Record): Rows to compare.
+        parts1, parts2 (AddressParts): Optional pre-parsed addresses of row1 and row2.
+            If None, read from the preprocessed columns or parsed from FullAddress.
+        cache (FieldScoreCache): Optional memo of earlier field scores to reuse.
 
     Returns:
         Tuple[float, float, float]: Scores for first_name, last_name, address.
     """
+    if parts1 is None:
+        parts1 = address_parts_from_row(row1)
+    if parts2 is None:
+        parts2 = address_parts_from_row(row2)
+    if cache is not None:
+        return (cache.name_score(row1['First_Name'], row2['First_Name']),
+                cache.name_score(row1['Last_Name'], row2['Last_Name']),
+                cache.address_score(parts1, parts2))
     first_score = fuzz.token_set_ratio(row1['First_Name'], row2['First_Name'])
     last_score = fuzz.token_set_ratio(row1['Last_Name'], row2['Last_Name'])
-    address_score = compute_address_score(row1['FullAddress'], row2['FullAddress'])
+    address_score = compute_address_parts_score(parts1, parts2)
     return first_score, last_score, address_score
 
-def get_combined_score(scores: Tuple[float, float, float], match_type: str) -> float:
+def get_combined_score(scores: Tuple[float, float, float], match_type: str,
+                       weights: Tuple[float, float, float] = None) -> float:
     """Combine individual scores based on match type.
 
     Args:
         scores (Tuple[float, float, float]): First, last, address scores.
         match_type (str): 'FullName', 'LastNameAddress', or 'FullAddress'.
+        weights (Tuple[float, float, float]): Optional first, last, address weights replacing
+            the match type's DEFAULT_WEIGHTS. Every field with a non-zero weight must score
+            above 0, as with the defaults.
 
     Returns:
         float: Combined score.
     """
     first, last, address = scores
+    if weights is not None:
+        if any(weight and score <= 0 for weight, score in zip(weights, scores)):
+            return 0
+        return weights[0] * first + weights[1] * last + weights[2] * address
     if match_type == 'FullName':
         return (first + last) / 2 if first > 0 and last > 0 else 0
     elif match_type == 'LastNameAddress':
@@ -186,6 +651,32 @@ def get_combined_score(scores: Tuple[float, float, float], match_type: str) -> f
         return address
     raise ValueError(f"Unknown match_type: {match_type}")
 
+def combine_score_arrays(first: np.ndarray, last: np.ndarray, address: np.ndarray, match_type: str,
+                         weights: Tuple[float, float, float] = None) -> np.ndarray:
+    """Vectorized get_combined_score over arrays of field scores, with the same values.
+
+    Args:
+        first, last, address (np.ndarray): Field scores, one entry per pair.
+        match_type (str): 'FullName', 'LastNameAddress', or 'FullAddress'.
+        weights (Tuple[float, float, float]): Optional weights (see get_combined_score).
+
+    Returns:
+        np.ndarray: Combined score per pair.
+    """
+    if weights is not None:
+        vetoed = np.zeros(len(first), dtype=bool)
+        for weight, scores in zip(weights, (first, last, address)):
+            if weight:
+                vetoed |= scores <= 0
+        return np.where(vetoed, 0.0, weights[0] * first + weights[1] * last + weights[2] * address)
+    if match_type == 'FullName':
+        return np.where((first > 0) & (last > 0), (first + last) / 2, 0.0)
+    elif match_type == 'LastNameAddress':
+        return np.where((last > 0) & (address > 0), (last + address) / 2, 0.0)
+    elif match_type == 'FullAddress':
+        return address.astype(np.float64)
+    raise ValueError(f"Unknown match_type: {match_type}")
+
 def create_search_string(row: pd.Series, match_type: str) -> str:
     """Create search string based on match type for process.extractOne.
     
@@ -206,87 +697,2361 @@ def create_search_string(row: pd.Series, match_type: str) -> str:
 
 
 
-def run_specific_match(df1: pd.DataFrame, df2: pd.DataFrame, match_type: str, threshold: float = None) -> pd.DataFrame:
-    """Find best fuzzy match for each row in df1 from df2 using optimized approach.
+def build_search_strings(df: pd.DataFrame, match_type: str) -> List[str]:
+    """Create the search string of every row at once; same values as create_search_string.
 
     Args:
-        df1, df2 (pd.DataFrame): Preprocessed DataFrames.
-        match_type (str): Type of match ('FullName', 'LastNameAddress', 'FullAddress').
-        threshold (float): Optional minimum score. If None, uses smart defaults by match type.
+        df (pd.DataFrame): Preprocessed DataFrame.
+        match_type (str): Type of match to optimize for.
 
     Returns:
-        pd.DataFrame: Results sorted by descending score.
+        List[str]: Search strings in row order.
     """
-    # Set appropriate threshold by match type if not provided
-    if threshold is None:
-        thresholds = {
-            'FullName': 85.0,        # High threshold - we want actual name matches
-            'LastNameAddress': 75.0, # Medium threshold - addresses can vary
-            'FullAddress': 80.0      # High threshold - we want actual address matches, not geographic area
-        }
-        threshold = thresholds.get(match_type, 80.0)
+    if match_type == 'FullName':
+        return (df['First_Name'] + ' ' + df['Last_Name']).str.strip().tolist()
+    elif match_type == 'LastNameAddress':
+        return (df['Last_Name'] + ' ' + df['FullAddress']).str.strip().tolist()
+    elif match_type == 'FullAddress':
+        return df['FullAddress'].tolist()
+    raise ValueError(f"Unknown match_type: {match_type}")
+
+
+def exact_match_keys(df: pd.DataFrame, match_type: str) -> List[Optional[tuple]]:
+    """Key of every row for the exact-match fast path, or None where it does not apply.
+
+    Two rows with the same key score exactly 100 for the match type: the same first and
+    last name for FullName, the same last name and FullAddress for LastNameAddress and the
+    same FullAddress for FullAddress. Rows whose identical copy would score below 100 (an
+    empty name, or a house number with no street name) get None.
+
+    Args:
+        df (pd.DataFrame): DataFrame returned by preprocess_data.
+        match_type (str): Match type to key rows for.
+
+    Returns:
+        List[Optional[tuple]]: Key per row, in row order.
+    """
+    first = df['First_Name'].tolist()
+    last = df['Last_Name'].tolist()
+    address = df['FullAddress'].tolist()
+    if match_type == 'FullName':
+        return [(f, l) if f and l else None for f, l in zip(first, last)]
+    # An address with a house number but no street name scores at most 65 against itself
+    if 'House_Number' in df.columns:
+        scorable = (df['FullAddress'].ne('') & (df['House_Number'].isna() | df['Street_Name'].ne(''))).tolist()
+    else:
+        scorable = [parts.full != '' and (parts.house_number is None or parts.street != '')
+                    for parts in address_parts_list(df)]
+    if match_type == 'LastNameAddress':
+        return [(l, a) if l and ok else None for l, a, ok in zip(last, address, scorable)]
+    elif match_type == 'FullAddress':
+        return [(a,) if ok else None for a, ok in zip(address, scorable)]
+    raise ValueError(f"Unknown match_type: {match_type}")
+
+def restrict_exact_to_blocks(exact_positions: np.ndarray, signatures: List[Tuple[str, ...]],
+                             blocking: 'BlockingIndex') -> np.ndarray:
+    """Drop exact hits outside the input row's blocks, which fuzzy matching would never see.
+
+    Args:
+        exact_positions (np.ndarray): Exact-match master position per input row, -1 if none.
+        signatures (List[Tuple[str, ...]]): Blocking signature of each input row.
+        blocking (BlockingIndex): Index built over the same master rows.
+
+    Returns:
+        np.ndarray: Copy of exact_positions with -1 where the hit is not in the row's blocks.
+    """
+    exact_positions = exact_positions.copy()
+    for row in np.flatnonzero(exact_positions >= 0).tolist():
+        positions = blocking.lookup(signatures[row])
+        if positions is None:  # Global search, so every master row is a candidate
+            continue
+        slot = np.searchsorted(positions, exact_positions[row])
+        if slot == len(positions) or positions[slot] != exact_positions[row]:
+            exact_positions[row] = -1
+    return exact_positions
+
+def merge_exact_candidates(exact_positions: np.ndarray, candidates: Iterator[List[Tuple[int, float]]]
+                           ) -> Iterator[Optional[List[Tuple[int, float]]]]:
+    """Yield None for rows resolved by exact match and the next fuzzy candidates for the rest.
+
+    Args:
+        exact_positions (np.ndarray): Exact-match master position per input row, -1 if none.
+        candidates (Iterator): Candidates of the rows without an exact match, in order.
+
+    Yields:
+        Optional[List[Tuple[int, float]]]: Candidates per input row, None if matched exactly.
+    """
+    candidates = iter(candidates)
+    for position in exact_positions.tolist():
+        yield None if position >= 0 else next(candidates)
+
+def normalize_zip(zip_code: str) -> str:
+    """Normalize a zip code to 5 digits, restoring leading zeros lost by Excel (6355 -> 06355).
+
+    A zip column with blank cells is read as floats, so a trailing fractional part is
+    dropped first (6355.0 -> 06355).
+
+    Args:
+        zip_code (str): Raw zip code, possibly ZIP+4, read as a float or missing leading zeros.
+
+    Returns:
+        str: 5-digit zip code, or '' if no digits are present.
+    """
+    digits = ''.join(ch for ch in str(zip_code).split('-')[0].split('.')[0] if ch.isdigit())
+    if not digits:
+        return ''
+    return digits.zfill(5)[:5]
+
+def soundex(name: str) -> str:
+    """Compute the American Soundex code of a name (e.g. ROBERT -> R163).
+
+    Args:
+        name (str): Name to encode.
+
+    Returns:
+        str: 4-character Soundex code, or '' if the name has no letters.
+    """
+    letters = [ch for ch in str(name).upper() if 'A' <= ch <= 'Z']
+    if not letters:
+        return ''
+    code = letters[0]
+    previous = SOUNDEX_CODES.get(letters[0], '')
+    for letter in letters[1:]:
+        digit = SOUNDEX_CODES.get(letter, '')
+        if digit and digit != previous:
+            code += digit
+        if letter not in 'HW':  # H and W do not separate letters with the same code
+            previous = digit
+    return (code + '000')[:4]
+
+def compute_blocking_keys(df: pd.DataFrame, key: str) -> pd.Series:
+    """Compute one blocking key for every row of a preprocessed DataFrame.
+
+    Args:
+        df (pd.DataFrame): Preprocessed DataFrame.
+        key (str): 'zip5', 'zip3', 'state', or 'last_soundex'.
+
+    Returns:
+        pd.Series: Key value per row ('' when the row has no value for this key).
+    """
+    if key in ('zip5', 'zip3'):
+        zips = df['Zip_Normalized'] if 'Zip_Normalized' in df.columns else df['Zip'].map(normalize_zip)
+        return zips if key == 'zip5' else zips.str[:3]
+    elif key == 'state':
+        return df['State']
+    elif key == 'last_soundex':
+        # Last names repeat heavily, so encode each distinct name once
+        unique_names = df['Last_Name'].unique()
+        return df['Last_Name'].map(dict(zip(unique_names, map(soundex, unique_names))))
+    raise ValueError(f"Unknown blocking key: {key}")
+
+class BlockingIndex:
+    """Index of master row positions by blocking key, used to shrink the candidate set.
+
+    Each input row is only scored against master rows sharing at least one of its
+    blocking key values (the union of its blocks). Rows whose blocks are all empty
+    fall back to a global search unless fallback_to_global is False.
+
+    Example:
+        >>> index = BlockingIndex(df2, keys=('zip5', 'last_soundex'))
+        >>> run_specific_match(df1, df2, 'FullName', blocking=index)
+    """
+
+    def __init__(self, df: pd.DataFrame, keys: Sequence[str] = ('zip5',), fallback_to_global: bool = True):
+        """Build the index over a preprocessed master DataFrame.
+
+        Args:
+            df (pd.DataFrame): Preprocessed master DataFrame.
+            keys (Sequence[str]): Blocking keys to index (see compute_blocking_keys).
+            fallback_to_global (bool): Search the whole master when an input row's blocks are empty.
+        """
+        key_values = {key: compute_blocking_keys(df, key).to_numpy() for key in keys}
+        self._build(key_values, len(df), fallback_to_global)
+
+    @classmethod
+    def from_key_values(cls, key_values: Dict[str, Sequence[str]], size: int,
+                        fallback_to_global: bool = True) -> 'BlockingIndex':
+        """Build the index from blocking key values already computed per master row.
+
+        Args:
+            key_values (Dict[str, Sequence[str]]): Key value per master row, for each key to index.
+            size (int): Number of master rows.
+            fallback_to_global (bool): Search the whole master when an input row's blocks are empty.
+
+        Returns:
+            BlockingIndex: The index.
+        """
+        index = cls.__new__(cls)
+        index._build(key_values, size, fallback_to_global)
+        return index
+
+    def _build(self, key_values: Dict[str, Sequence[str]], size: int, fallback_to_global: bool):
+        self.keys = tuple(key_values)
+        self.fallback_to_global = fallback_to_global
+        self.size = size
+        self.blocks = {}
+        for key, key_column in key_values.items():
+            values = pd.Series(np.asarray(key_column, dtype=object))
+            self.blocks[key] = {value: positions for value, positions
+                                in values.groupby(values, sort=False).indices.items() if value != ''}
+        self._lookup_cache = {}
+
+    def append(self, key_values: Dict[str, Sequence[str]]):
+        """Add master rows at the end, positions self.size onwards, without rebuilding the blocks.
+
+        Args:
+            key_values (Dict[str, Sequence[str]]): Key values of the new rows, for every key in self.keys.
+        """
+        start = self.size
+        for key in self.keys:
+            values = pd.Series(np.asarray(key_values[key], dtype=object))
+            blocks = self.blocks[key]
+            for value, positions in values.groupby(values, sort=False).indices.items():
+                if value != '':
+                    positions = positions + start
+                    blocks[value] = positions if value not in blocks else np.concatenate([blocks[value], positions])
+        self.size += len(key_values[self.keys[0]]) if self.keys else 0
+        self._lookup_cache = {}
+
+    def remove(self, key_values: Dict[str, Sequence[str]], positions: Sequence[int]):
+        """Drop master rows from their blocks; other positions are unchanged.
+
+        Args:
+            key_values (Dict[str, Sequence[str]]): Key values of the removed rows, for every key in self.keys.
+            positions (Sequence[int]): Their master positions, in the same order.
+        """
+        positions = np.asarray(positions, dtype=np.intp)
+        for key in self.keys:
+            values = pd.Series(np.asarray(key_values[key], dtype=object))
+            blocks = self.blocks[key]
+            for value, rows in values.groupby(values, sort=False).indices.items():
+                if value in blocks:
+                    block = np.setdiff1d(blocks[value], positions[rows], assume_unique=True)
+                    if len(block):
+                        blocks[value] = block
+                    else:
+                        del blocks[value]
+        self._lookup_cache = {}
+
+    def query_signatures(self, df: pd.DataFrame) -> List[Tuple[str, ...]]:
+        """Return the blocking key values of each input row, one tuple per row."""
+        columns = [compute_blocking_keys(df, key).tolist() for key in self.keys]
+        return list(zip(*columns))
+
+    def lookup(self, signature: Tuple[str, ...]) -> np.ndarray:
+        """Return sorted master positions for a signature, or None for a global search.
+
+        Args:
+            signature (Tuple[str, ...]): Blocking key values from query_signatures.
+
+        Returns:
+            np.ndarray: Master positions to score (possibly empty), or None to search everything.
+        """
+        if signature not in self._lookup_cache:
+            blocks = [self.blocks[key].get(value) for key, value in zip(self.keys, signature)]
+            blocks = [block for block in blocks if block is not None]
+            if blocks:
+                positions = np.unique(np.concatenate(blocks))
+            elif self.fallback_to_global:
+                positions = None
+            else:
+                positions = np.array([], dtype=np.intp)
+            self._lookup_cache[signature] = positions
+        return self._lookup_cache[signature]
+
+def generate_blocked_candidates(queries: List[str], choices: List[str], score_cutoff: float,
+                                signatures: List[Tuple[str, ...]], blocking: BlockingIndex,
+                                chunk_size: int = None, workers: int = -1,
+                                generator=None) -> List[List[Tuple[int, float]]]:
+    """Generate candidates per query, scoring each group of queries only against its blocks.
+
+    Args:
+        queries (List[str]): Search strings for the input rows.
+        choices (List[str]): Search strings for the master rows.
+        score_cutoff (float): Minimum prefilter score for a candidate to be kept.
+        signatures (List[Tuple[str, ...]]): Blocking signature of each query.
+        blocking (BlockingIndex): Index built over the same master rows as choices.
+        chunk_size (int): Optional query rows per score matrix.
+        workers (int): Threads per score matrix (-1 for all cores).
+        generator (TfidfCandidateGenerator): Optional generator to search blocks with instead
+            of scoring every string in them with process.cdist.
+
+    Returns:
+        List[List[Tuple[int, float]]]: Candidates per query, as for generate_candidates.
+    """
+    groups = {}
+    for query_position, signature in enumerate(signatures):
+        groups.setdefault(signature, []).append(query_position)
     
-    logging.info(f"Processing {len(df1)} rows against {len(df2)} master records for {match_type}...")
+    candidate_lists = [None] * len(queries)
+    for signature, query_positions in groups.items():
+        positions = blocking.lookup(signature)
+        group_queries = [queries[i] for i in query_positions]
+        if positions is None:
+            if generator is not None:
+                group_candidates = generator.candidates(group_queries, score_cutoff, chunk_size=chunk_size)
+            else:
+                group_candidates = generate_candidates(group_queries, choices, score_cutoff,
+                                                       chunk_size=chunk_size, workers=workers)
+        else:
+            if generator is not None:
+                block_candidates = generator.candidates(group_queries, score_cutoff, positions=positions,
+                                                        chunk_size=chunk_size)
+            else:
+                block_choices = [choices[p] for p in positions]
+                block_candidates = generate_candidates(group_queries, block_choices, score_cutoff,
+                                                       chunk_size=chunk_size, workers=workers)
+            group_candidates = (
+                [(int(positions[p]), score) for p, score in candidates]
+                for candidates in block_candidates
+            )
+        for query_position, candidates in zip(query_positions, group_candidates):
+            candidate_lists[query_position] = candidates
+    return candidate_lists
+
+def generate_candidates(queries: List[str], choices: List[str], score_cutoff: float,
+                        limit: int = CANDIDATE_LIMIT, chunk_size: int = None,
+                        workers: int = -1) -> Iterator[List[Tuple[int, float]]]:
+    """Yield the top prefilter candidates for each query, scored in batches on all cores.
+
+    Equivalent to calling process.extract(query, choices, scorer=fuzz.token_set_ratio, limit=limit)
+    per query and dropping candidates below score_cutoff, but each chunk of queries is scored
+    against every choice with a single process.cdist call.
+
+    Args:
+        queries (List[str]): Search strings for the input rows.
+        choices (List[str]): Search strings for the master rows.
+        score_cutoff (float): Minimum prefilter score for a candidate to be kept.
+        limit (int): Maximum candidates per query.
+        chunk_size (int): Query rows per score matrix. If None, sized from CDIST_CELL_BUDGET.
+        workers (int): Threads per score matrix (-1 for all cores).
+
+    Yields:
+        List[Tuple[int, float]]: (choice position, prefilter score) pairs, best first,
+        ties broken by lower position like process.extract.
+    """
+    n_choices = len(choices)
+    if n_choices == 0:
+        for _ in queries:
+            yield []
+        return
     
-    # Pre-compute search strings ONCE (not for every input row!)
-    logging.info("Pre-computing search strings for master data...")
-    df2_list = list(df2.iterrows())  # [(actual_idx, row), ...]
-    search_strings = [create_search_string(row2, match_type) for actual_idx, row2 in df2_list]
-    logging.info(f"Pre-computed {len(search_strings)} search strings.")
+    if chunk_size is None:
+        chunk_size = max(1, CDIST_CELL_BUDGET // n_choices)
+    k = min(limit, n_choices)
     
-    results = []
-    for idx1, row1 in df1.iterrows():
-        if (idx1 + 1) % 100 == 0:  # Progress logging
-            logging.info(f"Processed {idx1 + 1}/{len(df1)} rows...")
-            
-        best_score = 0
-        best_idx2 = None
-        best_row2 = None
-        
-        # Use process.extract for initial filtering, then verify with our custom logic
-        query_str = create_search_string(row1, match_type)
-        
-        # Get top candidates using process.extract (much faster than nested loop)
-        candidates = process.extract(
-            query_str,
-            search_strings,
+    for start in range(0, len(queries), chunk_size):
+        scores = process.cdist(
+            queries[start:start + chunk_size],
+            choices,
             scorer=fuzz.token_set_ratio,
-            limit=10  # Get top 10 candidates for verification
+            score_cutoff=score_cutoff,
+            dtype=np.float64,
+            workers=workers  # All cores by default
         )
         
-        # Verify candidates with our sophisticated scoring logic
-        for candidate_str, candidate_score, list_position in candidates:
-            if candidate_score < threshold * 0.8:  # Skip obviously poor matches
-                break
-            
-            # Get the actual DataFrame row using the correct mapping
-            actual_df_idx, row2 = df2_list[list_position]
-            
-            # Use our sophisticated scoring logic
-            scores = compute_individual_scores(row1, row2)
-            accurate_score = get_combined_score(scores, match_type)
-            
-            if accurate_score > best_score:
-                best_score = accurate_score
-                best_idx2 = actual_df_idx  # Use the actual DataFrame index
-                best_row2 = row2
+        # k-th best score per row bounds the candidates without a full sort
+        if k < n_choices:
+            kth_scores = np.partition(scores, n_choices - k, axis=1)[:, n_choices - k]
+        else:
+            kth_scores = np.zeros(len(scores))
         
-        # Add result if above threshold
-        if best_score >= threshold and best_row2 is not None:
-            name_a = f"{row1['First_Name']} {row1['Last_Name']}".strip()
-            name_b = f"{best_row2['First_Name']} {best_row2['Last_Name']}".strip()
-            results.append({
-                'Match Score': round(best_score, 2),
-                'Sheet A Row': idx1 + 2,  # Assuming 1-based indexing with header
-                'Sheet B Row': best_idx2 + 2,
-                'Name A': name_a,
-                'Name B': name_b,
-                'Address A': row1['FullAddress'],
-                'Address B': best_row2['FullAddress']
-            })
-    
-    results_df = pd.DataFrame(results)
-    if not results_df.empty:
-        results_df = results_df.sort_values(by='Match Score', ascending=False)
-    logging.info(f"Found {len(results_df)} matches for {match_type} above threshold {threshold}.")
-    return results_df 
\ No newline at end of file
+        for row_scores, kth_score in zip(scores, kth_scores):
+            positions = np.flatnonzero(row_scores >= max(kth_score, score_cutoff))
+            order = np.argsort(-row_scores[positions], kind='stable')[:k]
+            positions = positions[order]
+            yield list(zip(positions.tolist(), row_scores[positions].tolist()))
+
+
+class DuplicateGroups(NamedTuple):
+    """Rows grouped by identical key; groups are numbered in order of first appearance."""
+    codes: np.ndarray    # Group of each row
+    first: np.ndarray    # First row of each group
+    members: np.ndarray  # Rows sorted by group, then by row
+    offsets: np.ndarray  # Group g holds members[offsets[g]:offsets[g + 1]]
+
+    def __len__(self) -> int:
+        return len(self.first)
+
+    def rows(self, group: int) -> np.ndarray:
+        """Rows of one group, in row order."""
+        return self.members[self.offsets[group]:self.offsets[group + 1]]
+
+def group_duplicates(keys: Union[Sequence[str], pd.DataFrame]) -> DuplicateGroups:
+    """Group rows with identical keys.
+
+    Args:
+        keys (Sequence[str] or pd.DataFrame): One key string per row, or a DataFrame whose
+            columns together form the key.
+
+    Returns:
+        DuplicateGroups: The groups, numbered in order of first appearance.
+
+    Example:
+        >>> groups = group_duplicates(['JOHN SMITH', 'MARY JONES', 'JOHN SMITH'])
+        >>> groups.codes.tolist(), groups.rows(0).tolist()
+        ([0, 1, 0], [0, 2])
+    """
+    if isinstance(keys, pd.DataFrame):
+        codes = keys.groupby(list(keys.columns), sort=False, dropna=False).ngroup().to_numpy()
+    else:
+        codes = pd.factorize(np.asarray(keys, dtype=object))[0]
+    codes = codes.astype(np.int64)
+    members = np.argsort(codes, kind='stable')
+    offsets = np.concatenate([[0], np.cumsum(np.bincount(codes, minlength=codes.max() + 1 if len(codes) else 0))])
+    return DuplicateGroups(codes, members[offsets[:-1]], members, offsets)
+
+def expand_duplicate_candidates(candidate_lists: Iterator[List[Tuple[int, float]]], groups: DuplicateGroups,
+                                limit: int = CANDIDATE_LIMIT) -> Iterator[List[Tuple[int, float]]]:
+    """Turn candidates over unique search strings back into candidates over master rows.
+
+    Rows of equal-scoring groups are merged in row order, so the result is exactly the top
+    candidates generate_candidates finds over all rows: any row in that top list belongs to
+    one of the top groups, because every group ranked before it has a row ranked before it.
+
+    Args:
+        candidate_lists (Iterator[List[Tuple[int, float]]]): Candidates per query, over groups.
+        groups (DuplicateGroups): Master rows grouped by search string.
+        limit (int): Maximum candidates per query.
+
+    Yields:
+        List[Tuple[int, float]]: (master row position, prefilter score) pairs per query.
+    """
+    for candidates in candidate_lists:
+        expanded = []
+        start = 0
+        while start < len(candidates) and len(expanded) < limit:
+            score = candidates[start][1]
+            end = start
+            while end < len(candidates) and candidates[end][1] == score:
+                end += 1
+            tied_rows = np.sort(np.concatenate([groups.rows(group) for group, _ in candidates[start:end]]))
+            expanded.extend((row, score) for row in tied_rows[:limit - len(expanded)].tolist())
+            start = end
+        yield expanded
+
+class PackedStrings:
+    """List of strings packed into one UTF-8 buffer plus offsets.
+
+    The buffer and offsets are plain numpy arrays, so they can be saved with np.save,
+    memory-mapped back with np.load(mmap_mode='r') and read without unpickling.
+    Strings are stored NUL-terminated, so they must not contain NUL characters.
+
+    Example:
+        >>> packed = PackedStrings.from_list(['JOHN SMITH', 'MARY JONES'])
+        >>> packed[1]
+        'MARY JONES'
+    """
+
+    def __init__(self, data: np.ndarray, offsets: np.ndarray):
+        """Wrap an existing buffer (uint8) and start offsets (int64, one extra at the end)."""
+        self.data = data
+        self.offsets = offsets
+
+    @classmethod
+    def from_list(cls, strings: Sequence[str]) -> 'PackedStrings':
+        """Pack a sequence of strings."""
+        encoded = [string.encode('utf-8') + b'\x00' for string in strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum(np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded)), out=offsets[1:])
+        data = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+        if np.count_nonzero(data == 0) != len(encoded):
+            raise ValueError("Strings containing NUL characters cannot be packed")
+        return cls(data, offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, position: int) -> str:
+        start, end = self.offsets[position], self.offsets[position + 1] - 1
+        return self.data[start:end].tobytes().decode('utf-8')
+
+    def tolist(self) -> List[str]:
+        """Unpack every string at once."""
+        if len(self) == 0:
+            return []
+        return self.data.tobytes().decode('utf-8').split('\x00')[:-1]
+
+    def save(self, path_prefix: str):
+        """Save as <path_prefix>.data.npy and <path_prefix>.offsets.npy."""
+        np.save(f"{path_prefix}.data.npy", self.data)
+        np.save(f"{path_prefix}.offsets.npy", self.offsets)
+
+    @classmethod
+    def load(cls, path_prefix: str, mmap: bool = True) -> 'PackedStrings':
+        """Load strings saved with save(), memory-mapped unless mmap is False."""
+        mmap_mode = 'r' if mmap else None
+        return cls(np.load(f"{path_prefix}.data.npy", mmap_mode=mmap_mode),
+                   np.load(f"{path_prefix}.offsets.npy", mmap_mode=mmap_mode))
+
+class LazyRows(Sequence):
+    """Read-only sequence whose items are built from their position on first access.
+
+    Serves the records and parsed addresses of a packed master index, so a process that
+    matches against it only builds objects for the master rows that become candidates.
+    Built items are kept, so memory grows with the distinct rows read, never past one
+    object per row.
+    """
+
+    def __init__(self, build: Callable[[int], object], length: int):
+        """Wrap a function that builds the item at a position, for positions below length."""
+        self._build = build
+        self._length = length
+        self._items = {}
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, position: int):
+        if not 0 <= position < self._length:
+            raise IndexError(position)
+        item = self._items.get(position)
+        if item is None:
+            item = self._items[position] = self._build(position)
+        return item
+
+class TfidfCandidateGenerator:
+    """Character n-gram TF-IDF nearest-neighbor search over master search strings.
+
+    A faster, approximate alternative to scoring every master string with token_set_ratio.
+    The vectorizer is fitted once over the master, each chunk of queries is matched with
+    one sparse matrix product, and only the nearest neighbors are re-scored with
+    token_set_ratio, so the usual prefilter cutoff and candidate order still apply.
+    Requires scikit-learn.
+
+    Example:
+        >>> generator = TfidfCandidateGenerator(master.search_strings('FullAddress'))
+        >>> next(generator.candidates(['15 CHAPMAN DR, MYSTIC, CT 06355'], score_cutoff=64.0))
+        [(0, 100.0)]
+    """
+
+    def __init__(self, choices: List[str], ngram_range: Tuple[int, int] = TFIDF_NGRAM_RANGE,
+                 neighbors: int = TFIDF_NEIGHBORS):
+        """Fit the vectorizer over the master search strings.
+
+        Args:
+            choices (List[str]): Search strings for the master rows.
+            ngram_range (Tuple[int, int]): Character n-gram sizes.
+            neighbors (int): Nearest neighbors per query to re-score with token_set_ratio.
+        """
+        try:
+            from sklearn.feature_extraction.text import TfidfVectorizer
+        except ImportError as e:
+            raise ImportError("candidate_method='tfidf' requires scikit-learn (pip install scikit-learn)") from e
+        
+        self.choices = choices
+        self.neighbors = neighbors
+        self.vectorizer = TfidfVectorizer(analyzer='char', ngram_range=ngram_range, lowercase=False,
+                                          dtype=np.float32)
+        try:
+            self.matrix = self.vectorizer.fit_transform(choices)  # Rows are L2-normalized
+        except ValueError:
+            self.matrix = None  # Empty master or no n-grams at all: nothing can match
+
+    def append(self, choices: List[str]):
+        """Add master search strings at the end, vectorized with the already fitted vocabulary.
+
+        N-grams the fit has not seen are ignored until the generator is refitted, as for queries.
+        """
+        self.choices = self.choices + choices
+        if self.matrix is None:
+            self.__init__(self.choices, self.vectorizer.ngram_range, self.neighbors)
+        elif choices:
+            from scipy.sparse import vstack
+            self.matrix = vstack([self.matrix, self.vectorizer.transform(choices)], format='csr')
+
+    def remove(self, positions: Sequence[int]):
+        """Blank out master rows, so they are never a neighbor again; other positions are unchanged."""
+        self.choices = list(self.choices)
+        for position in positions:
+            self.choices[position] = ''
+        if self.matrix is not None:
+            matrix = self.matrix.tocsr(copy=True)
+            for position in positions:
+                matrix.data[matrix.indptr[position]:matrix.indptr[position + 1]] = 0
+            matrix.eliminate_zeros()
+            self.matrix = matrix
+
+    def candidates(self, queries: List[str], score_cutoff: float, limit: int = CANDIDATE_LIMIT,
+                   positions: np.ndarray = None, chunk_size: int = None) -> Iterator[List[Tuple[int, float]]]:
+        """Yield the top prefilter candidates for each query, like generate_candidates.
+
+        Args:
+            queries (List[str]): Search strings for the input rows.
+            score_cutoff (float): Minimum token_set_ratio for a candidate to be kept.
+            limit (int): Maximum candidates per query.
+            positions (np.ndarray): Optional master positions to restrict the search to.
+                Returned positions are then indexes into this array.
+            chunk_size (int): Query rows per similarity matrix. If None, sized from CDIST_CELL_BUDGET.
+
+        Yields:
+            List[Tuple[int, float]]: (position, token_set_ratio) pairs, best first,
+            ties broken by lower position.
+        """
+        if self.matrix is None or (positions is not None and len(positions) == 0):
+            for _ in queries:
+                yield []
+            return
+        
+        matrix = self.matrix if positions is None else self.matrix[positions]
+        choices = self.choices if positions is None else [self.choices[p] for p in positions]
+        if chunk_size is None:
+            chunk_size = max(1, CDIST_CELL_BUDGET // matrix.shape[0])
+        matrix_t = matrix.T.tocsr()
+        
+        for start in range(0, len(queries), chunk_size):
+            chunk = queries[start:start + chunk_size]
+            similarities = (self.vectorizer.transform(chunk) @ matrix_t).tocsr()
+            for row, query in enumerate(chunk):
+                row_slice = slice(similarities.indptr[row], similarities.indptr[row + 1])
+                neighbors = similarities.indices[row_slice]
+                if len(neighbors) > self.neighbors:
+                    nearest = np.argpartition(-similarities.data[row_slice], self.neighbors - 1)[:self.neighbors]
+                    neighbors = neighbors[nearest]
+                scored = sorted((-fuzz.token_set_ratio(query, choices[p]), p) for p in neighbors.tolist())
+                yield [(p, -neg_score) for neg_score, p in scored if -neg_score >= score_cutoff][:limit]
+
+def compute_row_hashes(df: pd.DataFrame) -> np.ndarray:
+    """64-bit hash of each row of a raw sheet, over the source columns preprocess_data reads."""
+    df = df[[col for col in df.columns if col in SOURCE_COLUMNS]]
+    return pd.util.hash_pandas_object(df.astype(str), index=False).to_numpy()
+
+def compute_content_hash(df: pd.DataFrame, row_hashes: np.ndarray = None) -> str:
+    """Hash the contents of a raw sheet, so any edit to the master invalidates its index.
+
+    Only the source columns preprocess_data reads are hashed, so the same master read
+    with or without its other columns maps to the same index.
+
+    Args:
+        df (pd.DataFrame): Raw master sheet, before preprocess_data.
+        row_hashes (np.ndarray): compute_row_hashes(df), if already computed.
+
+    Returns:
+        str: Hex digest of the source column names and their cell values.
+    """
+    if row_hashes is None:
+        row_hashes = compute_row_hashes(df)
+    digest = hashlib.md5()
+    digest.update(json.dumps([str(col) for col in df.columns if col in SOURCE_COLUMNS]).encode('utf-8'))
+    digest.update(row_hashes.tobytes())
+    return digest.hexdigest()
+
+def align_appended_rows(old_hashes: np.ndarray, new_hashes: np.ndarray) -> np.ndarray:
+    """Match the leading rows of a new sheet to old rows kept in the same order.
+
+    The new sheet is read as the old rows, some of them removed, followed by appended rows.
+    Old rows are matched greedily in order; the first new row without a later old match
+    ends the kept part, and every new row from there on counts as appended.
+
+    Args:
+        old_hashes (np.ndarray): Row hashes of the old sheet.
+        new_hashes (np.ndarray): Row hashes of the new sheet.
+
+    Returns:
+        np.ndarray: Old position of each kept row, in order; new rows [0, len) are kept,
+        the rest are appended.
+
+    Example:
+        >>> align_appended_rows(np.array([1, 2, 3, 4]), np.array([1, 3, 4, 7])).tolist()
+        [0, 2, 3]
+    """
+    if len(new_hashes) >= len(old_hashes) and np.array_equal(new_hashes[:len(old_hashes)], old_hashes):
+        return np.arange(len(old_hashes))  # Pure append
+    positions_by_hash = {}
+    for position, row_hash in enumerate(old_hashes.tolist()):
+        positions_by_hash.setdefault(row_hash, []).append(position)
+    kept = []
+    next_position = 0
+    for row_hash in new_hashes.tolist():
+        positions = positions_by_hash.get(row_hash, [])
+        slot = bisect_left(positions, next_position)
+        if slot == len(positions):
+            break
+        kept.append(positions[slot])
+        next_position = positions[slot] + 1
+    return np.array(kept, dtype=np.int64)
+
+def index_source(path: str, sheet_name: str = None) -> str:
+    """Identity of a master sheet for MasterIndex.load_or_build: its absolute path and sheet.
+
+    Args:
+        path (str): File the master sheet is read from.
+        sheet_name (str): Sheet within the file, if any.
+
+    Returns:
+        str: The source, e.g. '/data/master.xlsx#Master'.
+    """
+    source = os.path.abspath(path)
+    return source if sheet_name is None else f"{source}#{sheet_name}"
+
+class MasterIndex:
+    """Preprocessed master data plus the structures candidate generation needs.
+
+    An index is built once from the raw master sheet, saved to a directory keyed by the
+    sheet's content hash, and memory-mapped back on later runs. The preprocessed DataFrame
+    and search strings are only unpacked when the matching engine first needs them.
+    run_all_matches and run_specific_match accept a MasterIndex wherever they take df2.
+
+    Records can be appended and deleted in place, so a refreshed master costs time in
+    proportion to the changed rows. Deleted rows stay behind as tombstones: their position is
+    kept, but their search strings and blocking keys are blanked so they are never a candidate
+    (at any threshold above 0), and results match an index built from the live rows. Once
+    MAX_TOMBSTONE_FRACTION of the rows are tombstones, compact() drops them.
+
+    Example:
+        >>> master = MasterIndex.load_or_build(master_raw, '.fuzzy_matcher_index')
+        >>> results = run_all_matches(df1, master)
+        >>> master.append(new_rows_raw)
+        >>> master.delete([12, 40])
+    """
+
+    FORMAT_VERSION = 3
+
+    def __init__(self, df: pd.DataFrame = None, content_hash: str = None):
+        """Wrap an already preprocessed master DataFrame.
+
+        Args:
+            df (pd.DataFrame): Master DataFrame returned by preprocess_data.
+            content_hash (str): Optional hash of the raw sheet the DataFrame came from.
+        """
+        self.content_hash = content_hash
+        self._df = df
+        self._size = None if df is None else len(df)
+        self._packed_index = None
+        self._packed_columns = {}
+        self._packed_search_strings = {}
+        self._packed_block_keys = {}
+        self._search_strings = {}
+        self._block_keys = {}
+        self._blocking = {}
+        self._records = None
+        self._address_parts = None
+        self._record_bounds = None
+        self._tfidf = {}
+        self._search_string_groups = {}
+        self._record_groups = None
+        self._exact_keys = {}
+        self._deleted = None if df is None else np.zeros(len(df), dtype=bool)
+        self._row_hashes = None  # compute_row_hashes of the raw rows, when built from a raw sheet
+        self.source = None  # Identity of the master sheet in load_or_build's cache directory
+
+    @classmethod
+    def build(cls, raw_df: pd.DataFrame, row_hashes: np.ndarray = None) -> 'MasterIndex':
+        """Preprocess a raw master sheet and derive every search string and blocking key.
+
+        Args:
+            raw_df (pd.DataFrame): Raw master sheet.
+            row_hashes (np.ndarray): compute_row_hashes(raw_df), if already computed.
+
+        Returns:
+            MasterIndex: Index ready to save or match against.
+        """
+        if row_hashes is None:
+            row_hashes = compute_row_hashes(raw_df)
+        index = cls(preprocess_data(raw_df), compute_content_hash(raw_df, row_hashes))
+        index._row_hashes = row_hashes
+        for match_type in MATCH_TYPES:
+            index.search_strings(match_type)
+        for key in BLOCKING_KEYS:
+            index.block_key_values(key)
+        return index
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def deleted(self) -> np.ndarray:
+        """Boolean mask of tombstoned rows, by position."""
+        return self._deleted
+
+    @property
+    def deleted_count(self) -> int:
+        """Number of tombstoned rows."""
+        return int(np.count_nonzero(self._deleted))
+
+    @property
+    def df(self) -> pd.DataFrame:
+        """Preprocessed master DataFrame, unpacked on first access when loaded from disk."""
+        if self._df is None:
+            columns = {}
+            for col, packed in self._packed_columns.items():
+                if col == 'House_Number':
+                    numbers = np.array(packed, dtype=np.int64)
+                    columns[col] = pd.arrays.IntegerArray(numbers, mask=numbers < 0)
+                else:
+                    columns[col] = packed.tolist()
+            self._df = pd.DataFrame(columns, index=pd.Index(np.array(self._packed_index)))
+        return self._df
+
+    def records(self) -> Sequence[Record]:
+        """Record of every master row for verification, built once and reused across calls.
+
+        A packed index decodes each record on first access instead (see LazyRows), so
+        matching against it does not unpack the DataFrame.
+        """
+        if self._records is None:
+            if self._df is None:
+                self._records = LazyRows(self._packed_record, len(self))
+            else:
+                self._records = record_list(self.df)
+        return self._records
+
+    def address_parts(self) -> Sequence[AddressParts]:
+        """Parsed address of every master row, built once and reused across calls.
+
+        Decoded per row on first access for a packed index, like records().
+        """
+        if self._address_parts is None:
+            if self._df is None:
+                self._address_parts = LazyRows(self._packed_address_parts, len(self))
+            else:
+                self._address_parts = address_parts_list(self.df)
+        return self._address_parts
+
+    def _packed_record(self, position: int) -> Record:
+        """Record of one row, read from the packed columns."""
+        columns = self._packed_columns
+        return Record(int(self._packed_index[position]), columns['First_Name'][position],
+                      columns['Last_Name'][position], columns['FullAddress'][position])
+
+    def _packed_address_parts(self, position: int) -> AddressParts:
+        """Parsed address of one row, read from the packed columns."""
+        columns = self._packed_columns
+        if 'House_Number' not in columns:
+            return parse_address(columns['FullAddress'][position])
+        house_number = int(columns['House_Number'][position])
+        return AddressParts(
+            full=columns['FullAddress'][position],
+            house_number=None if house_number < 0 else house_number,
+            street=columns['Street_Name'][position],
+            designator_type=columns['Designator_Type'][position],
+            designator_value=columns['Designator_Value'][position],
+        )
+
+    def record_bounds(self) -> RecordBounds:
+        """House number, designator and name arrays of the master for score bounds, built once."""
+        if self._record_bounds is None:
+            df = self.df  # Unpacked first, so the parsed addresses are built in one pass
+            self._record_bounds = RecordBounds.build(self.address_parts(), df)
+        return self._record_bounds
+
+    def search_strings(self, match_type: str) -> List[str]:
+        """Master search strings for a match type, computed or unpacked once."""
+        if match_type not in self._search_strings:
+            if match_type in self._packed_search_strings:
+                self._search_strings[match_type] = self._packed_search_strings[match_type].tolist()
+            else:
+                self._search_strings[match_type] = build_search_strings(self.df, match_type)
+        return self._search_strings[match_type]
+
+    def search_string_groups(self, match_type: str) -> DuplicateGroups:
+        """Master rows grouped by identical search string for a match type, built once."""
+        if match_type not in self._search_string_groups:
+            self._search_string_groups[match_type] = group_duplicates(self.search_strings(match_type))
+        return self._search_string_groups[match_type]
+
+    def record_groups(self) -> DuplicateGroups:
+        """Master rows grouped by identical preprocessed record (RECORD_KEY_COLUMNS), built once."""
+        if self._record_groups is None:
+            self._record_groups = group_duplicates(self.df[RECORD_KEY_COLUMNS])
+        return self._record_groups
+
+    def exact_positions(self, df1: pd.DataFrame, match_type: str) -> np.ndarray:
+        """Position of the first live master row with the same exact_match_keys key, per df1 row.
+
+        Args:
+            df1 (pd.DataFrame): Preprocessed input DataFrame.
+            match_type (str): Match type to look up.
+
+        Returns:
+            np.ndarray: int64 master position per df1 row, -1 where there is no exact match.
+        """
+        if match_type not in self._exact_keys:
+            keys = {}
+            deleted = self._deleted.tolist()
+            for position, key in enumerate(exact_match_keys(self.df, match_type)):
+                if key is not None and not deleted[position]:
+                    keys.setdefault(key, position)
+            self._exact_keys[match_type] = keys
+        keys = self._exact_keys[match_type]
+        return np.array([-1 if key is None else keys.get(key, -1) for key in exact_match_keys(df1, match_type)],
+                        dtype=np.int64)
+
+    def tfidf_generator(self, match_type: str) -> TfidfCandidateGenerator:
+        """TF-IDF candidate generator over the master search strings, fitted once per match type."""
+        if match_type not in self._tfidf:
+            self._tfidf[match_type] = TfidfCandidateGenerator(self.search_strings(match_type))
+        return self._tfidf[match_type]
+
+    def block_key_values(self, key: str) -> List[str]:
+        """Blocking key value of every master row, computed or unpacked once."""
+        if key not in self._block_keys:
+            if key in self._packed_block_keys:
+                self._block_keys[key] = self._packed_block_keys[key].tolist()
+            else:
+                self._block_keys[key] = compute_blocking_keys(self.df, key).tolist()
+        return self._block_keys[key]
+
+    def blocking_index(self, keys: Sequence[str], fallback_to_global: bool = True) -> BlockingIndex:
+        """Blocking index over the master for the given keys, built once and reused."""
+        cache_key = (tuple(keys), fallback_to_global)
+        if cache_key not in self._blocking:
+            key_values = {key: self.block_key_values(key) for key in keys}
+            self._blocking[cache_key] = BlockingIndex.from_key_values(key_values, len(self), fallback_to_global)
+        return self._blocking[cache_key]
+
+    def _unpack(self):
+        """Turn every packed (memory-mapped) structure into in-memory lists before an update."""
+        self.df
+        for match_type in MATCH_TYPES:
+            self.search_strings(match_type)
+        for key in list(self._packed_block_keys):
+            self.block_key_values(key)
+        if self._packed_columns:
+            # Drop views over the packed columns; they are rebuilt from the DataFrame on next use
+            self._records = None
+            self._address_parts = None
+        self._packed_index = None
+        self._packed_columns = {}
+        self._packed_search_strings = {}
+        self._packed_block_keys = {}
+        self._deleted = np.array(self._deleted, dtype=bool)
+        if self._row_hashes is not None:
+            self._row_hashes = np.array(self._row_hashes, dtype=np.uint64)
+
+    def _next_version(self, change: bytes) -> str:
+        """Content hash after an append or delete: the previous hash chained with the change."""
+        digest = hashlib.md5(str(self.content_hash).encode('utf-8'))
+        digest.update(change)
+        return digest.hexdigest()
+
+    def append(self, raw_rows: pd.DataFrame, labels: Sequence[int] = None) -> np.ndarray:
+        """Add raw master rows at the end of the index, preprocessing only the new rows.
+
+        Search strings, blocking keys, parsed addresses, blocking indexes and TF-IDF
+        matrices are extended in place; duplicate groups are rebuilt on next use.
+
+        Args:
+            raw_rows (pd.DataFrame): New rows, with the same columns as the raw master sheet.
+            labels (Sequence[int]): Index label of each new row. If None, they continue after
+                the highest existing label.
+
+        Returns:
+            np.ndarray: Positions of the new rows.
+        """
+        self._unpack()
+        start = len(self)
+        new_df = preprocess_data(raw_rows)
+        if labels is None:
+            first = int(self._df.index.max()) + 1 if start else 0
+            labels = range(first, first + len(new_df))
+        new_df.index = pd.Index(np.asarray(labels, dtype=np.int64))
+        self._df = pd.concat([self._df, new_df]) if start else new_df
+
+        for match_type, strings in self._search_strings.items():
+            self._search_strings[match_type] = strings + build_search_strings(new_df, match_type)
+        new_keys = {key: compute_blocking_keys(new_df, key).tolist() for key in self._block_keys}
+        for key, values in new_keys.items():
+            self._block_keys[key] = self._block_keys[key] + values
+        for (keys, _), blocking in self._blocking.items():
+            blocking.append({key: new_keys[key] for key in keys})
+        if self._records is not None:
+            self._records = self._records + record_list(new_df)
+        if self._address_parts is not None:
+            self._address_parts = self._address_parts + address_parts_list(new_df)
+        self._record_bounds = None
+        for match_type, generator in self._tfidf.items():
+            generator.append(self._search_strings[match_type][start:])
+        self._search_string_groups = {}
+        self._record_groups = None
+        self._exact_keys = {}
+
+        row_hashes = compute_row_hashes(raw_rows)
+        self._deleted = np.concatenate([self._deleted, np.zeros(len(new_df), dtype=bool)])
+        if self._row_hashes is not None:
+            self._row_hashes = np.concatenate([self._row_hashes, row_hashes])
+        self._size = start + len(new_df)
+        self.content_hash = self._next_version(b'append' + row_hashes.tobytes())
+        return np.arange(start, self._size)
+
+    def delete(self, positions: Sequence[int]):
+        """Tombstone master rows: they are never a candidate again, and other positions are unchanged.
+
+        Compacts the index once more than MAX_TOMBSTONE_FRACTION of its rows are tombstones,
+        which renumbers the positions after the deleted rows.
+
+        Args:
+            positions (Sequence[int]): Positions of the rows to delete.
+        """
+        self._unpack()
+        positions = np.asarray(positions, dtype=np.intp)
+        positions = np.unique(positions[~self._deleted[positions]])
+        if not len(positions):
+            return
+        self._tombstone(positions)
+        self.content_hash = self._next_version(b'delete' + positions.astype(np.int64).tobytes())
+        if self.deleted_count > MAX_TOMBSTONE_FRACTION * len(self):
+            self.compact()
+
+    def _tombstone(self, positions: np.ndarray):
+        """Blank the search strings and blocking keys of live rows at sorted, unique positions."""
+        if not len(positions):
+            return
+        position_list = positions.tolist()
+        for (keys, _), blocking in self._blocking.items():
+            blocking.remove({key: [self._block_keys[key][p] for p in position_list] for key in keys}, positions)
+        for strings in (*self._search_strings.values(), *self._block_keys.values()):
+            for position in position_list:
+                strings[position] = ''
+        for generator in self._tfidf.values():
+            generator.remove(position_list)
+        self._search_string_groups = {}
+        self._record_groups = None
+        self._exact_keys = {}
+        self._deleted[positions] = True
+
+    def compact(self):
+        """Drop tombstoned rows, renumbering the positions of the live rows.
+
+        The live rows are not preprocessed or parsed again; blocking indexes and TF-IDF
+        generators are rebuilt on next use. The content hash changes, because results
+        cached against the index (see ResultCache) refer to master positions.
+        """
+        if not self.deleted_count:
+            return
+        self._unpack()
+        live = np.flatnonzero(~self._deleted)
+        self.content_hash = self._next_version(b'compact' + live.astype(np.int64).tobytes())
+        live_list = live.tolist()
+
+        def keep(values):
+            return [values[p] for p in live_list]
+
+        self._df = self._df.iloc[live]
+        self._search_strings = {match_type: keep(strings) for match_type, strings in self._search_strings.items()}
+        self._block_keys = {key: keep(values) for key, values in self._block_keys.items()}
+        if self._records is not None:
+            self._records = keep(self._records)
+        if self._address_parts is not None:
+            self._address_parts = keep(self._address_parts)
+        self._record_bounds = None
+        if self._row_hashes is not None:
+            self._row_hashes = self._row_hashes[live]
+        self._blocking = {}
+        self._tfidf = {}
+        self._search_string_groups = {}
+        self._record_groups = None
+        self._exact_keys = {}
+        self._deleted = np.zeros(len(live), dtype=bool)
+        self._size = len(live)
+        logging.info(f"Compacted master index to {len(live)} records.")
+
+    def update_from(self, raw_df: pd.DataFrame, row_hashes: np.ndarray = None) -> bool:
+        """Bring the index up to date with a new version of the raw master sheet.
+
+        Works when the new sheet is the current rows, some of them removed, followed by new
+        rows, as with a monthly refresh: removed rows are tombstoned, kept rows take their
+        new labels, and only the new rows are preprocessed. The result matches an index built
+        from raw_df. An edited or reordered row ends the kept rows, and every row after it
+        counts as removed and appended again; when that would remove more than
+        MAX_TOMBSTONE_FRACTION of the live rows, nothing is updated and a full rebuild is left
+        to the caller.
+
+        Args:
+            raw_df (pd.DataFrame): New raw master sheet.
+            row_hashes (np.ndarray): compute_row_hashes(raw_df), if already computed.
+
+        Returns:
+            bool: True if the index was updated, False if it needs a full rebuild instead.
+        """
+        if self._row_hashes is None:
+            return False
+        if row_hashes is None:
+            row_hashes = compute_row_hashes(raw_df)
+        live = np.flatnonzero(~np.asarray(self._deleted))
+        kept = live[align_appended_rows(np.asarray(self._row_hashes)[live], row_hashes)]
+        if not len(kept) or len(live) - len(kept) > MAX_TOMBSTONE_FRACTION * len(live):
+            return False
+
+        self._unpack()
+        removed = np.setdiff1d(live, kept, assume_unique=True)
+        labels = self._df.index.to_numpy(dtype=np.int64, copy=True)
+        labels[kept] = raw_df.index[:len(kept)]
+        self._tombstone(removed)  # Compacted below, once the new rows are in
+        # Tombstones get negative labels, so labels stay unique after the kept rows take theirs
+        dead = np.flatnonzero(self._deleted)
+        labels[dead] = -1 - np.arange(len(dead))
+        self._df.index = pd.Index(labels)
+        self._records = None  # Records carry their labels
+        appended = raw_df.iloc[len(kept):]
+        if len(appended):
+            self.append(appended, labels=raw_df.index[len(kept):])
+        logging.info(f"Updated master index: kept {len(kept)}, removed {len(removed)}, "
+                     f"appended {len(appended)} records.")
+        if self.deleted_count > MAX_TOMBSTONE_FRACTION * len(self):
+            self.compact()
+        # Set last, so the index is stored under the new sheet's hash even after compacting
+        self.content_hash = compute_content_hash(raw_df, row_hashes)
+        return True
+
+    def to_arrays(self) -> Tuple[Dict[str, np.ndarray], dict]:
+        """Flatten the index into named numpy arrays plus JSON-serializable metadata.
+
+        Returns:
+            Tuple[Dict[str, np.ndarray], dict]: Arrays by name, and metadata for from_arrays.
+        """
+        df = self.df
+        arrays = {'index': df.index.to_numpy(dtype=np.int64)}
+        for col in df.columns:
+            if col == 'House_Number':
+                arrays[f'column.{col}'] = df[col].fillna(-1).to_numpy(dtype=np.int64)
+            else:
+                arrays.update(self._pack(self._packed_columns.get(col), df[col].tolist(), f'column.{col}'))
+        for match_type in MATCH_TYPES:
+            arrays.update(self._pack(self._packed_search_strings.get(match_type),
+                                     self._search_strings.get(match_type) or self.search_strings(match_type),
+                                     f'search.{match_type}'))
+        block_keys = sorted(set(self._block_keys) | set(self._packed_block_keys))
+        for key in block_keys:
+            arrays.update(self._pack(self._packed_block_keys.get(key), self._block_keys.get(key), f'block.{key}'))
+        arrays['deleted'] = np.asarray(self._deleted, dtype=bool)
+        if self._row_hashes is not None:
+            arrays['row_hashes'] = np.asarray(self._row_hashes, dtype=np.uint64)
+        meta = {
+            'format_version': self.FORMAT_VERSION,
+            'content_hash': self.content_hash,
+            'rows': len(df),
+            'columns': list(df.columns),
+            'block_keys': block_keys,
+            'deleted': self.deleted_count,
+            'source': self.source,
+        }
+        return arrays, meta
+
+    @staticmethod
+    def _pack(packed: Optional[PackedStrings], strings: Optional[List[str]], name: str) -> Dict[str, np.ndarray]:
+        if packed is None:
+            packed = PackedStrings.from_list(strings)
+        return {f'{name}.data': packed.data, f'{name}.offsets': packed.offsets}
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray], meta: dict) -> 'MasterIndex':
+        """Rebuild an index from to_arrays output, without copying the arrays.
+
+        Args:
+            arrays (Dict[str, np.ndarray]): Arrays by name, e.g. memory-mapped or in shared memory.
+            meta (dict): Metadata returned by to_arrays.
+
+        Returns:
+            MasterIndex: The index.
+        """
+        def packed(name):
+            return PackedStrings(arrays[f'{name}.data'], arrays[f'{name}.offsets'])
+        
+        index = cls(content_hash=meta['content_hash'])
+        index._size = meta['rows']
+        index._packed_index = arrays['index']
+        for col in meta['columns']:
+            index._packed_columns[col] = arrays[f'column.{col}'] if col == 'House_Number' else packed(f'column.{col}')
+        for match_type in MATCH_TYPES:
+            index._packed_search_strings[match_type] = packed(f'search.{match_type}')
+        for key in meta['block_keys']:
+            index._packed_block_keys[key] = packed(f'block.{key}')
+        index._deleted = arrays['deleted']
+        index._row_hashes = arrays.get('row_hashes')
+        index.source = meta.get('source')
+        return index
+
+    def save(self, path: str):
+        """Save the index to a directory, replacing any index already there.
+
+        Args:
+            path (str): Directory to write.
+        """
+        arrays, meta = self.to_arrays()
+        tmp_path = f"{path}.tmp"
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        os.makedirs(tmp_path)
+        
+        for name, array in arrays.items():
+            np.save(os.path.join(tmp_path, f'{name}.npy'), array)
+        meta['arrays'] = list(arrays)
+        with open(os.path.join(tmp_path, 'meta.json'), 'w') as f:
+            json.dump(meta, f, indent=2)
+        
+        # Swap in the complete index only once everything is written
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str, content_hash: str = None) -> 'MasterIndex':
+        """Memory-map an index saved with save().
+
+        Args:
+            path (str): Index directory.
+            content_hash (str): Optional expected content hash of the raw master sheet.
+
+        Returns:
+            MasterIndex: The loaded index.
+
+        Raises:
+            ValueError: If the index has another format version or content hash.
+        """
+        with open(os.path.join(path, 'meta.json')) as f:
+            meta = json.load(f)
+        if meta.get('format_version') != cls.FORMAT_VERSION:
+            raise ValueError(f"Master index {path} has format version {meta.get('format_version')}, "
+                             f"expected {cls.FORMAT_VERSION}")
+        if content_hash is not None and meta['content_hash'] != content_hash:
+            raise ValueError(f"Master index {path} was built from a different master sheet")
+        
+        arrays = {name: np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r') for name in meta['arrays']}
+        return cls.from_arrays(arrays, meta)
+
+    @classmethod
+    def load_or_build(cls, raw_df: pd.DataFrame, cache_dir: str, source: str = None) -> 'MasterIndex':
+        """Load the cached index for this master sheet, or build and cache it.
+
+        Indexes are stored under cache_dir in a directory named by the sheet's content
+        hash, and record the source they were built for. Indexes of older versions of the
+        same source are removed; other masters' indexes in cache_dir are left alone. When
+        the sheet has only lost rows or gained rows at the end since the source's cached
+        version, that index is updated (see update_from) instead of rebuilt.
+
+        Args:
+            raw_df (pd.DataFrame): Raw master sheet.
+            cache_dir (str): Directory holding cached indexes.
+            source (str): Identity of the master sheet, e.g. from index_source(), so several
+                masters can share cache_dir. None is a source of its own.
+
+        Returns:
+            MasterIndex: Index for the current master sheet.
+        """
+        row_hashes = compute_row_hashes(raw_df)
+        content_hash = compute_content_hash(raw_df, row_hashes)
+        path = os.path.join(cache_dir, content_hash)
+        if os.path.exists(os.path.join(path, 'meta.json')):
+            try:
+                index = cls.load(path, content_hash)
+                logging.info(f"Loaded master index {content_hash} ({len(index)} records).")
+                return index
+            except (ValueError, OSError, KeyError) as e:
+                logging.warning(f"Rebuilding master index {content_hash}: {e}")
+        
+        previous = cls._source_entries(cache_dir, source)
+        index = cls._update_previous(raw_df, row_hashes, previous)
+        if index is None:
+            logging.info(f"Building master index {content_hash}...")
+            index = cls.build(raw_df, row_hashes)
+        index.source = source
+        os.makedirs(cache_dir, exist_ok=True)
+        for entry_path in previous:
+            if os.path.basename(entry_path) != content_hash:
+                shutil.rmtree(entry_path, ignore_errors=True)
+        index.save(path)
+        logging.info(f"Saved master index to {path}.")
+        return index
+
+    @staticmethod
+    def _source_entries(cache_dir: str, source: Optional[str]) -> List[str]:
+        """Paths of the indexes in cache_dir built for source: hash-named, with a meta.json naming it."""
+        if not os.path.isdir(cache_dir):
+            return []
+        entries = []
+        for entry in os.listdir(cache_dir):
+            meta_path = os.path.join(cache_dir, entry, 'meta.json')
+            if not re.fullmatch(r'[0-9a-f]{32}', entry) or not os.path.exists(meta_path):
+                continue
+            try:
+                with open(meta_path) as f:
+                    entry_source = json.load(f).get('source')
+            except (OSError, ValueError) as e:
+                logging.warning(f"Ignoring master index {entry}: {e}")
+                continue
+            if entry_source == source:
+                entries.append(os.path.join(cache_dir, entry))
+        return entries
+
+    @classmethod
+    def _update_previous(cls, raw_df: pd.DataFrame, row_hashes: np.ndarray,
+                         previous: List[str]) -> Optional['MasterIndex']:
+        """Load the most recent of the source's cached indexes and update it to raw_df, if possible."""
+        if not previous:
+            return None
+        path = max(previous, key=os.path.getmtime)
+        try:
+            index = cls.load(path)
+            if index.update_from(raw_df, row_hashes):
+                return index
+        except (ValueError, OSError, KeyError) as e:
+            logging.warning(f"Not updating master index {os.path.basename(path)}: {e}")
+        return None
+
+class SharedMasterIndex:
+    """A master index copied once into shared memory, for matching in worker processes.
+
+    Workers attach to the shared blocks by name instead of receiving a pickled copy of
+    the master. Use as a context manager so the blocks are freed when matching is done.
+
+    Example:
+        >>> with SharedMasterIndex(master) as shared:
+        ...     pool = ProcessPoolExecutor(initializer=init_match_worker, initargs=(shared.spec,))
+    """
+
+    BOUNDS_ARRAYS = ('house_numbers', 'designators', 'first_present', 'last_present')  # RecordBounds arrays
+
+    def __init__(self, master: MasterIndex, block_keys: Sequence[str] = ()):
+        """Copy the master's arrays into shared memory.
+
+        Args:
+            master (MasterIndex): Master data to share.
+            block_keys (Sequence[str]): Blocking keys the workers will need.
+        """
+        for key in block_keys:
+            master.block_key_values(key)
+        arrays, meta = master.to_arrays()
+        # Derived once here, so no worker needs the master's rows as Python objects to rebuild them
+        arrays.update({f'groups.{field}': values for field, values in master.record_groups()._asdict().items()})
+        bounds = master.record_bounds()
+        arrays.update({f'bounds.{field}': getattr(bounds, field) for field in self.BOUNDS_ARRAYS})
+        self.handles = []
+        array_specs = {}
+        try:
+            for name, array in arrays.items():
+                handle = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+                self.handles.append(handle)
+                np.ndarray(array.shape, dtype=array.dtype, buffer=handle.buf)[...] = array
+                array_specs[name] = (handle.name, array.dtype.str, array.shape)
+        except Exception:
+            self.close()
+            raise
+        self.spec = {'meta': meta, 'arrays': array_specs, 'designator_codes': bounds.designator_codes}
+
+    @staticmethod
+    def attach(spec: dict) -> Tuple[MasterIndex, list]:
+        """Rebuild the master index in a worker from the shared blocks named in spec.
+
+        The index stays packed: records and parsed addresses are decoded per candidate row,
+        and the record groups and score bounds are read from the shared arrays.
+
+        Returns:
+            Tuple[MasterIndex, list]: The index, and the shared memory handles to keep open.
+        """
+        handles = []
+        arrays = {}
+        for name, (shm_name, dtype, shape) in spec['arrays'].items():
+            handle = shared_memory.SharedMemory(name=shm_name)
+            handles.append(handle)
+            arrays[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=handle.buf)
+        index = MasterIndex.from_arrays(arrays, spec['meta'])
+        index._record_groups = DuplicateGroups(*(arrays[f'groups.{field}'] for field in DuplicateGroups._fields))
+        index._record_bounds = RecordBounds(*(arrays[f'bounds.{field}'] for field in SharedMasterIndex.BOUNDS_ARRAYS),
+                                            designator_codes=spec['designator_codes'])
+        return index, handles
+
+    def close(self):
+        """Free the shared memory blocks."""
+        for handle in self.handles:
+            handle.close()
+            handle.unlink()
+        self.handles = []
+
+    def __enter__(self) -> 'SharedMasterIndex':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+class ScoreStore:
+    """Field scores of every verified candidate pair, for re-evaluating a run instantly.
+
+    Fill the store by passing it to run_all_matches, typically at low thresholds. evaluate()
+    then reproduces the results for any threshold at or above the one used, or for other
+    field weights, from the stored first, last and address scores without rescoring.
+
+    Scores are kept column-wise in numpy arrays, one entry per (match type, candidate):
+    match type code, input and master positions, candidate rank, prefilter score and the
+    three field scores.
+
+    Example:
+        >>> store = ScoreStore()
+        >>> run_all_matches(df1, df2, thresholds={'FullName': 70.0}, score_store=store)
+        >>> store.evaluate('FullName', threshold=85.0)
+        >>> store.evaluate('FullName', threshold=80.0, weights=(0.3, 0.7, 0.0))
+    """
+
+    RECORD_DTYPE = np.dtype([
+        ('match_type', np.int8),
+        ('input_position', np.int64),
+        ('master_position', np.int64),
+        ('rank', np.int16),
+        ('prefilter', np.float64),
+        ('first', np.float64),
+        ('last', np.float64),
+        ('address', np.float64),
+    ])
+
+    def __init__(self):
+        self.match_types = []
+        self.thresholds = {}
+        self.df1 = None
+        self.df2 = None
+        self._chunks = []
+        self._columns = None
+        self._labels = None  # Names and addresses by position, for building result rows
+
+    def start(self, df1: pd.DataFrame, df2: pd.DataFrame, match_types: List[str], thresholds: Dict[str, float]):
+        """Reset the store for a new run of df1 against df2 (called by run_all_matches)."""
+        self.match_types = list(match_types)
+        self.thresholds = dict(thresholds)
+        self.df1 = df1
+        self.df2 = df2
+        self._chunks = []
+        self._columns = None
+        self._labels = None
+
+    def extend(self, records: List[tuple], input_offset: int = 0):
+        """Add records from match_rows, shifting input positions by input_offset for shards."""
+        chunk = np.array(records, dtype=self.RECORD_DTYPE)
+        chunk['input_position'] += input_offset
+        self._chunks.append(chunk)
+        self._columns = None
+
+    def fan_out(self, input_groups: DuplicateGroups):
+        """Copy the records of each group's first input row to every row of the group.
+
+        Used when only distinct input records were matched; the stored input positions are
+        then positions among the groups, and become positions in the full input.
+        """
+        records = self._records()
+        groups = records['input_position']
+        sizes = np.diff(input_groups.offsets)[groups]
+        expanded = np.repeat(records, sizes)
+        within = np.arange(len(expanded)) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+        expanded['input_position'] = input_groups.members[np.repeat(input_groups.offsets[groups], sizes) + within]
+        self._chunks = [expanded]
+        self._columns = None
+
+    def _records(self) -> np.ndarray:
+        """All stored records as one structured array."""
+        if len(self._chunks) != 1:
+            self._chunks = [np.concatenate(self._chunks) if self._chunks else np.empty(0, dtype=self.RECORD_DTYPE)]
+        return self._chunks[0]
+
+    @property
+    def columns(self) -> Dict[str, np.ndarray]:
+        """Stored records as one array per field."""
+        if self._columns is None:
+            records = self._records()
+            self._columns = {name: np.ascontiguousarray(records[name]) for name in self.RECORD_DTYPE.names}
+        return self._columns
+
+    @property
+    def labels(self) -> Dict[str, np.ndarray]:
+        """Row numbers, names and addresses of both sheets by position, built once per run."""
+        if self._labels is None:
+            self._labels = {
+                'rows1': self.df1.index.to_numpy() + 2,
+                'rows2': self.df2.index.to_numpy() + 2,
+                'names1': np.array(build_search_strings(self.df1, 'FullName'), dtype=object),
+                'names2': np.array(build_search_strings(self.df2, 'FullName'), dtype=object),
+                'addresses1': self.df1['FullAddress'].to_numpy(dtype=object),
+                'addresses2': self.df2['FullAddress'].to_numpy(dtype=object),
+            }
+        return self._labels
+
+    def __len__(self) -> int:
+        return len(self.columns['rank'])
+
+    def evaluate(self, match_type: str, threshold: float = None,
+                 weights: Tuple[float, float, float] = None) -> pd.DataFrame:
+        """Re-apply a threshold and weights to the stored scores.
+
+        Args:
+            match_type (str): A match type the store was filled for.
+            threshold (float): Minimum score. If None, uses the threshold of the run.
+            weights (Tuple[float, float, float]): Optional first, last, address weights
+                (see get_combined_score). If None, uses the match type's usual combination.
+
+        Returns:
+            pd.DataFrame: Results sorted by descending score, equal to run_all_matches at
+            this threshold when weights is None.
+
+        Raises:
+            ValueError: If the match type was not run, or threshold is below the run's.
+        """
+        if match_type not in self.match_types:
+            raise ValueError(f"No scores stored for match_type: {match_type}")
+        captured = self.thresholds[match_type]
+        threshold = captured if threshold is None else threshold
+        if threshold < captured:
+            raise ValueError(f"Threshold {threshold} is below the {captured} the scores were captured at")
+        
+        columns = self.columns
+        keep = columns['match_type'] == self.match_types.index(match_type)
+        keep &= columns['prefilter'] >= threshold * CANDIDATE_CUTOFF_RATIO
+        positions1 = columns['input_position'][keep]
+        positions2 = columns['master_position'][keep]
+        ranks = columns['rank'][keep]
+        combined = combine_score_arrays(columns['first'][keep], columns['last'][keep], columns['address'][keep],
+                                        match_type, weights)
+        
+        # A row's best candidate is only reported at or above the threshold, so skip the rest
+        eligible = np.flatnonzero((combined > 0) & (combined >= threshold))
+        if not len(eligible):
+            return pd.DataFrame()
+        
+        # Best candidate per input row: highest combined score, earliest rank on ties
+        order = eligible[np.argsort(positions1[eligible])]
+        starts = np.flatnonzero(np.r_[True, np.diff(positions1[order]) != 0])
+        sizes = np.diff(np.r_[starts, len(order)])
+        scores = combined[order]
+        is_max = scores == np.repeat(np.maximum.reduceat(scores, starts), sizes)
+        max_ranks = np.where(is_max, ranks[order], np.iinfo(ranks.dtype).max)
+        best = order[is_max & (max_ranks == np.repeat(np.minimum.reduceat(max_ranks, starts), sizes))]
+        best = best[np.r_[True, np.diff(positions1[best]) != 0]]  # Ranks are distinct per row; just in case
+        
+        
+        # Only the reported rows are looked up. Scores are rounded with round() as in
+        # build_result_row, once per distinct score.
+        labels = self.labels
+        positions1 = positions1[best]
+        positions2 = positions2[best]
+        distinct_scores, score_codes = np.unique(combined[best], return_inverse=True)
+        rounded = np.array([round(score, 2) for score in distinct_scores.tolist()], dtype=np.float64)
+        results_df = pd.DataFrame({
+            'Match Score': rounded[score_codes],
+            'Sheet A Row': labels['rows1'][positions1],
+            'Sheet B Row': labels['rows2'][positions2],
+            'Name A': labels['names1'][positions1],
+            'Name B': labels['names2'][positions2],
+            'Address A': labels['addresses1'][positions1],
+            'Address B': labels['addresses2'][positions2],
+        })
+        return results_df.sort_values(by='Match Score', ascending=False)
+
+def record_hashes(df: pd.DataFrame) -> np.ndarray:
+    """64-bit hash of each preprocessed row's record (RECORD_KEY_COLUMNS), equal for duplicate rows."""
+    return pd.util.hash_pandas_object(df[RECORD_KEY_COLUMNS], index=False).to_numpy()
+
+class ResultCache:
+    """Best match of every input record seen so far, kept on disk between runs.
+
+    Results are stored per match type and engine configuration (master version, threshold,
+    candidate method, blocking), keyed by a hash of each input record. Passed to
+    run_all_matches, only records without a cached result are matched, so rerunning a
+    growing input sheet against the same master only matches its new or changed rows.
+    The results equal a full run.
+
+    Example:
+        >>> master = MasterIndex.load_or_build(master_raw, index_dir)
+        >>> cache = ResultCache.beside_index(index_dir, master)
+        >>> results = run_all_matches(df1, master, result_cache=cache)
+    """
+
+    FORMAT_VERSION = 1  # Bump whenever scoring changes, so results cached by older code are not reused
+
+    def __init__(self, directory: str):
+        """Create a cache.
+
+        Args:
+            directory (str): Directory holding one .npz file per match type and configuration.
+        """
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self._loaded = {}
+        self._run = None
+
+    @classmethod
+    def beside_index(cls, cache_dir: str, master: 'MasterIndex') -> 'ResultCache':
+        """Cache inside the cached master index's directory, so it goes away with that master version.
+
+        Args:
+            cache_dir (str): Directory passed to MasterIndex.load_or_build.
+            master (MasterIndex): Index returned by MasterIndex.load_or_build.
+        """
+        return cls(os.path.join(cache_dir, master.content_hash, RESULT_CACHE_DIRNAME))
+
+    def key(self, master_hash: str, match_type: str, threshold: float, candidate_method: str = 'cdist',
+            blocking: 'BlockingIndex' = None, exact: bool = True) -> str:
+        """Hex digest of every setting a match type's results depend on, besides the input record."""
+        settings = {
+            'format_version': self.FORMAT_VERSION,
+            'master': master_hash,
+            'match_type': match_type,
+            'threshold': threshold,
+            'weights': DEFAULT_WEIGHTS[match_type],
+            'candidate_method': candidate_method,
+            'candidate_limit': CANDIDATE_LIMIT,
+            'cutoff_ratio': CANDIDATE_CUTOFF_RATIO,
+            'tfidf': [TFIDF_NGRAM_RANGE, TFIDF_NEIGHBORS] if candidate_method == 'tfidf' else None,
+            'blocking': None if blocking is None else [list(blocking.keys), blocking.fallback_to_global],
+            'exact': exact,
+        }
+        return hashlib.md5(json.dumps(settings, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f'{key}.npz')
+
+    def _load(self, key: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Sorted record hashes with their master positions (-1 for no match) and scores."""
+        if key not in self._loaded:
+            entries = (np.empty(0, np.uint64), np.empty(0, np.int64), np.empty(0, np.float64))
+            if os.path.exists(self._path(key)):
+                try:
+                    with np.load(self._path(key)) as stored:
+                        entries = (stored['hashes'], stored['positions'], stored['scores'])
+                except (OSError, ValueError, KeyError) as e:
+                    logging.warning(f"Ignoring unreadable result cache {self._path(key)}: {e}")
+            self._loaded[key] = entries
+        return self._loaded[key]
+
+    def lookup(self, key: str, hashes: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Cached results for records.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: Whether each record is cached, its
+            master position (-1 if uncached or without a match) and its match score.
+        """
+        stored_hashes, positions, scores = self._load(key)
+        if not len(stored_hashes):
+            return np.zeros(len(hashes), bool), np.full(len(hashes), -1, np.int64), np.zeros(len(hashes))
+        slots = np.minimum(np.searchsorted(stored_hashes, hashes), len(stored_hashes) - 1)
+        found = stored_hashes[slots] == hashes
+        return found, np.where(found, positions[slots], -1), np.where(found, scores[slots], 0.0)
+
+    def update(self, key: str, hashes: np.ndarray, positions: np.ndarray, scores: np.ndarray):
+        """Add results for records, replacing any cached ones, and save the file."""
+        stored_hashes, stored_positions, stored_scores = self._load(key)
+        # New entries come first, so np.unique keeps them over older ones for the same record
+        all_hashes = np.concatenate([hashes, stored_hashes])
+        all_hashes, keep = np.unique(all_hashes, return_index=True)
+        entries = (all_hashes, np.concatenate([positions, stored_positions])[keep],
+                   np.concatenate([scores, stored_scores])[keep])
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f'{self._path(key)}.tmp.npz'
+        np.savez(tmp_path, hashes=entries[0], positions=entries[1], scores=entries[2])
+        os.replace(tmp_path, self._path(key))
+        self._loaded[key] = entries
+
+    def start(self, df1: pd.DataFrame, master: 'MasterIndex', match_types: List[str],
+              thresholds: Dict[str, float], candidate_method: str = 'cdist',
+              blocking: 'BlockingIndex' = None, rematch_all: bool = False, exact: bool = True) -> np.ndarray:
+        """Look up every row of df1 for a run; called by run_all_matches.
+
+        Args:
+            df1 (pd.DataFrame): Preprocessed input rows of the run (distinct records).
+            master (MasterIndex): Master data of the run.
+            match_types (List[str]): Match types of the run.
+            thresholds (Dict[str, float]): Minimum score per match type.
+            candidate_method (str): Candidate method of the run.
+            blocking (BlockingIndex): Blocking index of the run, if any.
+            rematch_all (bool): Match every row anyway (the cache is still updated).
+            exact (bool): Whether the run matches exact hits without fuzzy scoring.
+
+        Returns:
+            np.ndarray: Boolean mask of the rows that need matching.
+        """
+        master_hash = master.content_hash or compute_content_hash(master.df)
+        hashes = record_hashes(df1)
+        keys = {match_type: self.key(master_hash, match_type, thresholds[match_type], candidate_method, blocking,
+                                     exact)
+                for match_type in match_types}
+        cached = {match_type: self.lookup(key, hashes) for match_type, key in keys.items()}
+        fresh = ~np.logical_and.reduce([cached[match_type][0] for match_type in match_types])
+        if rematch_all:
+            fresh[:] = True
+        self.hits += int((~fresh).sum())
+        self.misses += int(fresh.sum())
+        self._run = (hashes, keys, cached, fresh)
+        return fresh
+
+    def finish(self, results: Dict[str, List[dict]], df1: pd.DataFrame,
+               master: 'MasterIndex', matched: np.ndarray = None) -> Dict[str, List[dict]]:
+        """Cache the results of the rows matched in this run and add back the cached rows.
+
+        Args:
+            results (Dict[str, List[dict]]): Result rows per match type for the rows start() asked to match.
+            df1 (pd.DataFrame): The DataFrame passed to start().
+            master (MasterIndex): The master passed to start().
+            matched (np.ndarray): Optional boolean array over df1 positions, already set for the
+                rows matched in this run; set here for the cached rows that have a result.
+
+        Returns:
+            Dict[str, List[dict]]: Result rows per match type for all of df1, in df1 order.
+        """
+        hashes, keys, cached, fresh = self._run
+        self._run = None
+        labels = df1.index.tolist()
+        fresh_rows = np.flatnonzero(fresh)
+        names1 = build_search_strings(df1, 'FullName')
+        addresses1 = df1['FullAddress'].tolist()
+        labels2 = master.df.index
+        names2 = master.search_strings('FullName')
+        addresses2 = master.df['FullAddress'].tolist()
+        
+        merged = {}
+        for match_type, rows in results.items():
+            by_label = {row['Sheet A Row'] - 2: row for row in rows}
+            positions = np.full(len(fresh_rows), -1, np.int64)
+            scores = np.zeros(len(fresh_rows))
+            for i, position1 in enumerate(fresh_rows.tolist()):
+                row = by_label.get(labels[position1])
+                if row is not None:
+                    positions[i] = labels2.get_loc(row['Sheet B Row'] - 2)
+                    scores[i] = row['Match Score']
+            self.update(keys[match_type], hashes[fresh_rows], positions, scores)
+            
+            _, cached_positions, cached_scores = cached[match_type]
+            merged[match_type] = []
+            for position1, label in enumerate(labels):
+                if fresh[position1]:
+                    if label in by_label:
+                        merged[match_type].append(by_label[label])
+                elif cached_positions[position1] >= 0:
+                    if matched is not None:
+                        matched[position1] = True
+                    position2 = int(cached_positions[position1])
+                    merged[match_type].append({
+                        'Match Score': round(float(cached_scores[position1]), 2),
+                        'Sheet A Row': label + 2,
+                        'Sheet B Row': labels2[position2] + 2,
+                        'Name A': names1[position1],
+                        'Name B': names2[position2],
+                        'Address A': addresses1[position1],
+                        'Address B': addresses2[position2],
+                    })
+        return merged
+
+def resolve_threshold(match_type: str, threshold: float = None) -> float:
+    """Return the given threshold, or the default for the match type if None."""
+    if threshold is None:
+        return DEFAULT_THRESHOLDS.get(match_type, 80.0)
+    return threshold
+
+def build_match_candidates(df1: pd.DataFrame, master: MasterIndex, match_type: str,
+                           threshold: float, chunk_size: int = None, blocking=None,
+                           score_workers: int = -1, candidate_method: str = 'cdist', dedupe: bool = True):
+    """Build search strings for one match type and generate prefilter candidates per input row.
+
+    Args:
+        df1 (pd.DataFrame): Preprocessed input DataFrame.
+        master (MasterIndex): Master data to search.
+        match_type (str): Type of match to build search strings for.
+        threshold (float): Match threshold; the prefilter cutoff is a fraction of it.
+        chunk_size (int): Optional input rows per candidate-generation batch.
+        blocking (BlockingIndex): Optional blocking index over df2.
+        score_workers (int): Threads per score matrix (-1 for all cores).
+        candidate_method (str): 'cdist' or 'tfidf' (see CANDIDATE_METHODS).
+        dedupe (bool): Score duplicate master search strings once (same candidates either way).
+
+    Returns:
+        Iterable[List[Tuple[int, float]]]: Candidates per input row, in df1 order.
+    """
+    with stage('search_strings', match_type=match_type):
+        # Pre-compute search strings ONCE (not for every input row!)
+        logging.info(f"Pre-computing {match_type} search strings for master data...")
+        search_strings = master.search_strings(match_type)
+        logging.info(f"Pre-computed {len(search_strings)} search strings.")
+        
+        # Score input rows against all master search strings in batches
+        query_strings = build_search_strings(df1, match_type)
+    score_cutoff = threshold * CANDIDATE_CUTOFF_RATIO
+    generator = master.tfidf_generator(match_type) if candidate_method == 'tfidf' else None
+    if blocking is None:
+        if generator is not None:
+            return generator.candidates(query_strings, score_cutoff, chunk_size=chunk_size)
+        groups = master.search_string_groups(match_type) if dedupe else None
+        if groups is not None and len(groups) < len(search_strings):
+            # Score each distinct master search string once, then expand back to rows
+            logging.info(f"Scoring {len(groups)} distinct {match_type} search strings...")
+            unique_strings = [search_strings[row] for row in groups.first.tolist()]
+            return expand_duplicate_candidates(
+                generate_candidates(query_strings, unique_strings, score_cutoff, chunk_size=chunk_size,
+                                    workers=score_workers),
+                groups)
+        return generate_candidates(query_strings, search_strings, score_cutoff, chunk_size=chunk_size,
+                                   workers=score_workers)
+    logging.info(f"Restricting {match_type} candidates to blocks on {', '.join(blocking.keys)}...")
+    return generate_blocked_candidates(query_strings, search_strings, score_cutoff,
+                                       blocking.query_signatures(df1), blocking, chunk_size, score_workers,
+                                       generator)
+
+def match_rows(df1: pd.DataFrame, master: MasterIndex, match_types: List[str], thresholds: Dict[str, float],
+               chunk_size: int = None, blocking: BlockingIndex = None,
+               score_workers: int = -1, candidate_method: str = 'cdist',
+               score_records: List[tuple] = None, score_cache: FieldScoreCache = None,
+               dedupe: bool = True, progress: Callable[[int], None] = None,
+               pruning: PruningStats = None, exact: bool = True, top_n: int = 1,
+               matched: np.ndarray = None, exact_positions: Dict[str, np.ndarray] = None) -> Dict[str, List[dict]]:
+    """Match every row of df1 against the master for each match type, in one sweep.
+
+    This is the serial engine behind run_all_matches; worker processes run it on shards of df1.
+
+    Args:
+        df1 (pd.DataFrame): Preprocessed input DataFrame (or a slice of it).
+        master (MasterIndex): Master data to search.
+        match_types (List[str]): Match types to run.
+        thresholds (Dict[str, float]): Minimum score per match type.
+        chunk_size (int): Optional input rows per candidate-generation batch.
+        blocking (BlockingIndex): Optional blocking index over the master.
+        score_workers (int): Threads per score matrix (-1 for all cores).
+        candidate_method (str): 'cdist' or 'tfidf' (see CANDIDATE_METHODS).
+        score_records (List[tuple]): Optional list to append a ScoreStore record to for
+            every verified candidate.
+        score_cache (FieldScoreCache): Optional memo of field scores shared across rows.
+        dedupe (bool): Score duplicate master search strings and records once.
+        progress (Callable[[int], None]): Optional function called with the number of rows
+            done after each row.
+        pruning (PruningStats): Optional counter; if enabled, candidate pairs whose
+            score_upper_bounds is below the threshold are dropped before scoring. Such a pair
+            can never be a reported match, so results are unchanged. Ignored (every pair is
+            scored) when score_records is given.
+        exact (bool): Match rows whose exact_match_keys key is in the master at score 100,
+            against the first master row with that key, without fuzzy candidates. With
+            blocking, only hits inside the row's blocks count. Ignored when score_records
+            is given or top_n is above 1.
+        top_n (int): Matches to keep per row and match type. Above 1, every result row
+            gets a Rank column (1 for the best match).
+        matched (np.ndarray): Optional boolean array over df1 positions, set to True for
+            every row that gets a result of any match type.
+        exact_positions (Dict[str, np.ndarray]): master.exact_positions(df1, match_type) per
+            match type, if already computed (match_rows_parallel passes each shard its slice).
+
+    Returns:
+        Dict[str, List[dict]]: Result rows per match type, in df1 order (and rank order).
+    """
+    master_records = master.records()
+    exact_lists = []
+    candidate_lists = []
+    for match_type in match_types:
+        if exact and score_records is None and top_n == 1 and thresholds[match_type] <= 100:
+            # Only rows without an exact hit go through fuzzy candidate generation
+            with stage('exact', match_type=match_type):
+                if exact_positions is not None:
+                    exact_hits = exact_positions[match_type]
+                else:
+                    exact_hits = master.exact_positions(df1, match_type)
+                if blocking is not None:
+                    # Rows whose exact hit is outside their blocks are left to fuzzy matching
+                    exact_hits = restrict_exact_to_blocks(exact_hits, blocking.query_signatures(df1), blocking)
+            fuzzy_rows = np.flatnonzero(exact_hits < 0)
+            logging.info(f"Matched {len(df1) - len(fuzzy_rows)} of {len(df1)} rows exactly for {match_type}.")
+            candidates = build_match_candidates(df1.iloc[fuzzy_rows], master, match_type, thresholds[match_type],
+                                                chunk_size, blocking, score_workers, candidate_method,
+                                                dedupe) if len(fuzzy_rows) else []
+            candidates = merge_exact_candidates(exact_hits, candidates)
+        else:
+            exact_hits = None
+            candidates = build_match_candidates(df1, master, match_type, thresholds[match_type], chunk_size,
+                                                blocking, score_workers, candidate_method, dedupe)
+        exact_lists.append(exact_hits)
+        candidate_lists.append(candidates)
+    # Duplicate master records share their field scores
+    score_keys = master.record_groups().codes if dedupe else range(len(master))
+    
+    # Records and parsed addresses for both sheets, read once from the preprocessed columns
+    input_records = record_list(df1)
+    input_parts = address_parts_list(df1)
+    master_parts = master.address_parts()
+    
+    prune = pruning is not None and pruning.enabled and score_records is None
+    if prune:
+        master_bounds = master.record_bounds()
+        input_bounds = RecordBounds.build(input_parts, df1, master_bounds.designator_codes)
+    checked = pruned = 0
+    
+    # Candidates are generated lazily, so their time is taken as each row's candidates arrive
+    timer = active_timer()
+    row_candidate_lists = timed_iter(zip(*candidate_lists), 'candidates', timer)
+    
+    results = {match_type: [] for match_type in match_types}
+    for position1, (record1, row_candidates) in enumerate(zip(input_records, row_candidate_lists)):
+        if (record1.label + 1) % 100 == 0:  # Progress logging
+            logging.info(f"Processed {record1.label + 1}/{len(df1)} rows...")
+        if timer is not None:
+            verify_start = time.perf_counter()
+        
+        # Field scores per master record, shared by all match types for this row
+        pair_scores = {}
+        
+        for type_code, (match_type, candidates) in enumerate(zip(match_types, row_candidates)):
+            if candidates is None:
+                # Exact hit: an identical key scores 100, so there is nothing to verify
+                record2 = master_records[exact_lists[type_code][position1]]
+                results[match_type].append(build_result_row(record1.label, record1, record2.label, record2, 100.0))
+                if matched is not None:
+                    matched[position1] = True
+                continue
+            
+            best_score = 0
+            best_record2 = None
+            # With top_n, a bounded heap whose root is the worst match kept: lowest score, latest rank
+            top_matches = []
+            
+            if prune and candidates:
+                # Skip pairs that provably score below the threshold, before any string scoring
+                positions = np.fromiter((p for p, _ in candidates), dtype=np.int64, count=len(candidates))
+                keep = score_upper_bounds(input_bounds, position1, master_bounds, positions,
+                                          match_type) >= thresholds[match_type]
+                checked += len(candidates)
+                if not keep.all():
+                    pruned += len(candidates) - int(keep.sum())
+                    candidates = [candidate for candidate, kept in zip(candidates, keep.tolist()) if kept]
+            
+            # Verify candidates with our sophisticated scoring logic
+            for rank, (list_position, candidate_score) in enumerate(candidates):
+                record2 = master_records[list_position]
+                
+                # Use our sophisticated scoring logic
+                score_key = score_keys[list_position]
+                if score_key not in pair_scores:
+                    pair_scores[score_key] = compute_individual_scores(
+                        record1, record2, input_parts[position1], master_parts[list_position], score_cache
+                    )
+                if score_records is not None:
+                    score_records.append((type_code, position1, list_position, rank, candidate_score,
+                                          *pair_scores[score_key]))
+                accurate_score = get_combined_score(pair_scores[score_key], match_type)
+                
+                if top_n > 1:
+                    if accurate_score > 0 and accurate_score >= thresholds[match_type]:
+                        match = (accurate_score, -rank, list_position)
+                        if len(top_matches) < top_n:
+                            heapq.heappush(top_matches, match)
+                        elif match > top_matches[0]:
+                            heapq.heapreplace(top_matches, match)
+                elif accurate_score > best_score:
+                    best_score = accurate_score
+                    best_record2 = record2
+            
+            if top_n > 1:
+                # Best first, earliest candidate first on ties, so rank 1 is the top_n=1 match
+                for match_rank, (score, _, list_position) in enumerate(sorted(top_matches, reverse=True), start=1):
+                    record2 = master_records[list_position]
+                    row = build_result_row(record1.label, record1, record2.label, record2, score)
+                    row['Rank'] = match_rank
+                    results[match_type].append(row)
+                if top_matches and matched is not None:
+                    matched[position1] = True
+            # Add result if above threshold
+            elif best_score >= thresholds[match_type] and best_record2 is not None:
+                results[match_type].append(build_result_row(record1.label, record1, best_record2.label,
+                                                            best_record2, best_score))
+                if matched is not None:
+                    matched[position1] = True
+        if timer is not None:
+            timer.add('verify', verify_start, time.perf_counter() - verify_start, row=position1)
+        if progress is not None:
+            progress(position1 + 1)
+    if prune:
+        pruning.add(checked, pruned)
+    return results
+
+# Master index and field score cache set up in each worker process by init_match_worker
+_worker_master = None
+_worker_handles = []
+_worker_cache = None
+
+def init_match_worker(spec: dict, cache_size: int = FIELD_CACHE_SIZE):
+    """Process pool initializer: attach to the shared master index once per worker.
+
+    The worker also keeps one field score cache for all the shards it matches.
+    """
+    global _worker_master, _worker_handles, _worker_cache
+    _worker_master, _worker_handles = SharedMasterIndex.attach(spec)
+    _worker_cache = FieldScoreCache(cache_size)
+
+class ShardResult(NamedTuple):
+    results: Dict[str, List[dict]]        # Result rows per match type
+    score_records: Optional[List[tuple]]  # ScoreStore records, if requested
+    events: List[StageEvent]              # Stage timings, if requested
+    cache_counts: Dict[str, Tuple[int, int]]  # Field score cache hits and misses for the shard
+    prune_counts: Tuple[int, int]         # Candidate pairs checked and pruned by score bounds
+    matched: np.ndarray                   # Whether each shard row got a result of any match type
+
+def match_shard(df1_shard: pd.DataFrame, match_types: List[str], thresholds: Dict[str, float],
+                chunk_size: int = None, blocking_keys: Tuple[Tuple[str, ...], bool] = None,
+                candidate_method: str = 'cdist', keep_scores: bool = False,
+                timed: bool = False, dedupe: bool = True, prune: bool = True,
+                exact: bool = True, top_n: int = 1,
+                exact_positions: Dict[str, np.ndarray] = None) -> ShardResult:
+    """Run match_rows in a worker process against its shared master index.
+
+    Returns:
+        ShardResult: Result rows per match type, the shard's ScoreStore records if keep_scores
+        is set, its stage timings if timed is set, its field score cache counts, its
+        pruning counts and its matched-row mask.
+    """
+    blocking = None
+    if blocking_keys is not None:
+        blocking = _worker_master.blocking_index(*blocking_keys)
+    score_records = [] if keep_scores else None
+    timer = StageTimer()
+    counts_before = _worker_cache.counts()
+    pruning = PruningStats(prune)
+    matched = np.zeros(len(df1_shard), dtype=bool)
+    # A forked worker inherits the parent's active timer, so always set its own (or none)
+    with instrument(timer if timed else None):
+        # One process per core already, so each score matrix uses a single thread
+        results = match_rows(df1_shard, _worker_master, match_types, thresholds, chunk_size, blocking,
+                             score_workers=1, candidate_method=candidate_method, score_records=score_records,
+                             score_cache=_worker_cache, dedupe=dedupe, pruning=pruning, exact=exact,
+                             top_n=top_n, matched=matched, exact_positions=exact_positions)
+    cache_counts = {scorer: (hits - counts_before[scorer][0], misses - counts_before[scorer][1])
+                    for scorer, (hits, misses) in _worker_cache.counts().items()}
+    return ShardResult(results, score_records, timer.events, cache_counts, (pruning.checked, pruning.pruned),
+                       matched)
+
+def match_rows_parallel(df1: pd.DataFrame, master: MasterIndex, match_types: List[str],
+                        thresholds: Dict[str, float], workers: int, chunk_size: int = None,
+                        blocking: BlockingIndex = None, candidate_method: str = 'cdist',
+                        score_store: ScoreStore = None, score_cache: FieldScoreCache = None,
+                        dedupe: bool = True, progress: Callable[[int], None] = None,
+                        pruning: PruningStats = None, exact: bool = True,
+                        top_n: int = 1, matched: np.ndarray = None) -> Dict[str, List[dict]]:
+    """Shard df1 across a process pool, with the master placed in shared memory once.
+
+    Shards are contiguous and merged in order, so the result rows equal match_rows on df1.
+
+    Args:
+        df1 (pd.DataFrame): Preprocessed input DataFrame.
+        master (MasterIndex): Master data to search.
+        match_types (List[str]): Match types to run.
+        thresholds (Dict[str, float]): Minimum score per match type.
+        workers (int): Number of worker processes.
+        chunk_size (int): Optional input rows per candidate-generation batch.
+        blocking (BlockingIndex): Optional blocking index over the master.
+        candidate_method (str): 'cdist' or 'tfidf'. TF-IDF generators are fitted once per worker.
+        score_store (ScoreStore): Optional store to add every shard's candidate scores to.
+        score_cache (FieldScoreCache): Optional cache whose size the worker caches use, and
+            which collects their hit and miss counts.
+        dedupe (bool): Score duplicate master search strings and records once.
+        progress (Callable[[int], None]): Optional function called with the number of rows
+            done as each shard is merged. If it raises, shards not yet started are cancelled.
+        pruning (PruningStats): Optional counter that switches score-bound pruning on in the
+            workers and collects their counts (see match_rows).
+        exact (bool): Match exact hits without fuzzy scoring (see match_rows).
+        top_n (int): Matches to keep per row and match type (see match_rows).
+        matched (np.ndarray): Optional boolean array over df1 positions, set to True for
+            every row that gets a result (see match_rows).
+
+    Returns:
+        Dict[str, List[dict]]: Result rows per match type, in df1 order.
+    """
+    blocking_keys = None if blocking is None else (blocking.keys, blocking.fallback_to_global)
+    shard_size = max(1, -(-len(df1) // (workers * SHARDS_PER_WORKER)))
+    starts = range(0, len(df1), shard_size)
+    shards = [df1.iloc[start:start + shard_size] for start in starts]
+    logging.info(f"Matching {len(shards)} shards on {workers} worker processes...")
+    exact_positions = {}
+    if exact and score_store is None and top_n == 1:
+        # Looked up once here, so workers don't each build the master's exact key table
+        exact_positions = {match_type: master.exact_positions(df1, match_type) for match_type in match_types
+                           if thresholds[match_type] <= 100}
+    
+    results = {match_type: [] for match_type in match_types}
+    with SharedMasterIndex(master, blocking.keys if blocking is not None else ()) as shared:
+        cache_size = score_cache.maxsize if score_cache is not None else FIELD_CACHE_SIZE
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_match_worker,
+                                 initargs=(shared.spec, cache_size)) as pool:
+            timer = active_timer()
+            prune = pruning is not None and pruning.enabled
+            futures = [pool.submit(match_shard, shard, match_types, thresholds, chunk_size, blocking_keys,
+                                   candidate_method, score_store is not None, timer is not None, dedupe, prune,
+                                   exact, top_n, {match_type: positions[start:start + shard_size]
+                                                  for match_type, positions in exact_positions.items()})
+                       for start, shard in zip(starts, shards)]
+            try:
+                for start, future in zip(starts, futures):  # Merge in shard order, so output is deterministic
+                    shard = future.result()
+                    for event in shard.events:
+                        if 'row' in event.args:  # Row positions are relative to the shard
+                            event = event._replace(args={**event.args, 'row': event.args['row'] + start})
+                        timer.add_event(event)
+                    for match_type, rows in shard.results.items():
+                        results[match_type].extend(rows)
+                    if score_store is not None:
+                        score_store.extend(shard.score_records, input_offset=start)
+                    if score_cache is not None:
+                        score_cache.merge_counts(shard.cache_counts)
+                    if prune:
+                        pruning.add(*shard.prune_counts)
+                    if matched is not None:
+                        matched[start:start + len(shard.matched)] = shard.matched
+                    if progress is not None:
+                        progress(min(start + shard_size, len(df1)))
+            except BaseException:
+                for future in futures:  # Don't wait for shards that have not started
+                    future.cancel()
+                raise
+    return results
+
+def run_all_matches(df1: pd.DataFrame, df2: Union[pd.DataFrame, MasterIndex], match_types: Sequence[str] = None,
+                    thresholds: Dict[str, float] = None, chunk_size: int = None,
+                    blocking=None, workers: int = 1, candidate_method: str = 'cdist',
+                    score_store: ScoreStore = None, score_cache: FieldScoreCache = None,
+                    dedupe: bool = True, progress: Callable[[int, int], None] = None,
+                    result_cache: ResultCache = None, pruning: PruningStats = None,
+                    exact: bool = True, top_n: int = 1,
+                    return_matched: bool = False) -> Union[Dict[str, pd.DataFrame],
+                                                           Tuple[Dict[str, pd.DataFrame], np.ndarray]]:
+    """Find the best fuzzy match for each row in df1 from df2 for several match types in one sweep.
+
+    Each match type generates its own candidates, but the field scores of every candidate
+    pair are computed once and shared, so the results equal separate run_specific_match calls.
+
+    Args:
+        df1 (pd.DataFrame): Preprocessed input DataFrame.
+        df2 (pd.DataFrame or MasterIndex): Preprocessed master DataFrame, or a master index.
+        match_types (Sequence[str]): Match types to run. If None, runs all MATCH_TYPES.
+        thresholds (Dict[str, float]): Optional minimum score per match type. Missing match
+            types use smart defaults.
+        chunk_size (int): Optional input rows per candidate-generation batch. If None, sized
+            so each score matrix stays within CDIST_CELL_BUDGET cells.
+        blocking (BlockingIndex or Sequence[str]): Optional blocking index over df2, or blocking
+            keys to build one with (e.g. ('zip5', 'last_soundex')). If None, every input row is
+            scored against the whole master.
+        workers (int): Worker processes to shard input rows across. 1 runs in this process;
+            results are identical either way.
+        candidate_method (str): 'cdist' scores every master search string with token_set_ratio.
+            'tfidf' only re-scores the nearest character n-gram TF-IDF neighbors, which is
+            faster on very large masters but may miss candidates (requires scikit-learn).
+        score_store (ScoreStore): Optional store to fill with the field scores of every
+            verified candidate, so other thresholds and weights can be evaluated without
+            rerunning (see ScoreStore.evaluate).
+        score_cache (FieldScoreCache): Memo of field scores, shared by all match types. If None,
+            a new FieldScoreCache is used for this run; FieldScoreCache(0) turns memoization off.
+        dedupe (bool): Match each distinct input record once and fan its result out to every
+            duplicate row, and score duplicate master search strings and records once.
+            Results are identical either way; work scales with distinct records.
+        progress (Callable[[int, int], None]): Optional function called with the input rows
+            matched so far and the total input rows, after each row (or each shard with
+            workers). Duplicate rows count as matched along with their first occurrence. An
+            exception raised by it stops the run, e.g. to cancel it from a GUI.
+        result_cache (ResultCache): Optional cache of earlier runs' results. Only input
+            records it holds no result for (under this master and these settings) are
+            matched, and their results are added to it. All records are matched when a
+            score_store is given.
+        pruning (PruningStats): Counts the candidate pairs dropped before scoring because
+            their upper bound from house numbers, designators and empty names is below the
+            threshold (see score_upper_bounds). If None, a new PruningStats is used for this
+            run; PruningStats(enabled=False) scores every pair. Results are identical either
+            way, and no pair is pruned when a score_store is given.
+        exact (bool): Resolve input records identical to a master record on the match
+            type's fields (see exact_match_keys) at score 100 by hash lookup, and send only
+            the rest through fuzzy matching. An exact hit is matched to the first identical
+            master row, where fuzzy matching could pick an earlier row that also scores 100.
+            Not used when a score_store is given or top_n is above 1.
+        top_n (int): Matches to report per input row and match type, from the same verified
+            candidates the best match is chosen from (so at most CANDIDATE_LIMIT). Above 1, results get a Rank column
+            (1 is the match top_n=1 reports), each input row's matches are kept together in
+            rank order, and no result_cache is used, as it only holds the best match.
+        return_matched (bool): Also return which df1 rows got a match of any type, as the
+            engine tracks it while matching (see unmatched_rows).
+
+    Returns:
+        Dict[str, pd.DataFrame]: Results per match type, each sorted by descending score
+        (with top_n, by the descending score of each input row's best match). With
+        return_matched, a tuple of these results and a boolean array over df1 positions.
+
+    Example:
+        >>> results = run_all_matches(df1, df2)
+        >>> results['FullName'].head()
+    """
+    if candidate_method not in CANDIDATE_METHODS:
+        raise ValueError(f"Unknown candidate_method: {candidate_method}")
+    if top_n < 1:
+        raise ValueError(f"top_n must be at least 1, got {top_n}")
+    if top_n > 1:
+        result_cache = None
+    match_types = list(MATCH_TYPES if match_types is None else match_types)
+    thresholds = {match_type: resolve_threshold(match_type, (thresholds or {}).get(match_type))
+                  for match_type in match_types}
+    
+    master = df2 if isinstance(df2, MasterIndex) else MasterIndex(df2)
+    
+    logging.info(f"Processing {len(df1)} rows against {len(master)} master records for {', '.join(match_types)}...")
+    
+    if blocking is not None:
+        if not isinstance(blocking, BlockingIndex):
+            blocking = master.blocking_index(blocking)
+        if blocking.size != len(master):
+            raise ValueError(f"Blocking index covers {blocking.size} rows but master has {len(master)}")
+    
+    if score_store is not None:
+        score_store.start(df1, master.df, match_types, thresholds)
+    if score_cache is None:
+        score_cache = FieldScoreCache()
+    if pruning is None:
+        pruning = PruningStats()
+    
+    # Match each distinct input record once; duplicates get the same result afterwards
+    input_groups = group_duplicates(df1[RECORD_KEY_COLUMNS]) if dedupe else None
+    if input_groups is not None and len(input_groups) < len(df1):
+        logging.info(f"Matching {len(input_groups)} distinct input records for {len(df1)} rows...")
+        unique_df1 = df1.iloc[input_groups.first]
+    else:
+        input_groups = None
+        unique_df1 = df1
+    
+    # Only match records the result cache has no result for
+    fresh = np.ones(len(unique_df1), dtype=bool)
+    if result_cache is not None:
+        fresh = result_cache.start(unique_df1, master, match_types, thresholds, candidate_method, blocking,
+                                   rematch_all=score_store is not None, exact=exact and score_store is None)
+        logging.info(f"Reusing cached results for {len(fresh) - fresh.sum()} records, matching {fresh.sum()}...")
+    match_df1 = unique_df1 if fresh.all() else unique_df1.iloc[np.flatnonzero(fresh)]
+    
+    row_progress = None
+    if progress is not None:
+        # Input rows covered once the first n matched records are done; cached rows count as done
+        group_sizes = np.ones(len(df1), dtype=np.int64) if input_groups is None else np.diff(input_groups.offsets)
+        rows_done = group_sizes[~fresh].sum() + np.cumsum(group_sizes[fresh])
+        row_progress = lambda done: progress(int(rows_done[done - 1]), len(df1))
+    
+    match_matched = np.zeros(len(match_df1), dtype=bool)
+    if len(match_df1) == 0:
+        results = {match_type: [] for match_type in match_types}
+        if progress is not None:
+            progress(len(df1), len(df1))
+    elif workers > 1 and len(match_df1) > 1:
+        results = match_rows_parallel(match_df1, master, match_types, thresholds, workers, chunk_size, blocking,
+                                      candidate_method, score_store, score_cache, dedupe, row_progress, pruning,
+                                      exact, top_n, match_matched)
+    else:
+        score_records = [] if score_store is not None else None
+        results = match_rows(match_df1, master, match_types, thresholds, chunk_size, blocking,
+                             candidate_method=candidate_method, score_records=score_records,
+                             score_cache=score_cache, dedupe=dedupe, progress=row_progress, pruning=pruning,
+                             exact=exact, top_n=top_n, matched=match_matched)
+        if score_store is not None:
+            score_store.extend(score_records)
+    # Matched rows by position: matched records, then cached records, then their duplicates
+    matched = np.zeros(len(unique_df1), dtype=bool)
+    matched[np.flatnonzero(fresh)] = match_matched
+    if result_cache is not None:
+        results = result_cache.finish(results, unique_df1, master, matched)
+    if input_groups is not None:
+        results = {match_type: fan_out_results(rows, df1, input_groups) for match_type, rows in results.items()}
+        matched = matched[input_groups.codes]
+        if score_store is not None:
+            score_store.fan_out(input_groups)
+    for scorer, stats in score_cache.stats().items():
+        logging.info(f"Field score cache ({scorer}): {stats['hits']} hits, {stats['misses']} misses "
+                     f"({stats['hit_rate']:.0%} hit rate).")
+    if pruning.checked:
+        logging.info(f"Pruned {pruning.pruned} of {pruning.checked} candidate pairs by house number, "
+                     f"designator and name bounds.")
+    
+    results_dfs = {}
+    for match_type in match_types:
+        with stage('results', match_type=match_type):
+            results_df = pd.DataFrame(results[match_type])
+            if not results_df.empty and top_n > 1:
+                # Input rows by their best score, each followed by its alternatives
+                best = results_df.groupby('Sheet A Row')['Match Score'].transform('max')
+                order = np.lexsort((results_df['Rank'], results_df['Sheet A Row'], -best.to_numpy()))
+                results_df = results_df.iloc[order]
+            elif not results_df.empty:
+                results_df = results_df.sort_values(by='Match Score', ascending=False)
+        logging.info(f"Found {len(results_df)} matches for {match_type} above threshold {thresholds[match_type]}.")
+        results_dfs[match_type] = results_df
+    if return_matched:
+        return results_dfs, matched
+    return results_dfs
+
+def fan_out_results(rows: List[dict], df1: pd.DataFrame, input_groups: DuplicateGroups) -> List[dict]:
+    """Copy the results of each distinct input record to every duplicate row of it.
+
+    Args:
+        rows (List[dict]): Result rows for the first row of each group, from build_result_row
+            (several per row, in rank order, with top_n).
+        df1 (pd.DataFrame): The full input DataFrame.
+        input_groups (DuplicateGroups): df1 rows grouped by record.
+
+    Returns:
+        List[dict]: Result rows for all of df1, in df1 order.
+    """
+    by_sheet_row = {}
+    for row in rows:
+        by_sheet_row.setdefault(row['Sheet A Row'], []).append(row)
+    first_labels = df1.index[input_groups.first[input_groups.codes]]
+    fanned_out = []
+    for label, first_label in zip(df1.index, first_labels):
+        for row in by_sheet_row.get(first_label + 2, ()):
+            fanned_out.append({**row, 'Sheet A Row': label + 2})
+    return fanned_out
+
+def unmatched_rows(input_df: pd.DataFrame, matched: np.ndarray) -> pd.DataFrame:
+    """Input rows without a match of any type, with their original row number first.
+
+    Args:
+        input_df (pd.DataFrame): Input sheet as read, with all its columns, in the order it
+            was matched.
+        matched (np.ndarray): Boolean array over input_df positions, from
+            run_all_matches(..., return_matched=True).
+
+    Returns:
+        pd.DataFrame: Original_Row_Number (as in Sheet A Row) followed by the input columns.
+    """
+    unmatched = input_df[~np.asarray(matched, dtype=bool)]
+    row_numbers = pd.Series(unmatched.index + 2, index=unmatched.index, name='Original_Row_Number')
+    return pd.concat([row_numbers, unmatched], axis=1)
+
+def build_result_row(idx1, row1: Union[pd.Series, Record], idx2, row2: Union[pd.Series, Record],
+                     score: float) -> dict:
+    """Build one output row describing a match between an input and a master record."""
+    name_a = f"{row1['First_Name']} {row1['Last_Name']}".strip()
+    name_b = f"{row2['First_Name']} {row2['Last_Name']}".strip()
+    return {
+        'Match Score': round(score, 2),
+        'Sheet A Row': idx1 + 2,  # Assuming 1-based indexing with header
+        'Sheet B Row': idx2 + 2,
+        'Name A': name_a,
+        'Name B': name_b,
+        'Address A': row1['FullAddress'],
+        'Address B': row2['FullAddress']
+    }
+
+def run_specific_match(df1: pd.DataFrame, df2: Union[pd.DataFrame, MasterIndex], match_type: str, threshold: float = None,
+                       chunk_size: int = None, blocking=None, workers: int = 1,
+                       candidate_method: str = 'cdist', score_store: ScoreStore = None,
+                       score_cache: FieldScoreCache = None, dedupe: bool = True,
+                       progress: Callable[[int, int], None] = None,
+                       result_cache: ResultCache = None, pruning: PruningStats = None,
+                       exact: bool = True, top_n: int = 1) -> pd.DataFrame:
+    """Find best fuzzy match for each row in df1 from df2 using optimized approach.
+
+    Args:
+        df1 (pd.DataFrame): Preprocessed input DataFrame.
+        df2 (pd.DataFrame or MasterIndex): Preprocessed master DataFrame, or a master index.
+        match_type (str): Type of match ('FullName', 'LastNameAddress', 'FullAddress').
+        threshold (float): Optional minimum score. If None, uses smart defaults by match type.
+        chunk_size (int): Optional input rows per candidate-generation batch. If None, sized
+            so each score matrix stays within CDIST_CELL_BUDGET cells.
+        blocking (BlockingIndex or Sequence[str]): Optional blocking index over df2, or blocking
+            keys to build one with (e.g. ('zip5', 'last_soundex')). If None, every input row is
+            scored against the whole master.
+        workers (int): Worker processes to shard input rows across (see run_all_matches).
+        candidate_method (str): 'cdist' or 'tfidf' prefilter (see run_all_matches).
+        score_store (ScoreStore): Optional store to fill with candidate scores (see run_all_matches).
+        score_cache (FieldScoreCache): Optional memo of field scores (see run_all_matches).
+        dedupe (bool): Match duplicate records once (see run_all_matches).
+        progress (Callable[[int, int], None]): Optional progress function (see run_all_matches).
+        result_cache (ResultCache): Optional cache of earlier results (see run_all_matches).
+        pruning (PruningStats): Optional score-bound pruning counter (see run_all_matches).
+        exact (bool): Match exact hits without fuzzy scoring (see run_all_matches).
+        top_n (int): Matches to report per input row, with a Rank column above 1 (see run_all_matches).
+
+    Returns:
+        pd.DataFrame: Results sorted by descending score.
+    """
+    results = run_all_matches(df1, df2, [match_type], {match_type: threshold},
+                              chunk_size=chunk_size, blocking=blocking, workers=workers,
+                              candidate_method=candidate_method, score_store=score_store,
+                              score_cache=score_cache, dedupe=dedupe, progress=progress,
+                              result_cache=result_cache, pruning=pruning, exact=exact,
+                              top_n=top_n)
+    return results[match_type]
@@ -8,25 +8,45 @@ Usage: Double-click the app, it will automatically find and process FuzzyMatch_T
 
 import os
 import sys
+import time
+import queue
+import threading
 import traceback
 import tkinter as tk
-from tkinter import messagebox, filedialog
-import pandas as pd
+from tkinter import messagebox, filedialog, ttk
 import logging
 import glob
 from pathlib import Path
 
 # Import our fuzzy matching logic
-from fuzzy_matcher import run_specific_match, preprocess_data
+from fuzzy_matcher import (run_all_matches, preprocess_data, unmatched_rows, MasterIndex, ResultCache,
+                           MASTER_INDEX_DIRNAME, SOURCE_COLUMNS, index_source)
+from workbook_reader import read_data_sheets, read_sheet, text_columns
+from instrumentation import PROFILE_ENV_VAR, profile_to
+from results_writer import OUTPUT_FORMATS, source_reference, write_results
+
+POLL_INTERVAL_MS = 100  # How often the UI picks up messages from the matching thread
+PROGRESS_INTERVAL = 0.25  # Minimum seconds between progress updates sent by the matching thread
+
+
+class MatchCancelled(Exception):
+    """Raised in the matching thread when the user presses Cancel"""
 
 
 class FuzzyMatcherApp:
     def __init__(self):
         self.root = tk.Tk()
         self.root.title("Fuzzy Matcher")
-        self.root.geometry("500x400")
+        self.root.geometry("500x540")
         self.root.resizable(False, False)
         
+        # Matching runs on a worker thread; it only talks to the UI through this queue
+        self.messages = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.worker = None
+        self.match_start = 0.0
+        self.last_progress = 0.0
+        
         # Center the window
         self.center_window()
         
@@ -40,6 +60,7 @@ class FuzzyMatcherApp:
         
         # Redirect logging to GUI after UI is set up
         self.setup_logging_to_gui()
+        self.root.after(POLL_INTERVAL_MS, self.poll_messages)
         
     def center_window(self):
         """Center the window on screen"""
@@ -78,7 +99,7 @@ class FuzzyMatcherApp:
         button_frame.pack(pady=20)
         
         # Auto-find button
-        auto_button = tk.Button(
+        self.auto_button = tk.Button(
             button_frame,
             text="🎯 Auto-Find & Process",
             command=self.auto_find_and_process,
@@ -89,10 +110,10 @@ class FuzzyMatcherApp:
             pady=10,
             width=20
         )
-        auto_button.pack(pady=5)
+        self.auto_button.pack(pady=5)
         
         # Manual file selection button
-        manual_button = tk.Button(
+        self.manual_button = tk.Button(
             button_frame,
             text="📁 Choose File",
             command=self.choose_file_and_process,
@@ -103,7 +124,41 @@ class FuzzyMatcherApp:
             pady=10,
             width=20
         )
-        manual_button.pack(pady=5)
+        self.manual_button.pack(pady=5)
+        
+        # Output options: copying the data sheets re-encodes the whole master on every run
+        options_frame = tk.Frame(self.root)
+        options_frame.pack()
+        self.copy_data_sheets = tk.BooleanVar(value=True)
+        self.copy_checkbox = tk.Checkbutton(
+            options_frame,
+            text="Copy data sheets into results",
+            variable=self.copy_data_sheets
+        )
+        self.copy_checkbox.pack(side=tk.LEFT, padx=5)
+        tk.Label(options_frame, text="Format:").pack(side=tk.LEFT)
+        self.output_format = tk.StringVar(value=OUTPUT_FORMATS[0])
+        tk.OptionMenu(
+            options_frame,
+            self.output_format,
+            *OUTPUT_FORMATS,
+            command=self.on_output_format_change
+        ).pack(side=tk.LEFT)
+        
+        # Progress bar with rows/sec and ETA, and a cancel button
+        progress_frame = tk.Frame(self.root)
+        progress_frame.pack(pady=(15, 0), padx=20, fill=tk.X)
+        self.progress_bar = ttk.Progressbar(progress_frame, mode='determinate', maximum=1.0)
+        self.progress_bar.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.cancel_button = tk.Button(
+            progress_frame,
+            text="Cancel",
+            command=self.cancel_match,
+            state=tk.DISABLED
+        )
+        self.cancel_button.pack(side=tk.LEFT, padx=(10, 0))
+        self.progress_label = tk.Label(self.root, text="", anchor=tk.W)
+        self.progress_label.pack(padx=20, fill=tk.X)
         
         # Status text area
         self.status_text = tk.Text(
@@ -114,18 +169,96 @@ class FuzzyMatcherApp:
             state=tk.DISABLED,
             bg="#f0f0f0"
         )
-        self.status_text.pack(pady=20, padx=20, fill=tk.BOTH, expand=True)
+        self.status_text.pack(pady=(5, 20), padx=20, fill=tk.BOTH, expand=True)
         
         # Add initial message
         self.log_message("Ready to process Excel files! 🚀")
         
     def log_message(self, message):
-        """Add a message to the status text area"""
+        """Queue a message for the status text area (safe to call from any thread)"""
+        self.messages.put(('log', message))
+        
+    def append_log(self, lines):
+        """Add lines to the status text area in one update"""
         self.status_text.config(state=tk.NORMAL)
-        self.status_text.insert(tk.END, f"{message}\n")
+        self.status_text.insert(tk.END, "".join(f"{line}\n" for line in lines))
         self.status_text.see(tk.END)
         self.status_text.config(state=tk.DISABLED)
-        self.root.update()
+        
+    def poll_messages(self):
+        """Apply everything the matching thread queued since the last poll, then poll again"""
+        lines = []
+        try:
+            while True:
+                kind, *payload = self.messages.get_nowait()
+                if kind == 'log':
+                    lines.append(payload[0])
+                elif kind == 'progress':
+                    self.show_progress(*payload)
+                elif kind == 'finished':
+                    self.set_running(False)
+                else:
+                    # Dialogs wait for the user, so show the log lines queued before them first
+                    if lines:
+                        self.append_log(lines)
+                        lines = []
+                    title, message = payload
+                    if kind == 'success':
+                        messagebox.showinfo(title, message)
+                    else:
+                        messagebox.showerror(title, message)
+        except queue.Empty:
+            pass
+        if lines:
+            self.append_log(lines)
+        self.root.after(POLL_INTERVAL_MS, self.poll_messages)
+        
+    def show_progress(self, done, total, now):
+        """Update the progress bar and the rows/sec and ETA line"""
+        self.progress_bar['value'] = done / total if total else 1.0
+        elapsed = now - self.match_start
+        rate = done / elapsed if elapsed > 0 else 0.0
+        if rate > 0:
+            eta = time.strftime("%H:%M:%S", time.gmtime((total - done) / rate))
+            self.progress_label.config(text=f"{done:,} / {total:,} rows • {rate:,.0f} rows/s • ETA {eta}")
+        else:
+            self.progress_label.config(text=f"{done:,} / {total:,} rows")
+        
+    def report_progress(self, done, total):
+        """Progress callback for run_all_matches, called on the matching thread"""
+        if self.cancel_event.is_set():
+            raise MatchCancelled()
+        now = time.perf_counter()
+        if done == total or now - self.last_progress >= PROGRESS_INTERVAL:
+            self.last_progress = now
+            self.messages.put(('progress', done, total, now))
+            
+    def check_cancelled(self):
+        """Stop the matching thread between steps if the user pressed Cancel"""
+        if self.cancel_event.is_set():
+            raise MatchCancelled()
+        
+    def cancel_match(self):
+        """Ask the matching thread to stop"""
+        self.cancel_event.set()
+        self.cancel_button.config(state=tk.DISABLED)
+        self.log_message("\n⏹ Cancelling...")
+        
+    def set_running(self, running):
+        """Enable Cancel while a match runs, and the file buttons otherwise"""
+        file_state = tk.DISABLED if running else tk.NORMAL
+        self.auto_button.config(state=file_state)
+        self.manual_button.config(state=file_state)
+        self.cancel_button.config(state=tk.NORMAL if running else tk.DISABLED)
+        
+
+    def on_output_format_change(self, output_format):
+        """Data sheets can only be copied into an xlsx results file"""
+        if output_format == 'xlsx':
+            self.copy_checkbox.config(state=tk.NORMAL)
+        else:
+            self.copy_data_sheets.set(False)
+            self.copy_checkbox.config(state=tk.DISABLED)
         
     def setup_logging_to_gui(self):
         """Redirect logging messages to the GUI text area"""
@@ -200,17 +333,41 @@ class FuzzyMatcherApp:
             self.log_message("❌ No file selected")
             
     def process_file(self, file_path):
-        """Process the selected Excel file"""
+        """Start matching the selected Excel file on a worker thread"""
+        if self.worker is not None and self.worker.is_alive():
+            self.log_message("⚠️  A file is already being processed")
+            return
+        self.cancel_event.clear()
+        self.progress_bar['value'] = 0
+        self.progress_label.config(text="")
+        self.set_running(True)
+        # Tk variables are read here, on the main thread; the worker only gets plain values
+        output_format = self.output_format.get()
+        copy_data_sheets = self.copy_data_sheets.get() and output_format == 'xlsx'
+        self.worker = threading.Thread(target=self.run_match, args=(file_path, output_format, copy_data_sheets),
+                                       daemon=True)
+        self.worker.start()
+        
+    def run_match(self, file_path, output_format, copy_data_sheets):
+        """Worker thread: match the file, saving stage timings if FUZZY_MATCHER_PROFILE is set"""
+        try:
+            with profile_to(os.environ.get(PROFILE_ENV_VAR)):
+                self.match_file(file_path, output_format, copy_data_sheets)
+        finally:
+            self.messages.put(('finished',))
+            
+    def match_file(self, file_path, output_format, copy_data_sheets):
+        """Match one Excel file and write the results to a new file (runs on the worker thread)"""
         try:
             self.log_message(f"\n🔧 Processing: {os.path.basename(file_path)}")
             
-            # Read all sheets
+            # The matcher reads its columns as text; sheets copied to the results file keep Excel value types
             self.log_message("📊 Reading Excel sheets...")
-            all_sheets = pd.read_excel(file_path, sheet_name=None)
-            
-            # Filter out results sheets
-            data_sheets = {k: v for k, v in all_sheets.items() 
-                          if not k.startswith('results_') and not k.startswith('Unmatched_')}
+            if copy_data_sheets:
+                data_sheets = read_data_sheets(file_path, columns=None, as_text=False)
+                match_sheets = {sheet_name: text_columns(df) for sheet_name, df in data_sheets.items()}
+            else:
+                data_sheets = match_sheets = read_data_sheets(file_path)
             
             if len(data_sheets) < 2:
                 self.log_message("❌ Need at least 2 data sheets to compare")
@@ -222,8 +379,8 @@ class FuzzyMatcherApp:
                 
             # Auto-detect input vs master based on size
             sheet_names = list(data_sheets.keys())
-            sheet1_df = data_sheets[sheet_names[0]]
-            sheet2_df = data_sheets[sheet_names[1]]
+            sheet1_df = match_sheets[sheet_names[0]]
+            sheet2_df = match_sheets[sheet_names[1]]
             
             if len(sheet1_df) > len(sheet2_df):
                 master_df = sheet1_df
@@ -241,105 +398,81 @@ class FuzzyMatcherApp:
             
             # Preprocess data
             self.log_message("🔧 Preprocessing data...")
+            self.check_cancelled()
             df1 = preprocess_data(input_df)
-            df2 = preprocess_data(master_df)
+            index_dir = os.path.join(os.path.dirname(os.path.abspath(file_path)), MASTER_INDEX_DIRNAME)
+            df2 = MasterIndex.load_or_build(master_df, index_dir, index_source(file_path, master_name))
             
-            # Run fuzzy matching
-            match_types = ['FullName', 'LastNameAddress', 'FullAddress']
-            results = {}
+            # Run all three match types in a single pass
+            self.check_cancelled()
+            self.log_message("\n🎯 Running FullName, LastNameAddress and FullAddress matching...")
+            self.match_start = self.last_progress = time.perf_counter()
+            # Rows already matched against this master in earlier runs reuse their cached results
+            result_cache = ResultCache.beside_index(index_dir, df2)
+            results, matched = run_all_matches(df1, df2, progress=self.report_progress, result_cache=result_cache,
+                                               return_matched=True)
+            self.check_cancelled()
             
-            for match_type in match_types:
-                self.log_message(f"\n🎯 Running {match_type} matching...")
-                self.root.update()  # Keep UI responsive
-                
-                results_df = run_specific_match(df1, df2, match_type)
-                results[match_type] = results_df
-                
+            for match_type, results_df in results.items():
                 if not results_df.empty:
                     self.log_message(f"✅ Found {len(results_df)} {match_type} matches")
                 else:
                     self.log_message(f"⚠️  No {match_type} matches found")
+            # The unmatched rows keep every column of the input sheet
+            if copy_data_sheets:
+                input_df = data_sheets[input_name]
+            else:
+                input_df = read_sheet(file_path, input_name, columns=None)
+            unmatched = unmatched_rows(input_df, matched)
+            self.log_message(f"📋 {len(unmatched)} of {len(input_df)} input rows have no match")
                     
             # Write results to a NEW file to avoid corruption  
-            self.log_message("\n💾 Writing results to new Excel file...")
+            self.log_message(f"\n💾 Writing results to new {output_format} file(s)...")
             
             # Create a new filename with timestamp to avoid conflicts
             import datetime
             timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
             base_name = os.path.splitext(os.path.basename(file_path))[0]
-            new_filename = f"{base_name}_RESULTS_{timestamp}.xlsx"
-            new_file_path = os.path.join(os.path.dirname(file_path), new_filename)
+            new_path_base = os.path.join(os.path.dirname(file_path), f"{base_name}_RESULTS_{timestamp}")
             
-            self.log_message(f"📁 Creating results file: {new_filename}")
-            
-            # Copy original data and add results
+            # Copy original data and add results, or write the results with a reference to the source
             try:
-                with pd.ExcelWriter(new_file_path, engine='openpyxl') as writer:
-                    # Copy original sheets first
-                    for sheet_name, df in data_sheets.items():
-                        df.to_excel(writer, sheet_name=sheet_name, index=False)
-                        
-                        # Auto-resize columns for original data sheets too
-                        worksheet = writer.sheets[sheet_name]
-                        for column in worksheet.columns:
-                            max_length = 0
-                            column_letter = column[0].column_letter
-                            for cell in column:
-                                try:
-                                    if len(str(cell.value)) > max_length:
-                                        max_length = len(str(cell.value))
-                                except:
-                                    pass
-                            adjusted_width = min(max_length + 2, 50)  # Cap at 50 characters
-                            worksheet.column_dimensions[column_letter].width = adjusted_width
-                        
-                        self.log_message(f"📋 Copied '{sheet_name}' sheet with auto-sized columns")
-                    
-                    # Add results sheets
-                    for match_type, results_df in results.items():
-                        if not results_df.empty:
-                            sheet_name = f'results_{match_type}'
-                            results_df.to_excel(writer, sheet_name=sheet_name, index=False)
-                            
-                            # Auto-resize columns to show full data
-                            worksheet = writer.sheets[sheet_name]
-                            for column in worksheet.columns:
-                                max_length = 0
-                                column_letter = column[0].column_letter
-                                for cell in column:
-                                    try:
-                                        if len(str(cell.value)) > max_length:
-                                            max_length = len(str(cell.value))
-                                    except:
-                                        pass
-                                adjusted_width = min(max_length + 2, 50)  # Cap at 50 characters
-                                worksheet.column_dimensions[column_letter].width = adjusted_width
-                            
-                            self.log_message(f"📝 Created '{sheet_name}' sheet with auto-sized columns")
-                
-                self.log_message(f"✅ Successfully wrote file: {new_file_path}")
+                if copy_data_sheets:
+                    written = write_results(new_path_base, results, output_format, data_sheets,
+                                            unmatched=unmatched)
+                else:
+                    source = source_reference(file_path, data_sheets)
+                    written = write_results(new_path_base, results, output_format, source=source,
+                                            unmatched=unmatched)
+                for path in written:
+                    self.log_message(f"✅ Successfully wrote file: {path}")
                     
             except Exception as write_error:
                 self.log_message(f"❌ FAILED TO WRITE RESULTS FILE: {write_error}")
                 self.log_message(f"Traceback: {traceback.format_exc()}")
                 raise write_error
-                        
+            
+            new_files = "\n".join(os.path.basename(path) for path in written)
             self.log_message("\n🎉 FUZZY MATCHING COMPLETED SUCCESSFULLY! 🎉")
-            self.log_message(f"📊 Results saved to: {new_filename}")
+            self.log_message(f"📊 Results saved to: {new_files}")
             
             # Show completion dialog
-            messagebox.showinfo(
+            self.messages.put((
+                'success',
                 "Success!", 
                 f"Fuzzy matching completed!\n\n"
-                f"NEW FILE CREATED:\n{new_filename}\n\n"
+                f"NEW FILES CREATED:\n{new_files}\n\n"
                 f"Your original file is safe!\n"
-                f"Check the new 'results_*' sheets for your matches."
-            )
+                f"Check the new 'results_*' sheets or files for your matches."
+            ))
+            
+        except MatchCancelled:
+            self.log_message("⏹ Matching cancelled - no results were written")
             
         except Exception as e:
             error_msg = f"❌ Error: {str(e)}\n\nFull traceback:\n{traceback.format_exc()}"
             self.log_message(error_msg)
-            messagebox.showerror("Error", f"An error occurred:\n\n{str(e)}")
+            self.messages.put(('error', "Error", f"An error occurred:\n\n{str(e)}"))
             
     def run(self):
         """Start the application"""
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Headless fuzzy matcher for batch servers: no Excel, xlwings or GUI needed.
+
+Matches an input file against a master file, each CSV, Parquet, XLSX or XLSM, and writes
+the results as CSV, Parquet or XLSX files. By default they go next to the input file,
+named like the app's output (<input>_RESULTS_<timestamp>).
+
+Usage:
+    python fuzzy_matcher_cli.py input.csv master.parquet
+    python fuzzy_matcher_cli.py input.xlsx master.csv --match-types FullName FullAddress \\
+        --threshold FullName=90 --workers 8 --output-format parquet --output nightly/results
+"""
+
+import argparse
+import datetime
+import logging
+import os
+import sys
+from typing import Tuple
+
+from fuzzy_matcher import (BLOCKING_KEYS, CANDIDATE_METHODS, MASTER_INDEX_DIRNAME, MATCH_TYPES, MasterIndex,
+                           ResultCache, index_source, preprocess_data, run_all_matches, unmatched_rows)
+from instrumentation import PROFILE_ENV_VAR, profile_to
+from results_writer import OUTPUT_FORMATS, write_results
+from table_reader import read_table
+
+
+def parse_threshold(value: str) -> Tuple[str, float]:
+    """Parse a --threshold argument such as 'FullName=85'."""
+    match_type, _, score = value.partition('=')
+    if match_type not in MATCH_TYPES:
+        raise argparse.ArgumentTypeError(f"unknown match type '{match_type}' (choose from {', '.join(MATCH_TYPES)})")
+    try:
+        return match_type, float(score)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"'{value}' is not MATCH_TYPE=SCORE") from None
+
+
+def default_output_base(input_path: str) -> str:
+    """<input dir>/<input name>_RESULTS_<timestamp>, like the app's results file."""
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    base_name = os.path.splitext(os.path.basename(input_path))[0]
+    return os.path.join(os.path.dirname(os.path.abspath(input_path)), f"{base_name}_RESULTS_{timestamp}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Fuzzy match an input file against a master file.")
+    parser.add_argument('input', help="Input file (.csv, .parquet, .xlsx, .xlsm): the rows to find matches for")
+    parser.add_argument('master', help="Master file (.csv, .parquet, .xlsx, .xlsm): the rows to search")
+    parser.add_argument('--input-sheet', help="Sheet to read from an input workbook (default: first data sheet)")
+    parser.add_argument('--master-sheet', help="Sheet to read from a master workbook (default: first data sheet)")
+    parser.add_argument('--match-types', nargs='+', choices=MATCH_TYPES, default=MATCH_TYPES)
+    parser.add_argument('--threshold', type=parse_threshold, action='append', default=[], metavar='TYPE=SCORE',
+                        help="Minimum score for a match type, e.g. FullName=85 (repeatable; default: smart defaults)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Worker processes (0 for one per CPU core; default: 1)")
+    parser.add_argument('--blocking', nargs='+', choices=BLOCKING_KEYS,
+                        help="Only compare rows sharing these keys, e.g. zip5 last_soundex")
+    parser.add_argument('--candidate-method', choices=CANDIDATE_METHODS, default='cdist')
+    parser.add_argument('--top-n', type=int, default=1, metavar='N',
+                        help="Report the N best matches per input row, with a Rank column (default: 1)")
+    parser.add_argument('--output-format', choices=OUTPUT_FORMATS, default='csv')
+    parser.add_argument('--output', help="Output path without extension (default: next to the input file)")
+    parser.add_argument('--no-index-cache', action='store_true',
+                        help=f"Don't load or save the master index cache ({MASTER_INDEX_DIRNAME} next to the master)")
+    parser.add_argument('--no-result-cache', action='store_true',
+                        help="Match every input row, instead of reusing results cached with the master index")
+    parser.add_argument('--profile', default=os.environ.get(PROFILE_ENV_VAR), metavar='DIR',
+                        help=f"Write stage timings to this directory (default: ${PROFILE_ENV_VAR})")
+    parser.add_argument('-q', '--quiet', action='store_true', help="Only log warnings and errors")
+    return parser
+
+
+def main(argv=None) -> int:
+    """Run the matcher from command-line arguments; returns the process exit code."""
+    args = build_parser().parse_args(argv)
+    # fuzzy_matcher sets up INFO logging on import
+    logging.getLogger().setLevel(logging.WARNING if args.quiet else logging.INFO)
+    workers = args.workers or os.cpu_count() or 1
+
+    try:
+        with profile_to(args.profile):
+            # Every input column, so the unmatched rows are written in full
+            input_raw = read_table(args.input, columns=None, sheet_name=args.input_sheet)
+            master_raw = read_table(args.master, sheet_name=args.master_sheet)
+            logging.info(f"Read {len(input_raw)} input rows and {len(master_raw)} master rows.")
+
+            df1 = preprocess_data(input_raw)
+            result_cache = None
+            if args.no_index_cache:
+                master = MasterIndex.build(master_raw)
+            else:
+                index_dir = os.path.join(os.path.dirname(os.path.abspath(args.master)), MASTER_INDEX_DIRNAME)
+                master = MasterIndex.load_or_build(master_raw, index_dir, index_source(args.master, args.master_sheet))
+                if not args.no_result_cache:
+                    result_cache = ResultCache.beside_index(index_dir, master)
+
+            results, matched = run_all_matches(df1, master, args.match_types, dict(args.threshold),
+                                               blocking=args.blocking, workers=workers,
+                                               candidate_method=args.candidate_method, result_cache=result_cache,
+                                               top_n=args.top_n, return_matched=True)
+            output_base = args.output or default_output_base(args.input)
+            os.makedirs(os.path.dirname(os.path.abspath(output_base)), exist_ok=True)
+            unmatched = unmatched_rows(input_raw, matched)
+            paths = write_results(output_base, results, args.output_format, unmatched=unmatched)
+    except (OSError, ValueError, ImportError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    except KeyError as e:  # A missing required column; str(e) would quote the message
+        print(f"Error: {e.args[0] if e.args else e}", file=sys.stderr)
+        return 1
+
+    for match_type, results_df in results.items():
+        print(f"{match_type}: {len(results_df)} matches")
+    print(f"Unmatched: {len(unmatched)} of {len(input_raw)} input rows")
+    for path in paths:
+        print(f"Wrote {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,212 @@
+"""
+Per-stage timing for the matching pipeline.
+
+While a StageTimer is active (see instrument), each pipeline stage records its wall-clock
+time: workbook (or CSV/Parquet) read, preprocess_data, search strings, candidate generation,
+verification, result assembly and Excel (or CSV/Parquet) write. The timer then writes a
+JSON summary per stage and a Chrome trace-event file. Open the trace in chrome://tracing
+or https://ui.perfetto.dev.
+
+Example:
+    >>> with instrument(StageTimer()) as timer:
+    ...     results = run_all_matches(df1, df2)
+    >>> timer.save_summary('timing_summary.json')
+    >>> timer.save_chrome_trace('timing_trace.json')
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+# Pipeline stages, in the order they run
+STAGES = ('workbook_read', 'table_read', 'preprocess', 'exact', 'search_strings', 'candidates', 'verify', 'results',
+          'excel_write', 'results_write')
+PROFILE_ENV_VAR = 'FUZZY_MATCHER_PROFILE'  # Directory the entry points write timing files to
+SUMMARY_FILENAME = 'timing_summary.json'
+TRACE_FILENAME = 'timing_trace.json'
+
+
+class StageEvent(NamedTuple):
+    name: str
+    start: float     # time.perf_counter() at the start; comparable across processes
+    duration: float  # Seconds
+    pid: int
+    tid: int
+    args: dict
+
+
+class StageTimer:
+    """Collects the time spent in each pipeline stage.
+
+    Totals per stage are always kept. Every single event is kept too for the Chrome trace,
+    unless keep_events is False; per-row stages add one event per input row.
+    """
+
+    def __init__(self, callback: Callable[[str, float, dict], None] = None, keep_events: bool = True):
+        """Create a timer.
+
+        Args:
+            callback (Callable[[str, float, dict], None]): Optional function called with the
+                stage name, duration in seconds and event args whenever a stage finishes.
+            keep_events (bool): Keep every event for save_chrome_trace.
+        """
+        self.callback = callback
+        self.keep_events = keep_events
+        self.events: List[StageEvent] = []
+        self.totals: Dict[str, List[float]] = {}  # name -> [calls, total seconds, max seconds]
+        self.origin = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def add(self, name: str, start: float, duration: float, **args):
+        """Record a stage that started at perf_counter() time start and took duration seconds."""
+        self.add_event(StageEvent(name, start, duration, os.getpid(), threading.get_ident(), args))
+
+    def add_event(self, event: StageEvent):
+        """Record an event, e.g. one collected by a worker process."""
+        with self._lock:
+            total = self.totals.setdefault(event.name, [0, 0.0, 0.0])
+            total[0] += 1
+            total[1] += event.duration
+            total[2] = max(total[2], event.duration)
+            if self.keep_events:
+                self.events.append(event)
+        if self.callback is not None:
+            self.callback(event.name, event.duration, event.args)
+
+    @contextmanager
+    def stage(self, name: str, **args):
+        """Time the enclosed block as one event of the named stage."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, start, time.perf_counter() - start, **args)
+
+    def summary(self) -> dict:
+        """Calls, total, mean and max time per stage, pipeline stages first.
+
+        Worker processes run stages side by side, so totals need not add up to the wall time.
+        """
+        names = [name for name in STAGES if name in self.totals]
+        names += sorted(name for name in self.totals if name not in STAGES)
+        stages = {}
+        for name in names:
+            calls, total, longest = self.totals[name]
+            stages[name] = {
+                'calls': calls,
+                'total_seconds': round(total, 6),
+                'mean_ms': round(total / calls * 1000, 3),
+                'max_ms': round(longest * 1000, 3),
+            }
+        return {'wall_seconds': round(time.perf_counter() - self.origin, 6), 'stages': stages}
+
+    def chrome_trace(self) -> dict:
+        """The kept events in Chrome trace-event format (complete 'X' events, in microseconds)."""
+        return {
+            'traceEvents': [{
+                'name': event.name,
+                'cat': 'fuzzy_matcher',
+                'ph': 'X',
+                'ts': round((event.start - self.origin) * 1e6, 3),
+                'dur': round(event.duration * 1e6, 3),
+                'pid': event.pid,
+                'tid': event.tid,
+                'args': event.args,
+            } for event in self.events],
+            'displayTimeUnit': 'ms',
+        }
+
+    def save_summary(self, path: str):
+        """Write summary() to a JSON file."""
+        with open(path, 'w') as f:
+            json.dump(self.summary(), f, indent=2)
+
+    def save_chrome_trace(self, path: str):
+        """Write chrome_trace() to a JSON file."""
+        with open(path, 'w') as f:
+            json.dump(self.chrome_trace(), f, default=str)
+
+
+# Timer the pipeline stages report to, set by instrument()
+_active_timer: Optional[StageTimer] = None
+
+
+@contextmanager
+def instrument(timer: Optional[StageTimer]) -> Iterator[Optional[StageTimer]]:
+    """Activate a timer for the pipeline stages run inside the block.
+
+    Args:
+        timer (StageTimer): Timer to activate. If None, instrumentation is switched off
+            inside the block.
+
+    Yields:
+        Optional[StageTimer]: The active timer.
+
+    Example:
+        >>> with instrument(StageTimer()) as timer:
+        ...     run_all_matches(df1, df2)
+    """
+    global _active_timer
+    previous, _active_timer = _active_timer, timer
+    try:
+        yield timer
+    finally:
+        _active_timer = previous
+
+
+def active_timer() -> Optional[StageTimer]:
+    """Return the active timer, or None when the pipeline is not being instrumented."""
+    return _active_timer
+
+
+def stage(name: str, **args):
+    """Time the enclosed block as a pipeline stage if a timer is active; otherwise do nothing."""
+    timer = _active_timer
+    return nullcontext() if timer is None else timer.stage(name, **args)
+
+
+def timed_iter(iterable: Iterable, name: str, timer: StageTimer = None) -> Iterator:
+    """Yield from iterable, recording the time taken to produce each item as a stage event.
+
+    Used for lazy generators such as candidate generation, whose work happens on next().
+    """
+    if timer is None:
+        yield from iterable
+        return
+    iterator = iter(iterable)
+    position = 0
+    while True:
+        start = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            return
+        timer.add(name, start, time.perf_counter() - start, row=position)
+        yield item
+        position += 1
+
+
+@contextmanager
+def profile_to(directory: Optional[str]) -> Iterator[Optional[StageTimer]]:
+    """Instrument the block and write the summary and Chrome trace to directory afterwards.
+
+    Args:
+        directory (str): Output directory, created if missing. None or '' does nothing, so
+            entry points can pass os.environ.get(PROFILE_ENV_VAR) directly.
+
+    Yields:
+        Optional[StageTimer]: The active timer, or None if not profiling.
+    """
+    if not directory:
+        yield None
+        return
+    with instrument(StageTimer()) as timer:
+        try:
+            yield timer
+        finally:
+            os.makedirs(directory, exist_ok=True)
+            timer.save_summary(os.path.join(directory, SUMMARY_FILENAME))
+            timer.save_chrome_trace(os.path.join(directory, TRACE_FILENAME))
@@ -0,0 +1,250 @@
+"""
+Result-sheet writer for the fuzzy matcher.
+
+Column widths are computed from the DataFrames with vectorized string lengths instead of
+visiting every written cell, and new workbooks are written with openpyxl's write-only
+(streaming) mode, so memory stays flat however large the copied master sheet is. Used by
+both the standalone app (new results workbook) and run_from_excel (sheets added to the
+open workbook through xlwings).
+
+write_results can also skip the data sheets and write only the results, as a workbook or
+as CSV/Parquet files, with a small reference back to the source workbook instead. Input
+rows without any match can be written alongside as an Unmatched_Rows sheet or file.
+"""
+
+import datetime
+import hashlib
+import json
+import logging
+import os
+from typing import Dict, List
+
+import openpyxl
+import pandas as pd
+from openpyxl.utils import get_column_letter
+
+from instrumentation import stage
+
+MAX_COLUMN_WIDTH = 50  # Characters; longer values are cut off in the view, not in the cell
+COLUMN_PADDING = 2
+OUTPUT_FORMATS = ('xlsx', 'csv', 'parquet')
+SOURCE_SHEET_NAME = 'Source_Reference'  # Sheet holding source_reference() in results-only workbooks
+SOURCE_REFERENCE_SUFFIX = '_source.json'  # Sidecar holding source_reference() next to CSV/Parquet results
+UNMATCHED_SHEET_NAME = 'Unmatched_Rows'  # Sheet (or file suffix) holding the input rows without a match
+
+
+def column_widths(df: pd.DataFrame, sample_rows: int = None) -> List[int]:
+    """Width of each column: its longest value or header plus padding, capped at MAX_COLUMN_WIDTH.
+
+    Args:
+        df (pd.DataFrame): Sheet to size.
+        sample_rows (int): Optional number of leading rows to measure instead of all rows.
+
+    Returns:
+        List[int]: One width per column, in column order.
+
+    Example:
+        >>> column_widths(pd.DataFrame({'Name A': ['JOHN SMITH'], 'Match Score': [92.5]}))
+        [12, 13]
+    """
+    sample = df if sample_rows is None else df.head(sample_rows)
+    widths = []
+    for position, column in enumerate(df.columns):
+        values = sample.iloc[:, position]
+        longest = values.where(values.notna(), '').astype(str).str.len().max() if len(values) else 0
+        widths.append(min(max(len(str(column)), int(longest)) + COLUMN_PADDING, MAX_COLUMN_WIDTH))
+    return widths
+
+
+def sheet_rows(df: pd.DataFrame):
+    """Yield the rows of df as lists of cell values, with missing values as empty cells."""
+    cells = df.astype(object).where(df.notna(), None)
+    for row in cells.itertuples(index=False, name=None):
+        yield list(row)
+
+
+def write_sheet(workbook: openpyxl.Workbook, sheet_name: str, df: pd.DataFrame, sample_rows: int = None):
+    """Stream one DataFrame into a new sheet of a write-only workbook, with sized columns.
+
+    Args:
+        workbook (openpyxl.Workbook): Workbook created with write_only=True.
+        sheet_name (str): Name of the new sheet.
+        df (pd.DataFrame): Data to write, header first; the index is not written.
+        sample_rows (int): Optional rows to measure column widths from (see column_widths).
+    """
+    with stage('excel_write', sheet=sheet_name):
+        worksheet = workbook.create_sheet(sheet_name)
+        # Column widths must be set before any row is streamed out
+        for column, width in enumerate(column_widths(df, sample_rows), start=1):
+            worksheet.column_dimensions[get_column_letter(column)].width = width
+        worksheet.append([str(column) for column in df.columns])
+        for row in sheet_rows(df):
+            worksheet.append(row)
+
+
+def file_sha256(path: str, block_size: int = 1 << 20) -> str:
+    """Hex SHA-256 of a file's contents, read in blocks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def source_reference(source_path: str, data_sheets: Dict[str, pd.DataFrame] = None) -> dict:
+    """Describe the source workbook, so results written without its data sheets can be traced back to it.
+
+    Args:
+        source_path (str): Workbook the results were matched from.
+        data_sheets (Dict[str, pd.DataFrame]): Optional data sheets read from it, to record their row counts.
+
+    Returns:
+        dict: Absolute path, size, modification time and SHA-256 of the workbook, plus rows per data sheet.
+    """
+    stat = os.stat(source_path)
+    return {
+        'source_workbook': os.path.abspath(source_path),
+        'size_bytes': stat.st_size,
+        'modified': datetime.datetime.fromtimestamp(stat.st_mtime).isoformat(timespec='seconds'),
+        'sha256': file_sha256(source_path),
+        'sheet_rows': {name: len(df) for name, df in (data_sheets or {}).items()},
+    }
+
+
+def source_reference_rows(source: dict) -> pd.DataFrame:
+    """Lay out a source_reference() dict as Field/Value rows for a sheet, one row per data sheet."""
+    rows = [(field, value) for field, value in source.items() if field != 'sheet_rows']
+    rows += [(f'rows: {name}', count) for name, count in source.get('sheet_rows', {}).items()]
+    return pd.DataFrame(rows, columns=['Field', 'Value'])
+
+
+def write_results_workbook(path: str, results: Dict[str, pd.DataFrame],
+                           data_sheets: Dict[str, pd.DataFrame] = None, sample_rows: int = None,
+                           source: dict = None, unmatched: pd.DataFrame = None):
+    """Write a new workbook with the data sheets (optional) followed by a results_* sheet per match type.
+
+    Match types without any match get no sheet, and neither does an empty unmatched table.
+
+    Args:
+        path (str): Output .xlsx path.
+        results (Dict[str, pd.DataFrame]): Results per match type, from run_all_matches.
+        data_sheets (Dict[str, pd.DataFrame]): Optional original sheets to copy in first.
+        sample_rows (int): Optional rows to measure column widths from (see column_widths).
+        source (dict): Optional source_reference() to add as a last Source_Reference sheet.
+        unmatched (pd.DataFrame): Optional unmatched input rows (fuzzy_matcher.unmatched_rows),
+            added as an Unmatched_Rows sheet after the results.
+
+    Example:
+        >>> write_results_workbook('FuzzyMatch_RESULTS.xlsx', results, data_sheets)
+    """
+    workbook = openpyxl.Workbook(write_only=True)
+    for sheet_name, df in (data_sheets or {}).items():
+        write_sheet(workbook, sheet_name, df, sample_rows)
+        logging.info(f"Copied '{sheet_name}' sheet ({len(df)} rows)")
+    for match_type, results_df in results.items():
+        if not results_df.empty:
+            write_sheet(workbook, f'results_{match_type}', results_df, sample_rows)
+            logging.info(f"Created 'results_{match_type}' sheet ({len(results_df)} rows)")
+    if unmatched is not None and not unmatched.empty:
+        write_sheet(workbook, UNMATCHED_SHEET_NAME, unmatched, sample_rows)
+        logging.info(f"Created '{UNMATCHED_SHEET_NAME}' sheet ({len(unmatched)} rows)")
+    if source is not None:
+        write_sheet(workbook, SOURCE_SHEET_NAME, source_reference_rows(source))
+    with stage('excel_write', path=path):
+        workbook.save(path)
+
+
+def write_results(path_base: str, results: Dict[str, pd.DataFrame], output_format: str = 'xlsx',
+                  data_sheets: Dict[str, pd.DataFrame] = None, source: dict = None,
+                  sample_rows: int = None, unmatched: pd.DataFrame = None) -> List[str]:
+    """Write the results as one workbook or as one CSV/Parquet file per match type.
+
+    Copying the data sheets is optional and only possible for xlsx; leave data_sheets out to
+    write just the results, which avoids re-encoding a large master that has not changed.
+    Match types without any match get no sheet or file.
+
+    Args:
+        path_base (str): Output path without extension, e.g. 'Tool_RESULTS_20250101_120000'.
+            Writes path_base.xlsx, or path_base_results_<MatchType>.csv/.parquet.
+        results (Dict[str, pd.DataFrame]): Results per match type, from run_all_matches.
+        output_format (str): One of OUTPUT_FORMATS.
+        data_sheets (Dict[str, pd.DataFrame]): Original sheets to copy in first (xlsx only).
+        source (dict): Optional source_reference(), written as a Source_Reference sheet (xlsx)
+            or a path_base_source.json sidecar (csv/parquet).
+        sample_rows (int): Optional rows to measure column widths from (xlsx only).
+        unmatched (pd.DataFrame): Optional unmatched input rows (fuzzy_matcher.unmatched_rows),
+            written as an Unmatched_Rows sheet (xlsx) or a path_base_Unmatched_Rows file.
+
+    Returns:
+        List[str]: Paths of the files written.
+
+    Raises:
+        ValueError: If output_format is unknown, or data_sheets are given for csv/parquet.
+        ImportError: If output_format is 'parquet' and neither pyarrow nor fastparquet is installed.
+
+    Example:
+        >>> write_results('Tool_RESULTS', results, 'parquet', source=source_reference('Tool.xlsm'))
+        ['Tool_RESULTS_results_FullName.parquet', ..., 'Tool_RESULTS_source.json']
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format '{output_format}', expected one of {OUTPUT_FORMATS}")
+    if output_format == 'xlsx':
+        path = f'{path_base}.xlsx'
+        write_results_workbook(path, results, data_sheets, sample_rows, source, unmatched)
+        return [path]
+    if data_sheets:
+        raise ValueError(f"Data sheets can only be copied into an xlsx workbook, not {output_format}")
+
+    tables = {f'results_{match_type}': table for match_type, table in results.items()}
+    if unmatched is not None:
+        tables[UNMATCHED_SHEET_NAME] = unmatched
+    paths = []
+    for name, table in tables.items():
+        if table.empty:
+            continue
+        path = f'{path_base}_{name}.{output_format}'
+        with stage('results_write', path=path):
+            if output_format == 'csv':
+                table.to_csv(path, index=False)
+            else:
+                try:
+                    table.to_parquet(path, index=False)
+                except ImportError as e:
+                    raise ImportError("Parquet output needs pyarrow (pip install pyarrow) "
+                                      "or fastparquet") from e
+        logging.info(f"Wrote {os.path.basename(path)} ({len(table)} rows)")
+        paths.append(path)
+    if source is not None:
+        path = f'{path_base}{SOURCE_REFERENCE_SUFFIX}'
+        with open(path, 'w') as f:
+            json.dump(source, f, indent=2)
+        paths.append(path)
+    return paths
+
+
+def write_results_to_book(book, results: Dict[str, pd.DataFrame], unmatched: pd.DataFrame = None):
+    """Write a results_* sheet per match type into a workbook open in Excel (xlwings Book).
+
+    Existing results_* sheets are cleared and reused, so the workbook's macros and other
+    sheets are untouched. Columns are sized with column_widths instead of Excel's autofit.
+
+    Args:
+        book: xlwings Book, e.g. from xw.App().books.open(path).
+        results (Dict[str, pd.DataFrame]): Results per match type, from run_all_matches.
+        unmatched (pd.DataFrame): Optional unmatched input rows (fuzzy_matcher.unmatched_rows),
+            written to an Unmatched_Rows sheet the same way.
+    """
+    existing = [sheet.name for sheet in book.sheets]
+    tables = {f'results_{match_type}': results_df for match_type, results_df in results.items()}
+    if unmatched is not None:
+        tables[UNMATCHED_SHEET_NAME] = unmatched
+    for sheet_name, table in tables.items():
+        with stage('excel_write', sheet=sheet_name):
+            if sheet_name in existing:
+                book.sheets[sheet_name].clear_contents()
+            else:
+                book.sheets.add(sheet_name)
+            sheet = book.sheets[sheet_name]
+            sheet.range('A1').options(index=False).value = table
+            for column, width in enumerate(column_widths(table), start=1):
+                sheet.range((1, column)).column_width = width
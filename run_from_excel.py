@@ -1,12 +1,20 @@
-import pandas as pd
 import xlwings as xw
 import sys
-from fuzzy_matcher import preprocess_data, run_specific_match
+import os
+from fuzzy_matcher import (preprocess_data, run_all_matches, unmatched_rows, MasterIndex, ResultCache,
+                           MASTER_INDEX_DIRNAME, index_source)
+from workbook_reader import read_data_sheets, read_sheet
+from instrumentation import PROFILE_ENV_VAR, profile_to
+from results_writer import write_results_to_book
 
 def main():
     """
     Called from run.sh. Reads data from the Excel workbook, runs all three
-    match types, and writes three separate result sheets back to the workbook.
+    match types, and writes three separate result sheets back to the workbook, plus an
+    Unmatched_Rows sheet with the input rows no match type found.
+
+    If the FUZZY_MATCHER_PROFILE environment variable names a directory, a per-stage
+    timing summary and Chrome trace of the run are written there.
     """
     if len(sys.argv) < 2:
         print("Error: Workbook path not provided.")
@@ -15,11 +23,11 @@ def main():
     workbook_path = sys.argv[1]
 
     try:
-        # --- Step 1: Read data quickly using pandas ---
+        # --- Step 1: Stream only the needed columns of the data sheets ---
         print("Reading data from Excel file...")
-        all_sheets_dfs = pd.read_excel(workbook_path, sheet_name=None, engine='openpyxl')
+        all_sheets_dfs = read_data_sheets(workbook_path)
         
-        sheet_names = [name for name in all_sheets_dfs.keys() if not name.startswith('results_')]
+        sheet_names = list(all_sheets_dfs.keys())
         if len(sheet_names) < 2:
             print("Error: Could not find two data sheets to compare.")
             return
@@ -46,31 +54,28 @@ def main():
             
         print(f"Using {input_name} ({len(input_raw)} rows) as INPUT data")
         print(f"Using {master_name} ({len(master_raw)} rows) as MASTER data")
+        # Every column of the input sheet, for its rows in the Unmatched_Rows sheet
+        input_full = read_sheet(workbook_path, input_name, columns=None)
         
         # --- Step 3: Preprocess data ---
         print("Preprocessing data...")
         df1 = preprocess_data(input_raw)   # df1 = input (smaller)
-        df2 = preprocess_data(master_raw)  # df2 = master (larger)
+        # df2 = master (larger), reused from the cached index while the master is unchanged
+        index_dir = os.path.join(os.path.dirname(os.path.abspath(workbook_path)), MASTER_INDEX_DIRNAME)
+        df2 = MasterIndex.load_or_build(master_raw, index_dir, index_source(workbook_path, master_name))
 
-        # --- Step 4: Run all three match types ---
-        match_types = ['FullName', 'LastNameAddress', 'FullAddress']
-        results = {match_type: run_specific_match(df1, df2, match_type) for match_type in match_types}
+        # --- Step 4: Run all three match types in a single pass ---
+        # Rows already matched against this master in earlier runs reuse their cached results
+        results, matched = run_all_matches(df1, df2, result_cache=ResultCache.beside_index(index_dir, df2),
+                                           return_matched=True)
+        unmatched = unmatched_rows(input_full, matched)
+        print(f"{len(unmatched)} of {len(input_raw)} input rows have no match")
 
         # --- Step 5: Write all results back to the workbook ---
         print("\nWriting all results back to the workbook...")
         with xw.App(visible=False) as app:
             wb = app.books.open(workbook_path)
-            
-            for match_type, results_df in results.items():
-                sheet_name = f'results_{match_type}'
-                if sheet_name in [s.name for s in wb.sheets]:
-                    wb.sheets[sheet_name].clear_contents()
-                else:
-                    wb.sheets.add(sheet_name)
-                
-                wb.sheets[sheet_name].range('A1').options(index=False).value = results_df
-                wb.sheets[sheet_name].autofit()
-
+            write_results_to_book(wb, results, unmatched)
             wb.save()
             print("Successfully saved all results to the workbook.")
             
@@ -80,4 +85,5 @@ def main():
         traceback.print_exc()
 
 if __name__ == '__main__':
-    main() 
\ No newline at end of file
+    with profile_to(os.environ.get(PROFILE_ENV_VAR)):
+        main() 
\ No newline at end of file
@@ -0,0 +1,153 @@
+"""
+Input file readers for the headless matcher: CSV, Parquet and Excel workbooks.
+
+Every reader returns the same shape as the workbook reader: only the requested columns,
+every value as text (str or None) so zip codes keep their leading zeros, indexed by row
+position so position + 2 is still the row number in the file. CSV files are parsed with
+pyarrow's multithreaded reader when pyarrow is installed, and with pandas otherwise.
+"""
+
+import csv
+import os
+from typing import List, Sequence
+
+import openpyxl
+import pandas as pd
+
+from fuzzy_matcher import SOURCE_COLUMNS
+from instrumentation import stage
+from workbook_reader import cell_to_text, is_result_sheet, read_sheet
+
+TABLE_FORMATS = {
+    '.csv': 'csv',
+    '.txt': 'csv',
+    '.parquet': 'parquet',
+    '.pq': 'parquet',
+    '.xlsx': 'xlsx',
+    '.xlsm': 'xlsx',
+}
+
+
+def table_format(path: str) -> str:
+    """Return 'csv', 'parquet' or 'xlsx' from a file's extension.
+
+    Raises:
+        ValueError: If the extension is not one of TABLE_FORMATS.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in TABLE_FORMATS:
+        raise ValueError(f"Unsupported input file '{path}': expected one of {', '.join(TABLE_FORMATS)}")
+    return TABLE_FORMATS[extension]
+
+
+def object_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Copy of df with object columns and None for missing values, like the workbook reader's."""
+    return df.astype(object).where(df.notna(), None)
+
+
+def csv_header(path: str) -> List[str]:
+    """Column names from the first line of a CSV file."""
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        return next(csv.reader(f), [])
+
+
+def read_csv(path: str, columns: Sequence[str] = SOURCE_COLUMNS) -> pd.DataFrame:
+    """Read a CSV file as text, with pyarrow's multithreaded reader if it is installed.
+
+    Empty fields and the usual null markers ('NA', 'NULL', ...) read as None, as with
+    pd.read_csv(dtype=str).
+
+    Args:
+        path (str): CSV file with a header row.
+        columns (Sequence[str]): Column names to keep. None keeps all.
+
+    Returns:
+        pd.DataFrame: The file, indexed by row position.
+    """
+    keep = [name for name in csv_header(path) if columns is None or name in columns]
+    try:
+        import pyarrow as pa
+        from pyarrow import csv as pa_csv
+    except ImportError:
+        return object_columns(pd.read_csv(path, dtype=str, usecols=keep, encoding='utf-8-sig')[keep])
+
+    table = pa_csv.read_csv(
+        path,
+        read_options=pa_csv.ReadOptions(use_threads=True),
+        convert_options=pa_csv.ConvertOptions(
+            include_columns=keep,
+            column_types={name: pa.string() for name in keep},
+            strings_can_be_null=True,
+        ),
+    )
+    return object_columns(table.to_pandas())
+
+
+def read_parquet(path: str, columns: Sequence[str] = SOURCE_COLUMNS) -> pd.DataFrame:
+    """Read a Parquet file, converting typed columns to text the way they read in Excel.
+
+    Args:
+        path (str): Parquet file.
+        columns (Sequence[str]): Column names to keep. None keeps all.
+
+    Returns:
+        pd.DataFrame: The file, indexed by row position.
+
+    Raises:
+        ImportError: If pyarrow is not installed.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Parquet input needs pyarrow (pip install pyarrow)") from e
+    names = pq.ParquetFile(path).schema_arrow.names
+    keep = [name for name in names if columns is None or name in columns]
+    table = pq.read_table(path, columns=keep, use_threads=True)
+    df = object_columns(table.to_pandas().reset_index(drop=True))
+    for field in table.schema:
+        if not (pa.types.is_string(field.type) or pa.types.is_large_string(field.type)):
+            df[field.name] = df[field.name].map(cell_to_text)
+    return df
+
+
+def first_data_sheet(path: str) -> str:
+    """Name of the first sheet in a workbook that is not a result sheet.
+
+    Raises:
+        ValueError: If the workbook has no data sheet.
+    """
+    workbook = openpyxl.load_workbook(path, read_only=True)
+    try:
+        for sheet_name in workbook.sheetnames:
+            if not is_result_sheet(sheet_name):
+                return sheet_name
+    finally:
+        workbook.close()
+    raise ValueError(f"No data sheet in '{path}'")
+
+
+def read_table(path: str, columns: Sequence[str] = SOURCE_COLUMNS, sheet_name: str = None) -> pd.DataFrame:
+    """Read a CSV, Parquet or Excel file as text, choosing the reader by extension.
+
+    Args:
+        path (str): Input file (.csv, .txt, .parquet, .pq, .xlsx or .xlsm).
+        columns (Sequence[str]): Column names to keep. None keeps all.
+        sheet_name (str): Sheet to read from a workbook. If None, the first data sheet.
+
+    Returns:
+        pd.DataFrame: The table, indexed by row position.
+
+    Example:
+        >>> master_raw = read_table('master.parquet')
+        >>> input_raw = read_table('FuzzyMatch_Tool.xlsm', sheet_name='Input')
+    """
+    file_format = table_format(path)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Input file not found: {path}")
+    if file_format == 'xlsx':
+        return read_sheet(path, sheet_name or first_data_sheet(path), columns)
+    with stage('table_read', path=path):
+        if file_format == 'csv':
+            return read_csv(path, columns)
+        return read_parquet(path, columns)
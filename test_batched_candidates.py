@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""Test that batched candidate generation matches per-row process.extract."""
+
+from rapidfuzz import fuzz, process
+from fuzzy_matcher import generate_candidates
+
+QUERIES = [
+    "JOHN SMITH",
+    "SMITH 20 CHURCH ST, NORWICH, CT 06360",
+    "268 FLANDERS RD TRLR 9, MYSTIC, CT 6355",
+    "",
+]
+CHOICES = [
+    "JOHN SMITH",
+    "SMITH JOHN",
+    "JON SMITH",
+    "SMITH 20 CHURCH STREET, NORWICH, CT 06360",
+    "268 FLANDERS RD LOT 3, MYSTIC, CT 06355",
+    "268 FLANDERS RD TRLR 9, MYSTIC, CT 06355",
+    "JOHN SMITH",
+    "MARY JONES",
+]
+
+
+def test_batched_candidates_match_extract():
+    """Every chunk size should give the same candidates, in the same order, as process.extract."""
+    cutoff = 50.0
+    expected = []
+    for query in QUERIES:
+        extracted = process.extract(query, CHOICES, scorer=fuzz.token_set_ratio, limit=3)
+        expected.append([(pos, score) for _, score, pos in extracted if score >= cutoff])
+
+    for chunk_size in (1, 2, None):
+        batched = list(generate_candidates(QUERIES, CHOICES, cutoff, limit=3, chunk_size=chunk_size))
+        assert batched == expected, f"chunk_size={chunk_size}: {batched} != {expected}"
+
+
+def test_batched_candidates_empty_master():
+    """An empty master yields no candidates for each query."""
+    assert list(generate_candidates(QUERIES, [], 50.0)) == [[] for _ in QUERIES]
+
+
+if __name__ == "__main__":
+    test_batched_candidates_match_extract()
+    test_batched_candidates_empty_master()
+    print("✅ Batched candidates match process.extract")
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Test blocking keys and the blocking index used to shrink the candidate set."""
+
+import pandas as pd
+from fuzzy_matcher import BlockingIndex, normalize_zip, preprocess_data, run_specific_match, soundex
+
+
+def make_sheets():
+    """Small input/master pair where the only true match shares zip 06355."""
+    master = preprocess_data(pd.DataFrame({
+        'First_Name': ['JOHN', 'JOHN', 'MARY'],
+        'Last_Name': ['SMITH', 'SMITH', 'JONES'],
+        'Address1': ['15 CHAPMAN DR', '15 CHAPMAN DR', '8 ALICE ST'],
+        'City': ['NEW LONDON', 'MYSTIC', 'NEW LONDON'],
+        'State': ['CT', 'CT', 'CT'],
+        'Zip': ['06320', '06355', '06320'],
+    }))
+    inputs = preprocess_data(pd.DataFrame({
+        'First_Name': ['JOHN', 'PAT'],
+        'Last_Name': ['SMITH', 'DOE'],
+        'Address1': ['15 CHAPMAN DR', '1 MAIN ST'],
+        'City': ['MYSTIC', 'BOSTON'],
+        'State': ['CT', 'MA'],
+        'Zip': ['6355', '02101'],
+    }))
+    return inputs, master
+
+
+def test_blocking_keys():
+    """Zip codes regain leading zeros and Soundex follows the standard rules."""
+    assert normalize_zip('6355') == '06355'
+    assert normalize_zip('06355-1234') == '06355'
+    assert normalize_zip('') == ''
+    assert normalize_zip('6355.0') == normalize_zip(6355.0) == '06355'
+
+    # A blank zip cell makes pandas read the column as floats
+    floats = pd.DataFrame({'First_Name': ['JOHN', 'MARY'], 'Last_Name': ['SMITH', 'JONES'],
+                           'Address1': ['15 CHAPMAN DR', '8 ALICE ST'], 'City': ['MYSTIC', 'BOSTON'],
+                           'State': ['CT', 'MA'], 'Zip': [6355.0, float('nan')]})
+    assert preprocess_data(floats)['Zip_Normalized'].tolist() == ['06355', '']
+    assert [soundex(n) for n in ('ROBERT', 'RUPERT', 'ASHCRAFT', 'PFISTER', 'TYMCZAK')] == \
+        ['R163', 'R163', 'A261', 'P236', 'T522']
+
+
+def test_blocking_restricts_and_falls_back():
+    """Rows only see their own zip block, and empty blocks fall back to the whole master."""
+    inputs, master = make_sheets()
+    index = BlockingIndex(master, keys=('zip5',))
+    assert index.lookup(('06355',)).tolist() == [1]
+    assert index.lookup(('02101',)) is None
+
+    strict = BlockingIndex(master, keys=('zip5',), fallback_to_global=False)
+    assert strict.lookup(('02101',)).tolist() == []
+
+    results = run_specific_match(inputs, master, 'FullAddress', blocking=index)
+    assert results['Sheet B Row'].tolist() == [3]
+
+
+if __name__ == "__main__":
+    test_blocking_keys()
+    test_blocking_restricts_and_falls_back()
+    print("✅ Blocking index works")
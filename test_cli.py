@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Test the CSV/Parquet/XLSX readers and the headless command-line matcher."""
+
+import contextlib
+import io
+import os
+import tempfile
+
+import pandas as pd
+from fuzzy_matcher import MasterIndex, preprocess_data, run_all_matches
+from fuzzy_matcher_cli import main
+from results_writer import write_results_workbook
+from table_reader import read_table
+
+ZIPS = pd.DataFrame({'First_Name': ['JOHN', None], 'Zip': ['06355', '02101'], 'MD5': ['abc', 'def']})
+
+
+def test_readers_agree():
+    """CSV, Parquet and workbook files read to the same text values, with leading zeros kept."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = {extension: os.path.join(tmp_dir, f'table.{extension}') for extension in ('csv', 'parquet', 'xlsx')}
+        ZIPS.to_csv(paths['csv'], index=False, encoding='utf-8-sig')
+        ZIPS.to_parquet(paths['parquet'], index=False)
+        write_results_workbook(paths['xlsx'], {}, {'Data': ZIPS})
+        for extension, path in paths.items():
+            df = read_table(path)
+            assert list(df.columns) == ['First_Name', 'Zip'], extension
+            assert df.to_dict('list') == {'First_Name': ['JOHN', None], 'Zip': ['06355', '02101']}, extension
+            assert list(read_table(path, columns=None).columns) == list(ZIPS.columns), extension
+
+
+def test_cli_matches_like_run_all_matches():
+    """The CLI writes the same results as run_all_matches, from any input format."""
+    input_raw = read_table('temp_input.csv')
+    master_raw = read_table('temp_master.csv')
+    expected = run_all_matches(preprocess_data(input_raw), MasterIndex(preprocess_data(master_raw)),
+                               thresholds={'FullName': 80.0})
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        input_path = os.path.join(tmp_dir, 'input.parquet')
+        # With a row nothing matches, and a column the matcher does not read
+        nobody = pd.DataFrame({'First_Name': ['XAVIERA'], 'Last_Name': ['QUONK'], 'Address1': ['999 ZEPHYR WAY'],
+                               'City': ['NOWHERE'], 'State': ['AK'], 'Zip': ['99999']})
+        input_full = pd.concat([input_raw, nobody], ignore_index=True)
+        input_full['CustomerID'] = [f'C{i}' for i in range(len(input_full))]
+        input_full.to_parquet(input_path, index=False)
+        master_path = os.path.join(tmp_dir, 'master.xlsx')
+        write_results_workbook(master_path, {}, {'Master': master_raw})
+        output = os.path.join(tmp_dir, 'out', 'nightly')
+        assert main([input_path, master_path, '--threshold', 'FullName=80', '--workers', '2',
+                     '--output', output, '--no-index-cache', '-q']) == 0
+        for match_type, results_df in expected.items():
+            path = f'{output}_results_{match_type}.csv'
+            if results_df.empty:
+                assert not os.path.exists(path), match_type
+                continue
+            written = pd.read_csv(path, dtype=str, keep_default_na=False)
+            assert written['Sheet B Row'].tolist() == results_df['Sheet B Row'].astype(str).tolist(), match_type
+            assert written['Match Score'].astype(float).tolist() == results_df['Match Score'].tolist(), match_type
+
+        unmatched = pd.read_csv(f'{output}_Unmatched_Rows.csv', dtype=str, keep_default_na=False)
+        assert list(unmatched.columns) == ['Original_Row_Number', *input_full.columns]
+        assert unmatched['CustomerID'].tolist() == [f'C{len(input_raw)}']
+        assert unmatched['Original_Row_Number'].tolist() == [str(len(input_raw) + 2)]
+
+        assert main([os.path.join(tmp_dir, 'missing.csv'), master_path, '-q']) == 1
+        assert main([input_path, os.path.join(tmp_dir, 'master.json'), '-q']) == 1
+
+        # A sheet without a required column is a one-line error too
+        no_zip_path = os.path.join(tmp_dir, 'no_zip.csv')
+        input_raw.drop(columns=['Zip']).to_csv(no_zip_path, index=False)
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            assert main([no_zip_path, master_path, '-q']) == 1
+        assert stderr.getvalue() == "Error: Missing required column: Zip\n"
+
+
+if __name__ == "__main__":
+    test_readers_agree()
+    test_cli_matches_like_run_all_matches()
+    print("✅ Command-line matcher works")
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""Test that matching distinct records only gives the same results as matching every row."""
+
+import pandas as pd
+from fuzzy_matcher import (MATCH_TYPES, ScoreStore, expand_duplicate_candidates, generate_candidates,
+                           group_duplicates, preprocess_data, run_all_matches)
+from test_batched_candidates import CHOICES, QUERIES
+from test_single_pass import INPUT, MASTER
+
+
+def test_expanded_candidates_match_all_rows():
+    """Candidates over distinct strings, expanded to rows, equal candidates over every row."""
+    choices = CHOICES + CHOICES[:4] + ["JON SMITH"] * 3
+    groups = group_duplicates(choices)
+    unique_choices = [choices[row] for row in groups.first]
+    for limit in (1, 3, 10):
+        expected = list(generate_candidates(QUERIES, choices, 50.0, limit=limit))
+        expanded = expand_duplicate_candidates(generate_candidates(QUERIES, unique_choices, 50.0, limit=limit),
+                                               groups, limit=limit)
+        assert list(expanded) == expected, limit
+
+
+def test_duplicate_rows_fan_out():
+    """Duplicate input rows each get the result of their record, as without dedupe."""
+    df1 = preprocess_data(pd.concat([INPUT, INPUT.iloc[[0, 2]], INPUT], ignore_index=True))
+    df2 = preprocess_data(pd.concat([MASTER, MASTER.iloc[::-1]], ignore_index=True))
+    thresholds = {'FullName': 70.0, 'LastNameAddress': 60.0}
+    stores = ScoreStore(), ScoreStore()
+    expected = run_all_matches(df1, df2, thresholds=thresholds, dedupe=False, score_store=stores[0])
+    deduped = run_all_matches(df1, df2, thresholds=thresholds, score_store=stores[1])
+    for match_type in MATCH_TYPES:
+        assert deduped[match_type].equals(expected[match_type]), match_type
+        assert stores[1].evaluate(match_type, 85.0).equals(stores[0].evaluate(match_type, 85.0)), match_type
+    assert set(deduped['FullName']['Sheet A Row']) >= {2, 6, 8, 10}  # JOHN SMITH and all its copies
+
+
+if __name__ == "__main__":
+    test_expanded_candidates_match_all_rows()
+    test_duplicate_rows_fan_out()
+    print("✅ Deduplicated matching gives the same results")
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Test the exact-match fast path ahead of fuzzy matching."""
+
+import pandas as pd
+
+from fuzzy_matcher import (MATCH_TYPES, BlockingIndex, MasterIndex, compute_individual_scores, exact_match_keys,
+                           get_combined_score, preprocess_data, run_all_matches, run_specific_match)
+from table_reader import read_table
+from test_single_pass import INPUT, MASTER
+
+
+def test_exact_keys_only_cover_perfect_scores():
+    df = preprocess_data(pd.DataFrame({
+        'First_Name': ['ANN', '', 'ANN'],
+        'Last_Name': ['SMITH', 'SMITH', 'SMITH'],
+        'Address1': ['12 MAIN ST', '12 MAIN ST', '12'],
+        'City': ['MYSTIC'] * 3, 'State': ['CT'] * 3, 'Zip': ['06355'] * 3,
+    }))
+    assert exact_match_keys(df, 'FullName') == [('ANN', 'SMITH'), None, ('ANN', 'SMITH')]
+    assert exact_match_keys(df, 'FullAddress')[2] is None  # House number, no street name
+    for match_type in MATCH_TYPES:
+        for key, (_, row) in zip(exact_match_keys(df, match_type), df.iterrows()):
+            if key is not None:
+                assert get_combined_score(compute_individual_scores(row, row), match_type) == 100
+
+
+def test_exact_hits_score_100_and_leave_other_rows_alone():
+    df1 = preprocess_data(INPUT)
+    df2 = preprocess_data(MASTER)
+    thresholds = {'FullName': 70.0, 'LastNameAddress': 60.0}
+    fast = run_all_matches(df1, df2, thresholds=thresholds)
+    for match_type in MATCH_TYPES:
+        assert fast[match_type].equals(run_all_matches(df1, df2, thresholds=thresholds, exact=False)[match_type])
+
+    df1 = preprocess_data(read_table('temp_input.csv'))
+    master = MasterIndex(preprocess_data(read_table('temp_master.csv')))
+    for options in ({}, {'workers': 2}):
+        fast = run_all_matches(df1, master, **options)
+        slow = run_all_matches(df1, master, exact=False, **options)
+        for match_type in MATCH_TYPES:
+            scores = fast[match_type].set_index('Sheet A Row')['Match Score']
+            assert scores.sort_index().equals(slow[match_type].set_index('Sheet A Row')['Match Score'].sort_index())
+
+    # Deleted master rows are never an exact hit
+    hits = master.exact_positions(df1, 'FullAddress')
+    assert (hits >= 0).any()
+    hit = int(hits.max())
+    master.delete([hit])
+    assert hit not in master.exact_positions(df1, 'FullAddress').tolist()
+
+
+def test_exact_path_on_frames_without_parsed_address_columns():
+    """Frames with only name and FullAddress columns are keyed by parsing the address."""
+    columns = {'Address1': ['123 MAIN ST', '12'], 'City': ['ANYTOWN', ''], 'State': ['CT', ''], 'Zip': ['06355', ''],
+               'FullAddress': ['123 MAIN ST, ANYTOWN, CT 06355', '12']}
+    df1 = pd.DataFrame({'First_Name': ['JOHN', 'MARY'], 'Last_Name': ['SMITH', 'JONES'], **columns})
+    df2 = pd.DataFrame({'First_Name': ['JOHN', 'MARY'], 'Last_Name': ['SMYTH', 'JONES'], **columns})
+    assert exact_match_keys(df1, 'FullAddress') == [('123 MAIN ST, ANYTOWN, CT 06355',), None]
+    thresholds = {match_type: 60.0 for match_type in MATCH_TYPES}
+    fast = run_all_matches(df1, df2, thresholds=thresholds)
+    slow = run_all_matches(df1, df2, thresholds=thresholds, exact=False)
+    for match_type in MATCH_TYPES:
+        assert fast[match_type].equals(slow[match_type]), match_type
+
+
+def test_exact_hits_respect_blocking():
+    """An identical record outside the input row's blocks is not matched."""
+    df1 = preprocess_data(pd.DataFrame({'First_Name': ['JOHN'], 'Last_Name': ['SMITH'], 'Address1': ['15 CHAPMAN DR'],
+                                        'City': ['MYSTIC'], 'State': ['CT'], 'Zip': ['06355']}))
+    df2 = preprocess_data(pd.DataFrame({'First_Name': ['JOHN', 'MARY'], 'Last_Name': ['SMITH', 'JONES'],
+                                        'Address1': ['15 CHAPMAN DR', '8 ALICE ST'], 'City': ['BOSTON', 'MYSTIC'],
+                                        'State': ['MA', 'CT'], 'Zip': ['02101', '06355']}))
+    blocking = BlockingIndex(df2, keys=('zip5',), fallback_to_global=False)
+    for exact in (True, False):
+        assert run_specific_match(df1, df2, 'FullName', blocking=blocking, exact=exact).empty, exact
+
+    # Inside the blocks, the exact hit is still taken
+    blocking = BlockingIndex(df2, keys=('last_soundex',), fallback_to_global=False)
+    assert run_specific_match(df1, df2, 'FullName', blocking=blocking)['Sheet B Row'].tolist() == [2]
+
+
+if __name__ == "__main__":
+    test_exact_keys_only_cover_perfect_scores()
+    test_exact_hits_score_100_and_leave_other_rows_alone()
+    test_exact_path_on_frames_without_parsed_address_columns()
+    test_exact_hits_respect_blocking()
+    print("✅ Exact matches resolve at score 100 without fuzzy matching")
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""Test per-stage timing of the matching pipeline."""
+
+import json
+import os
+import tempfile
+
+from fuzzy_matcher import preprocess_data, run_all_matches
+from instrumentation import StageTimer, instrument, profile_to
+from test_single_pass import INPUT, MASTER
+
+
+def test_stages_are_timed():
+    """Every engine stage is recorded, with one candidates and verify event per input row."""
+    seen = []
+    with instrument(StageTimer(callback=lambda name, seconds, args: seen.append(name))) as timer:
+        run_all_matches(preprocess_data(INPUT), preprocess_data(MASTER))
+    stages = timer.summary()['stages']
+    assert list(stages) == ['preprocess', 'exact', 'search_strings', 'candidates', 'verify', 'results']
+    assert stages['candidates']['calls'] == stages['verify']['calls'] == len(INPUT)
+    assert len(seen) == len(timer.events) == sum(stage['calls'] for stage in stages.values())
+
+
+def test_profile_files_written():
+    """profile_to writes a JSON summary and a Chrome trace, and is a no-op without a directory."""
+    with profile_to(None) as timer:
+        assert timer is None
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        with profile_to(tmp_dir):
+            preprocess_data(INPUT)
+        with open(os.path.join(tmp_dir, 'timing_summary.json')) as f:
+            assert json.load(f)['stages']['preprocess']['calls'] == 1
+        with open(os.path.join(tmp_dir, 'timing_trace.json')) as f:
+            events = json.load(f)['traceEvents']
+        assert [(event['name'], event['ph']) for event in events] == [('preprocess', 'X')]
+
+
+if __name__ == "__main__":
+    test_stages_are_timed()
+    test_profile_files_written()
+    print("✅ Pipeline stages are timed")
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Test saving, loading and invalidating the on-disk master index."""
+
+import os
+import tempfile
+from unittest import mock
+
+import pandas as pd
+from fuzzy_matcher import MasterIndex, PackedStrings, index_source, preprocess_data, run_all_matches
+from test_single_pass import INPUT, MASTER
+
+
+def test_packed_strings_round_trip():
+    """Packed strings survive a save/mmap-load round trip, including non-ASCII text."""
+    strings = ['JOHN SMITH', '', 'JOSÉ NUÑEZ', '8 ALICE ST # 2']
+    with tempfile.TemporaryDirectory() as tmp:
+        PackedStrings.from_list(strings).save(os.path.join(tmp, 'names'))
+        packed = PackedStrings.load(os.path.join(tmp, 'names'))
+        assert packed.tolist() == strings
+        assert [packed[i] for i in range(len(packed))] == strings
+
+
+def test_cached_index_matches_fresh_preprocessing():
+    """A reloaded index gives the same DataFrame and results as preprocessing from scratch."""
+    df1 = preprocess_data(INPUT)
+    fresh = run_all_matches(df1, preprocess_data(MASTER))
+    with tempfile.TemporaryDirectory() as tmp:
+        built = MasterIndex.load_or_build(MASTER, tmp)
+        loaded = MasterIndex.load_or_build(MASTER, tmp)
+        assert loaded._df is None  # Nothing unpacked until the engine needs it
+        assert loaded.df.equals(built.df)
+        cached = run_all_matches(df1, loaded, blocking=('zip5',))
+        assert all(cached[match_type].equals(fresh[match_type]) for match_type in fresh)
+
+
+def test_changed_master_invalidates_index():
+    """Editing the master builds a new index and removes the stale one."""
+    with tempfile.TemporaryDirectory() as tmp:
+        old = MasterIndex.load_or_build(MASTER, tmp)
+        changed = MASTER.copy()
+        changed.loc[0, 'LastName'] = 'SMITHE'
+        new = MasterIndex.load_or_build(changed, tmp)
+        assert new.content_hash != old.content_hash
+        assert os.listdir(tmp) == [new.content_hash]
+        assert new.df.loc[0, 'Last_Name'] == 'SMITHE'
+
+
+
+def test_masters_share_cache_dir():
+    """Several masters keep their own indexes, result caches and refresh lineage in one directory."""
+    other = MASTER.copy()
+    other['LastName'] = other['LastName'] + 'S'
+    patch_build = mock.patch.object(MasterIndex, 'build', wraps=MasterIndex.build)
+    with tempfile.TemporaryDirectory() as tmp, patch_build as build:
+        with open(os.path.join(tmp, 'notes.txt'), 'w') as f:
+            f.write('not an index')
+        a = MasterIndex.load_or_build(MASTER, tmp, index_source('a.xlsx', 'Master'))
+        b = MasterIndex.load_or_build(other, tmp, index_source('b.xlsx', 'Master'))
+        result_dir = os.path.join(tmp, b.content_hash, 'results')
+        os.makedirs(result_dir)
+        assert MasterIndex.load_or_build(MASTER, tmp, index_source('a.xlsx', 'Master'))._df is None  # Loaded
+        assert sorted(os.listdir(tmp)) == sorted([a.content_hash, b.content_hash, 'notes.txt'])
+
+        # A refresh of A updates A's index, though B's is newer, and leaves B's alone
+        grown = pd.concat([MASTER, other.iloc[:1]], ignore_index=True)
+        updated = MasterIndex.load_or_build(grown, tmp, index_source('a.xlsx', 'Master'))
+        assert build.call_count == 2
+        assert updated.df.equals(preprocess_data(grown))
+        assert sorted(os.listdir(tmp)) == sorted([updated.content_hash, b.content_hash, 'notes.txt'])
+        assert os.path.isdir(result_dir)
+
+if __name__ == "__main__":
+    test_packed_strings_round_trip()
+    test_cached_index_matches_fresh_preprocessing()
+    test_changed_master_invalidates_index()
+    test_masters_share_cache_dir()
+    print("✅ Master index round trip works")
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""Test that appending and deleting master records gives the same results as a fresh index."""
+
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from fuzzy_matcher import (MATCH_TYPES, MasterIndex, ResultCache, align_appended_rows, compute_content_hash,
+                           preprocess_data, run_all_matches)
+from table_reader import read_table
+
+MODES = [{}, {'blocking': ('zip5', 'last_soundex')}, {'workers': 2}]
+
+
+def assert_same_results(master, expected_master, df1):
+    for options in MODES:
+        actual = run_all_matches(df1, master, **options)
+        expected = run_all_matches(df1, expected_master, **options)
+        for match_type in MATCH_TYPES:
+            assert actual[match_type].equals(expected[match_type]), (match_type, options)
+
+
+def monthly_refresh(master_raw):
+    """Last month's sheet, and this month's: some rows removed, new rows at the end."""
+    old_raw = master_raw.iloc[:-40].reset_index(drop=True)
+    removed = [3, 17, 18, 60]
+    new_raw = pd.concat([old_raw.drop(index=removed), master_raw.iloc[-40:]], ignore_index=True)
+    return old_raw, new_raw, removed
+
+
+def test_align_appended_rows():
+    assert align_appended_rows(np.array([1, 2, 3]), np.array([1, 2, 3, 4])).tolist() == [0, 1, 2]
+    assert align_appended_rows(np.array([1, 2, 3, 4]), np.array([1, 3, 4, 7])).tolist() == [0, 2, 3]
+    assert align_appended_rows(np.array([1, 2, 3]), np.array([9, 1, 2])).tolist() == []
+
+
+def test_append_and_delete_in_place():
+    master_raw = read_table('temp_master.csv')
+    df1 = preprocess_data(read_table('temp_input.csv'))
+    old_raw = master_raw.iloc[:-40]
+
+    master = MasterIndex.build(old_raw)
+    run_all_matches(df1, master, blocking=('zip5', 'last_soundex'))  # Build the structures to update
+    master.records()
+    master.address_parts()
+    positions = master.append(master_raw.iloc[-40:])
+    assert positions.tolist() == list(range(len(old_raw), len(master_raw)))
+    assert_same_results(master, MasterIndex(preprocess_data(master_raw)), df1)
+
+    master.delete([3, 17, 60])
+    assert master.deleted_count == 3 and len(master) == len(master_raw)
+    expected = MasterIndex(preprocess_data(master_raw.drop(index=[3, 17, 60])))
+    assert_same_results(master, expected, df1)
+
+    # Past MAX_TOMBSTONE_FRACTION the tombstones are compacted away
+    removed = [3, 17, 60, *range(100, 100 + len(master_raw) // 4)]
+    master.delete(removed[3:])
+    assert master.deleted_count == 0 and len(master) == len(master_raw) - len(removed)
+    expected = MasterIndex(preprocess_data(master_raw.drop(index=removed)))
+    assert_same_results(master, expected, df1)
+
+
+def test_load_or_build_updates_cached_index():
+    master_raw = read_table('temp_master.csv')
+    df1 = preprocess_data(read_table('temp_input.csv'))
+    old_raw, new_raw, removed = monthly_refresh(master_raw)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        old = MasterIndex.load_or_build(old_raw, cache_dir)
+        updated = MasterIndex.load_or_build(new_raw, cache_dir)
+        rebuilt = MasterIndex.build(new_raw)
+        assert updated.content_hash == rebuilt.content_hash != old.content_hash
+        assert updated.deleted_count == len(removed)
+        assert os.listdir(cache_dir) == [updated.content_hash]
+        assert_same_results(updated, rebuilt, df1)
+
+        # The tombstones are saved with the index
+        loaded = MasterIndex.load_or_build(new_raw, cache_dir)
+        assert loaded.deleted_count == len(removed)
+        assert_same_results(loaded, rebuilt, df1)
+
+        # An edit this early leaves too few rows unchanged, so the index is rebuilt
+        edited_raw = new_raw.copy()
+        edited_raw.loc[5, 'Address1'] = '1 NEW ADDRESS RD'
+        edited = MasterIndex.load_or_build(edited_raw, cache_dir)
+        assert edited.deleted_count == 0 and len(edited) == len(edited_raw)
+        assert_same_results(edited, MasterIndex.build(edited_raw), df1)
+
+
+def test_refreshed_index_runs_with_result_cache():
+    """Tombstoned rows keep labels of their own, so cached results map back to master rows."""
+    master_raw = read_table('temp_master.csv')
+    df1 = preprocess_data(read_table('temp_input.csv'))
+    old_raw, new_raw, removed = monthly_refresh(master_raw)
+
+    master = MasterIndex.build(old_raw)
+    assert master.update_from(new_raw)
+    assert master.deleted_count == len(removed) and master.df.index.is_unique
+    expected = run_all_matches(df1, MasterIndex.build(new_raw))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for _ in range(2):  # Filling the cache, then reading it back
+            cache = ResultCache(tmp_dir)
+            actual = run_all_matches(df1, master, result_cache=cache)
+            for match_type in MATCH_TYPES:
+                assert actual[match_type].equals(expected[match_type]), match_type
+        assert cache.misses == 0
+
+
+
+def test_compaction_invalidates_cached_results():
+    """Compacting renumbers master positions, so results cached before it are not reused."""
+    master_raw = read_table('temp_master.csv')
+    df1 = preprocess_data(read_table('temp_input.csv'))
+    removed = [3, 17, 60]
+
+    master = MasterIndex.build(master_raw)
+    master.delete(removed)
+    expected = run_all_matches(df1, MasterIndex.build(master_raw.drop(index=removed)))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        run_all_matches(df1, master, result_cache=ResultCache(tmp_dir))
+        before = master.content_hash
+        master.compact()
+        assert master.content_hash != before
+        cache = ResultCache(tmp_dir)
+        actual = run_all_matches(df1, master, result_cache=cache)
+        for match_type in MATCH_TYPES:
+            assert actual[match_type].equals(expected[match_type]), match_type
+        assert cache.hits == 0
+
+    # A refresh that compacts still ends up with the new sheet's hash, as load_or_build expects
+    master = MasterIndex.build(master_raw)
+    master.delete(range(100, 100 + len(master_raw) // 7))
+    new_raw = master_raw.drop(index=range(100, 100 + len(master_raw) // 4)).reset_index(drop=True)
+    assert master.update_from(new_raw)
+    assert master.deleted_count == 0 and len(master) == len(new_raw)
+    assert master.content_hash == compute_content_hash(new_raw)
+
+
+if __name__ == "__main__":
+    test_align_appended_rows()
+    test_append_and_delete_in_place()
+    test_load_or_build_updates_cached_index()
+    test_refreshed_index_runs_with_result_cache()
+    test_compaction_invalidates_cached_results()
+    print("✅ Appended and deleted master records match a freshly built index")
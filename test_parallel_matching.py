@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""Test that process-pool matching gives the same results as the serial path."""
+
+import pandas as pd
+from fuzzy_matcher import (DEFAULT_THRESHOLDS, MasterIndex, SharedMasterIndex, match_rows, preprocess_data,
+                           run_all_matches)
+from test_single_pass import INPUT, MASTER
+
+
+def test_parallel_matches_serial():
+    """workers=N returns exactly the serial results, with and without blocking."""
+    df1 = preprocess_data(pd.concat([INPUT] * 5, ignore_index=True))
+    df2 = preprocess_data(MASTER)
+    for blocking in (None, ('zip5', 'last_soundex')):
+        serial = run_all_matches(df1, df2, blocking=blocking)
+        parallel = run_all_matches(df1, df2, blocking=blocking, workers=2)
+        for match_type in serial:
+            assert parallel[match_type].equals(serial[match_type]), (match_type, blocking)
+
+
+def test_shared_master_round_trip():
+    """A master attached from shared memory has the same rows and search strings."""
+    master = MasterIndex(preprocess_data(MASTER))
+    with SharedMasterIndex(master, ('zip5',)) as shared:
+        attached, handles = SharedMasterIndex.attach(shared.spec)
+        assert attached.df.equals(master.df)
+        assert attached.search_strings('FullName') == master.search_strings('FullName')
+        assert attached.block_key_values('zip5') == master.block_key_values('zip5')
+        del attached
+        for handle in handles:
+            handle.close()
+
+
+def test_worker_master_stays_packed():
+    """Matching against an attached master never unpacks its rows into Python objects."""
+    df1 = preprocess_data(INPUT)
+    master = MasterIndex(preprocess_data(MASTER))
+    match_types = list(DEFAULT_THRESHOLDS)
+    serial = match_rows(df1, master, match_types, DEFAULT_THRESHOLDS)
+    exact_positions = {match_type: master.exact_positions(df1, match_type) for match_type in match_types}
+    with SharedMasterIndex(master) as shared:
+        attached, handles = SharedMasterIndex.attach(shared.spec)
+        assert match_rows(df1, attached, match_types, DEFAULT_THRESHOLDS, exact_positions=exact_positions) == serial
+        assert attached._df is None
+        assert attached.record_groups().codes.tolist() == master.record_groups().codes.tolist()
+        assert [attached.records()[p].label for p in range(len(master))] == master.df.index.tolist()
+        assert list(attached.address_parts()) == master.address_parts()
+        del attached
+        for handle in handles:
+            handle.close()
+
+
+if __name__ == "__main__":
+    test_parallel_matches_serial()
+    test_shared_master_round_trip()
+    test_worker_master_stays_packed()
+    print("✅ Parallel matching matches the serial path")
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""Test that the Arrow and chunked preprocessing give the same columns as the pandas engine."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from fuzzy_matcher import preprocess_data
+from table_reader import read_table
+
+EDGE_CASES = pd.DataFrame({
+    'FirstName': ['  ann ', None, 'Straße', '\xa0jo ', np.nan],
+    'LastName': ['smith', 'O\'NEIL\t', 'ÇELIK', '', 'LEE'],
+    'Address': ['12 main st', None, '7 rue de l\'église', ' 268 FLANDERS RD ', '1'],
+    'Address 2': [' apt 4 ', None, '', 'trlr 9', np.nan],
+    'City': ['mystic', '', None, 'MYSTIC', 'X'],
+    'State': ['ct', 'CT', 'CT', 'ct', None],
+    'Zip5': ['06355', None, '6355', '06355-1234', ''],
+    'MD5': ['a', 'b', 'c', 'd', 'e'],
+})
+
+
+def test_engines_agree():
+    pytest.importorskip('pyarrow')
+    numbers = pd.DataFrame({'First_Name': ['ANN', 'BOB'], 'Last_Name': ['LEE', 'LI'], 'Address1': ['1 A ST', None],
+                            'City': ['X', 'Y'], 'State': ['CT', 'MA'], 'Zip': [6355, 2101]})
+    for raw in (EDGE_CASES, numbers, read_table('temp_master.csv'), EDGE_CASES.iloc[:0]):
+        expected = preprocess_data(raw, engine='pandas')
+        for engine, chunk_rows in (('arrow', 250_000), ('arrow', 2), ('pandas', 3)):
+            actual = preprocess_data(raw, engine=engine, chunk_rows=chunk_rows)
+            pd.testing.assert_frame_equal(actual, expected, check_index_type=False)
+
+    with pytest.raises(ValueError):
+        preprocess_data(EDGE_CASES, engine='polars')
+    with pytest.raises(KeyError):
+        preprocess_data(EDGE_CASES.drop(columns='City'), engine='arrow')
+
+
+if __name__ == "__main__":
+    test_engines_agree()
+    print("✅ Preprocessing engines agree")
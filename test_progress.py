@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""Test the progress callback of run_all_matches and cancelling a run from it."""
+
+import pandas as pd
+from fuzzy_matcher import preprocess_data, run_all_matches
+from test_single_pass import INPUT, MASTER
+
+
+class Cancelled(Exception):
+    pass
+
+
+def test_progress_counts_input_rows():
+    """Progress rises to the total input rows, counting duplicates with their first occurrence."""
+    df1 = preprocess_data(pd.concat([INPUT, INPUT.iloc[[0, 2]], INPUT], ignore_index=True))
+    df2 = preprocess_data(MASTER)
+    for dedupe in (True, False):
+        for workers in (1, 2):
+            calls = []
+            run_all_matches(df1, df2, workers=workers, dedupe=dedupe,
+                            progress=lambda done, total: calls.append((done, total)))
+            assert calls[-1] == (len(df1), len(df1)), (dedupe, workers)
+            assert all(a[0] < b[0] for a, b in zip(calls, calls[1:])), (dedupe, workers)
+
+
+def test_progress_can_cancel():
+    """An exception raised by the progress callback stops the run."""
+    df1, df2 = preprocess_data(INPUT), preprocess_data(MASTER)
+    calls = []
+
+    def cancel_after_first_row(done, total):
+        calls.append(done)
+        raise Cancelled()
+
+    for workers in (1, 2):
+        calls.clear()
+        try:
+            run_all_matches(df1, df2, workers=workers, progress=cancel_after_first_row)
+        except Cancelled:
+            pass
+        else:
+            raise AssertionError("run was not cancelled")
+        assert len(calls) == 1, workers
+
+
+if __name__ == "__main__":
+    test_progress_counts_input_rows()
+    test_progress_can_cancel()
+    print("✅ Progress reporting and cancelling work")
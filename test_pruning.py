@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Test pruning candidate pairs by their score upper bound before scoring."""
+
+import numpy as np
+import pandas as pd
+
+from fuzzy_matcher import (MATCH_TYPES, MasterIndex, PruningStats, RecordBounds, ScoreStore, address_parts_list,
+                           compute_individual_scores, get_combined_score, preprocess_data, run_all_matches,
+                           score_upper_bounds)
+from table_reader import read_table
+
+
+def test_bounds_never_below_real_scores():
+    df1 = preprocess_data(read_table('temp_input.csv')).iloc[:40]
+    df2 = preprocess_data(read_table('temp_master.csv')).iloc[:300]
+    extra = preprocess_data(pd.DataFrame({
+        'First_Name': ['', 'ANN'], 'Last_Name': ['SMITH', ''],
+        'Address1': ['12 MAIN ST APT 4', '12 MAIN ST UNIT 4'], 'City': ['MYSTIC'] * 2, 'State': ['CT'] * 2,
+        'Zip': ['06355'] * 2,
+    }))
+    df1 = pd.concat([df1, extra], ignore_index=True)
+    df2 = pd.concat([df2, extra], ignore_index=True)
+    master = MasterIndex(df2)
+    input_parts = address_parts_list(df1)
+    input_bounds = RecordBounds.build(input_parts, df1, master.record_bounds().designator_codes)
+    positions = np.arange(len(df2))
+    records2 = master.records()
+
+    for position1, (_, row1) in enumerate(df1.iterrows()):
+        scores = [compute_individual_scores(row1, record2, input_parts[position1], master.address_parts()[p])
+                  for p, record2 in enumerate(records2)]
+        for match_type in MATCH_TYPES:
+            bounds = score_upper_bounds(input_bounds, position1, master.record_bounds(), positions, match_type)
+            real = np.array([get_combined_score(pair_scores, match_type) for pair_scores in scores])
+            assert (bounds >= real).all(), (position1, match_type)
+
+    # Same house number, different designator; empty first name
+    apartment = score_upper_bounds(input_bounds, len(df1) - 2, master.record_bounds(),
+                                   np.array([len(df2) - 2, len(df2) - 1]), 'FullAddress')
+    assert apartment.tolist() == [100.0, 0.0]
+    assert score_upper_bounds(input_bounds, len(df1) - 2, master.record_bounds(), positions, 'FullName').max() == 0
+
+
+def test_pruning_keeps_results():
+    df1 = preprocess_data(read_table('temp_input.csv'))
+    master = MasterIndex(preprocess_data(read_table('temp_master.csv')))
+    thresholds = {'FullName': 70.0, 'LastNameAddress': 65.0, 'FullAddress': 60.0}
+    for options in ({}, {'blocking': ('zip5', 'last_soundex')}, {'workers': 2}):
+        # Without the exact fast path, so every row's candidates go through pruning
+        unpruned = run_all_matches(df1, master, thresholds=thresholds, pruning=PruningStats(enabled=False),
+                                   exact=False, **options)
+        pruning = PruningStats()
+        pruned = run_all_matches(df1, master, thresholds=thresholds, pruning=pruning, exact=False, **options)
+        for match_type in MATCH_TYPES:
+            assert pruned[match_type].equals(unpruned[match_type]), (match_type, options)
+        assert 0 < pruning.pruned < pruning.checked, options
+
+    # A score store needs every pair's field scores, so nothing is pruned
+    pruning = PruningStats()
+    run_all_matches(df1, master, thresholds=thresholds, pruning=pruning, score_store=ScoreStore())
+    assert pruning.checked == pruning.pruned == 0
+
+
+if __name__ == "__main__":
+    test_bounds_never_below_real_scores()
+    test_pruning_keeps_results()
+    print("✅ Score-bound pruning never changes results")
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""Test the compact master records used in the verification loop."""
+
+import tracemalloc
+
+from fuzzy_matcher import MasterIndex, compute_individual_scores, preprocess_data, record_list
+from table_reader import read_table
+
+
+def test_records_match_rows():
+    df = preprocess_data(read_table('temp_master.csv'))
+    records = record_list(df)
+    assert len(records) == len(df)
+    for record, (label, row) in zip(records, df.iterrows()):
+        assert record.label == label
+        for column in ('First_Name', 'Last_Name', 'FullAddress'):
+            assert record[column] == row[column]
+        assert compute_individual_scores(record, records[0]) == compute_individual_scores(row, df.iloc[0])
+
+    # Repeated names share one string
+    smiths = [record.last_name for record in records if record.last_name == records[0].last_name]
+    assert all(name is smiths[0] for name in smiths)
+
+    # Appended records take their new labels
+    master = MasterIndex.build(read_table('temp_master.csv').iloc[:-5])
+    master.records()
+    master.append(read_table('temp_master.csv').iloc[-5:])
+    assert [record.label for record in master.records()] == df.index.tolist()
+
+
+def test_records_use_a_fraction_of_the_memory_of_rows():
+    df = preprocess_data(read_table('temp_master.csv'))
+
+    def allocated(build):
+        tracemalloc.start()
+        built = build()
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del built
+        return size
+
+    assert allocated(lambda: record_list(df)) * 10 < allocated(lambda: list(df.iterrows()))
+
+
+if __name__ == "__main__":
+    test_records_match_rows()
+    test_records_use_a_fraction_of_the_memory_of_rows()
+    print("✅ Compact master records match the DataFrame rows")
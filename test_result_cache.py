@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""Test that incremental runs with a ResultCache give the same results as full runs."""
+
+import tempfile
+
+from fuzzy_matcher import (MATCH_TYPES, RECORD_KEY_COLUMNS, MasterIndex, ResultCache, group_duplicates,
+                           preprocess_data, run_all_matches)
+from table_reader import read_table
+
+
+def assert_same_results(actual, expected):
+    for match_type in MATCH_TYPES:
+        assert actual[match_type].equals(expected[match_type]), match_type
+
+
+def test_growing_input_matches_only_new_rows():
+    """May, then May+June with an edited row: only new and changed records are matched."""
+    input_raw = read_table('temp_input.csv')
+    master = MasterIndex(preprocess_data(read_table('temp_master.csv')))
+    may = preprocess_data(input_raw.iloc[:150])
+    grown_raw = input_raw.copy()
+    grown_raw.loc[10, 'Address1'] = '1 NEW ADDRESS RD'
+    may_june = preprocess_data(grown_raw)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = ResultCache(tmp_dir)
+        assert_same_results(run_all_matches(may, master, result_cache=cache), run_all_matches(may, master))
+        misses = cache.misses
+
+        for workers in (1, 2):
+            cache = ResultCache(tmp_dir)  # A later run, reading the files back
+            incremental = run_all_matches(may_june, master, workers=workers, result_cache=cache)
+            assert_same_results(incremental, run_all_matches(may_june, master))
+            if workers == 1:
+                assert cache.hits == misses - 1  # Every May record except the edited one
+                assert cache.hits + cache.misses == len(group_duplicates(may_june[RECORD_KEY_COLUMNS]))
+            else:
+                assert cache.misses == 0
+
+        # Other settings are cached separately
+        cache = ResultCache(tmp_dir)
+        thresholds = {'FullName': 70.0}
+        assert_same_results(run_all_matches(may_june, master, thresholds=thresholds, result_cache=cache),
+                            run_all_matches(may_june, master, thresholds=thresholds))
+        assert cache.hits == 0
+
+
+if __name__ == "__main__":
+    test_growing_input_matches_only_new_rows()
+    print("✅ Incremental matching gives the same results")
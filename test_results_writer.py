@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Test the streaming results-workbook writer."""
+
+import json
+import os
+import tempfile
+
+import numpy as np
+import openpyxl
+import pandas as pd
+from fuzzy_matcher import unmatched_rows
+from results_writer import (MAX_COLUMN_WIDTH, SOURCE_SHEET_NAME, UNMATCHED_SHEET_NAME, column_widths,
+                            source_reference, write_results, write_results_workbook)
+from workbook_reader import read_data_sheets
+
+DATA = pd.DataFrame({
+    'First_Name': ['JOHN', None, 'ALICE'],
+    'Address1': ['15 CHAPMAN DR', '8 ALICE ST APT 2', 'X' * 80],
+})
+RESULTS = {
+    'FullName': pd.DataFrame({'Match Score': [100.0, 92.31], 'Sheet A Row': [2, 4], 'Name A': ['JOHN SMITH', 'AL']}),
+    'FullAddress': pd.DataFrame(),
+}
+
+
+def test_column_widths():
+    """Widths fit the longest value or header, plus padding, up to the cap."""
+    assert column_widths(DATA) == [len('First_Name') + 2, MAX_COLUMN_WIDTH]
+    assert column_widths(DATA, sample_rows=2) == [len('First_Name') + 2, len('8 ALICE ST APT 2') + 2]
+    assert column_widths(RESULTS['FullName']) == [len('Match Score') + 2, len('Sheet A Row') + 2, len('JOHN SMITH') + 2]
+
+
+def test_write_results_workbook():
+    """Data sheets come first, empty results get no sheet, and values and widths are written."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'results.xlsx')
+        write_results_workbook(path, RESULTS, {'Input': DATA})
+        workbook = openpyxl.load_workbook(path)
+        assert workbook.sheetnames == ['Input', 'results_FullName']
+        rows = list(workbook['Input'].iter_rows(values_only=True))
+        assert rows[0] == ('First_Name', 'Address1') and rows[2] == (None, '8 ALICE ST APT 2')
+        results = workbook['results_FullName']
+        assert list(results.iter_rows(min_row=2, values_only=True)) == [(100, 2, 'JOHN SMITH'), (92.31, 4, 'AL')]
+        assert results.column_dimensions['C'].width == len('JOHN SMITH') + 2
+
+
+def test_write_results_only():
+    """Results-only output writes no data sheets and points back to the source workbook."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        source_path = os.path.join(tmp_dir, 'source.xlsx')
+        write_results_workbook(source_path, {}, {'Input': DATA})
+        source = source_reference(source_path, {'Input': DATA})
+        assert source['source_workbook'] == source_path and source['sheet_rows'] == {'Input': 3}
+
+        base = os.path.join(tmp_dir, 'source_RESULTS')
+        assert write_results(base, RESULTS, 'xlsx', source=source) == [f'{base}.xlsx']
+        workbook = openpyxl.load_workbook(f'{base}.xlsx')
+        assert workbook.sheetnames == ['results_FullName', SOURCE_SHEET_NAME]
+        reference = dict(workbook[SOURCE_SHEET_NAME].iter_rows(min_row=2, values_only=True))
+        assert reference['sha256'] == source['sha256'] and reference['rows: Input'] == 3
+        # The reference sheet is not mistaken for a data sheet when the file is read back
+        assert read_data_sheets(f'{base}.xlsx') == {}
+
+        paths = write_results(base, RESULTS, 'csv', source=source)
+        assert paths == [f'{base}_results_FullName.csv', f'{base}_source.json']
+        assert pd.read_csv(paths[0])['Name A'].tolist() == ['JOHN SMITH', 'AL']
+        with open(paths[1]) as f:
+            assert json.load(f) == source
+
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            return
+        paths = write_results(base, RESULTS, 'parquet')
+        assert paths == [f'{base}_results_FullName.parquet']
+        assert pd.read_parquet(paths[0]).equals(RESULTS['FullName'])
+
+
+def test_unmatched_rows_written_with_results():
+    """Rows absent from every results table are written, numbered like Sheet A Row."""
+    unmatched = unmatched_rows(DATA, np.array([True, False, True]))
+    assert unmatched.to_dict('list') == {'Original_Row_Number': [3], 'First_Name': [None],
+                                         'Address1': ['8 ALICE ST APT 2']}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        base = os.path.join(tmp_dir, 'RESULTS')
+        write_results(base, RESULTS, 'xlsx', {'Input': DATA}, unmatched=unmatched)
+        workbook = openpyxl.load_workbook(f'{base}.xlsx')
+        assert workbook.sheetnames == ['Input', 'results_FullName', UNMATCHED_SHEET_NAME]
+        assert list(workbook[UNMATCHED_SHEET_NAME].iter_rows(min_row=2, values_only=True)) == \
+            [(3, None, '8 ALICE ST APT 2')]
+        # Not read back as a data sheet
+        assert list(read_data_sheets(f'{base}.xlsx', columns=None)) == ['Input']
+
+        paths = write_results(base, RESULTS, 'csv', unmatched=unmatched)
+        assert paths == [f'{base}_results_FullName.csv', f'{base}_{UNMATCHED_SHEET_NAME}.csv']
+        assert pd.read_csv(paths[1])['Original_Row_Number'].tolist() == [3]
+
+
+def test_write_results_rejects_bad_options():
+    """Unknown formats and data sheets outside xlsx are refused."""
+    for output_format, data_sheets in [('json', None), ('csv', {'Input': DATA})]:
+        try:
+            write_results('unused', RESULTS, output_format, data_sheets)
+        except ValueError:
+            continue
+        raise AssertionError(f"{output_format} with data sheets {data_sheets} was accepted")
+
+
+if __name__ == "__main__":
+    test_column_widths()
+    test_write_results_workbook()
+    test_write_results_only()
+    test_unmatched_rows_written_with_results()
+    test_write_results_rejects_bad_options()
+    print("✅ Results workbook writer works")
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""Test the memo cache on the field scorers."""
+
+from fuzzy_matcher import FieldScoreCache, MATCH_TYPES, preprocess_data, run_all_matches
+from test_single_pass import INPUT, MASTER
+
+
+def test_cache_keeps_results_and_counts_hits():
+    """Memoized scores give the same results, and repeated name pairs are cache hits."""
+    df1 = preprocess_data(INPUT)
+    df2 = preprocess_data(MASTER)
+    # Without the exact fast path, so every row's candidates are scored
+    uncached = run_all_matches(df1, df2, score_cache=FieldScoreCache(0), exact=False)
+    cache = FieldScoreCache()
+    cached = run_all_matches(df1, df2, score_cache=cache, exact=False)
+    for match_type in MATCH_TYPES:
+        assert cached[match_type].equals(uncached[match_type]), match_type
+
+    stats = cache.stats()
+    assert stats['names']['hits'] > 0  # e.g. WALKER vs WALKER for both ALICE WALKER rows
+    assert stats['names']['size'] == stats['names']['misses']
+
+    run_all_matches(df1, df2, score_cache=cache, exact=False)
+    assert cache.stats()['addresses']['misses'] == stats['addresses']['misses']  # All repeats now
+    cache.clear()
+    assert cache.stats()['names'] == {'hits': 0, 'misses': 0, 'hit_rate': 0.0, 'size': 0, 'maxsize': cache.maxsize}
+
+
+if __name__ == "__main__":
+    test_cache_keeps_results_and_counts_hits()
+    print("✅ Field score cache works")
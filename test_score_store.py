@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""Test that re-evaluating stored scores equals rerunning the matcher."""
+
+import numpy as np
+import pytest
+from fuzzy_matcher import (MATCH_TYPES, ScoreStore, combine_score_arrays, get_combined_score, preprocess_data,
+                           run_all_matches, run_specific_match)
+from test_single_pass import INPUT, MASTER
+
+LOW_THRESHOLDS = {'FullName': 50.0, 'LastNameAddress': 50.0, 'FullAddress': 50.0}
+
+
+def test_evaluate_matches_fresh_runs():
+    """Any threshold at or above the captured one gives the same results as a fresh run."""
+    df1 = preprocess_data(INPUT)
+    df2 = preprocess_data(MASTER)
+    store = ScoreStore()
+    run_all_matches(df1, df2, thresholds=LOW_THRESHOLDS, score_store=store)
+    assert len(store) > 0
+    for match_type in MATCH_TYPES:
+        for threshold in (50.0, 75.0, 85.0, 95.0):
+            fresh = run_specific_match(df1, df2, match_type, threshold)
+            assert store.evaluate(match_type, threshold).equals(fresh), (match_type, threshold)
+    with pytest.raises(ValueError):
+        store.evaluate('FullName', 40.0)
+
+
+def test_weights():
+    """Default-equivalent weights agree with the usual combination, and zero fields still veto."""
+    assert get_combined_score((90.0, 80.0, 0.0), 'FullName', (0.5, 0.5, 0.0)) == \
+        get_combined_score((90.0, 80.0, 0.0), 'FullName')
+    assert get_combined_score((0.0, 80.0, 90.0), 'LastNameAddress', (0.2, 0.4, 0.4)) == 0
+
+    df1 = preprocess_data(INPUT)
+    df2 = preprocess_data(MASTER)
+    store = ScoreStore()
+    results = run_all_matches(df1, df2, thresholds=LOW_THRESHOLDS, score_store=store)
+    assert store.evaluate('LastNameAddress', weights=(0.0, 0.5, 0.5)).equals(results['LastNameAddress'])
+    address_only = store.evaluate('LastNameAddress', weights=(0.0, 0.0, 1.0))
+    assert (address_only['Match Score'] >= 50.0).all()
+
+
+
+def test_combined_score_arrays_match_get_combined_score():
+    """The vectorized combination gives exactly the scores of get_combined_score."""
+    rng = np.random.default_rng(0)
+    first, last, address = (np.where(rng.random(500) < 0.2, 0.0, rng.uniform(0, 100, 500)) for _ in range(3))
+    for weights in (None, (0.3, 0.7, 0.0), (0.2, 0.4, 0.4)):
+        for match_type in MATCH_TYPES:
+            expected = [get_combined_score(scores, match_type, weights)
+                        for scores in zip(first.tolist(), last.tolist(), address.tolist())]
+            assert combine_score_arrays(first, last, address, match_type, weights).tolist() == expected
+
+
+if __name__ == "__main__":
+    test_evaluate_matches_fresh_runs()
+    test_weights()
+    test_combined_score_arrays_match_get_combined_score()
+    print("✅ Stored scores re-evaluate to the same results")
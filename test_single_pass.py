@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Test that the single-pass engine matches separate runs per match type."""
+
+import tempfile
+
+import numpy as np
+import pandas as pd
+from fuzzy_matcher import MATCH_TYPES, MasterIndex, ResultCache, preprocess_data, run_all_matches, run_specific_match
+from table_reader import read_table
+
+INPUT = pd.DataFrame({
+    'First_Name': ['JOHN', 'MARY', 'ALICE', 'PAT'],
+    'Last_Name': ['SMITH', 'JONES', 'WALKER', 'DOE'],
+    'Address1': ['15 CHAPMAN DR', '8 ALICE ST APT 2', '268 FLANDERS RD TRLR 9', '1 MAIN ST'],
+    'City': ['MYSTIC', 'NEW LONDON', 'MYSTIC', 'BOSTON'],
+    'State': ['CT', 'CT', 'CT', 'MA'],
+    'Zip': ['6355', '06320', '06355', '02101'],
+})
+MASTER = pd.DataFrame({
+    'FirstName': ['JON', 'MARY', 'ALICE', 'ALICE', 'JOHN'],
+    'LastName': ['SMITH', 'JONES', 'WALKER', 'WALKER', 'SMYTHE'],
+    'Address': ['15 CHAPMAN DRIVE', '8 ALICE ST', '268 FLANDERS RD', '268 FLANDERS RD', '16 CHAPMAN DR'],
+    'Address 2': ['', 'APT 2', 'LOT 3', 'TRLR 9', ''],
+    'City': ['MYSTIC', 'NEW LONDON', 'MYSTIC', 'MYSTIC', 'MYSTIC'],
+    'State': ['CT', 'CT', 'CT', 'CT', 'CT'],
+    'Zip5': ['06355', '06320', '06355', '06355', '06355'],
+})
+
+
+def test_single_pass_matches_separate_runs():
+    """run_all_matches returns exactly what run_specific_match returns for each match type."""
+    df1 = preprocess_data(INPUT)
+    df2 = preprocess_data(MASTER)
+    thresholds = {'FullName': 70.0, 'LastNameAddress': 60.0}
+    combined = run_all_matches(df1, df2, thresholds=thresholds)
+    assert list(combined) == MATCH_TYPES
+    for match_type in MATCH_TYPES:
+        separate = run_specific_match(df1, df2, match_type, thresholds.get(match_type))
+        assert combined[match_type].equals(separate), match_type
+
+
+
+def test_engine_reports_matched_rows():
+    """The matched-row mask covers duplicates, shards, ranked matches and cached results."""
+    input_raw = read_table('temp_input.csv')
+    nobody = pd.DataFrame({'First_Name': ['XAVIERA'], 'Last_Name': ['QUONK'], 'Address1': ['999 ZEPHYR WAY'],
+                           'City': ['NOWHERE'], 'State': ['AK'], 'Zip': ['99999']})
+    df1 = preprocess_data(pd.concat([input_raw, nobody, input_raw.iloc[:5], nobody], ignore_index=True))
+    master = MasterIndex(preprocess_data(read_table('temp_master.csv')))
+    thresholds = {'FullName': 90.0, 'LastNameAddress': 90.0, 'FullAddress': 90.0}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for options in ({}, {'workers': 2}, {'top_n': 2}, {'dedupe': False},
+                        {'result_cache': ResultCache(tmp_dir)}, {'result_cache': ResultCache(tmp_dir)}):
+            results, matched = run_all_matches(df1, master, thresholds=thresholds, return_matched=True, **options)
+            expected = np.zeros(len(df1), dtype=bool)
+            for results_df in results.values():
+                if not results_df.empty:
+                    expected[results_df['Sheet A Row'].to_numpy() - 2] = True
+            assert 0 < expected.sum() < len(df1)
+            assert matched.tolist() == expected.tolist(), options
+
+
+if __name__ == "__main__":
+    test_single_pass_matches_separate_runs()
+    test_engine_reports_matched_rows()
+    print("✅ Single-pass results match separate runs")
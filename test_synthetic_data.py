@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""Test the synthetic benchmark sheets and their perturbations."""
+
+import importlib.util
+
+import numpy as np
+from benchmarks.run_benchmarks import ENGINE_MODES, available_modes
+from benchmarks.synthetic_data import generate_sheets, perturb_record
+from fuzzy_matcher import preprocess_data
+
+RECORD = {'First_Name': 'JOHN', 'Last_Name': 'SMITH', 'Address1': '15 CHAPMAN ST APT 3',
+          'City': 'MYSTIC', 'State': 'CT', 'Zip': '06355'}
+
+
+def test_sheets_preprocess_and_repeat():
+    """Both sheets go through preprocess_data, and a seed always gives the same sheets."""
+    input_raw, master_raw, source_rows = generate_sheets(200, 50, seed=3)
+    df1, df2 = preprocess_data(input_raw), preprocess_data(master_raw)
+    assert len(df1) == 50 and len(df2) == 200
+    assert len(source_rows) == 50 and source_rows.max() < 200 and (source_rows >= 0).any()
+    again = generate_sheets(200, 50, seed=3)
+    assert again[0].equals(input_raw) and again[1].equals(master_raw)
+
+
+def test_perturbations():
+    """Each perturbation changes only what it names."""
+    rng = np.random.default_rng(0)
+    assert perturb_record(RECORD, 'street_suffix', rng)['Address1'] == '15 CHAPMAN STREET APT 3'
+    assert perturb_record(RECORD, 'zip_zero', rng)['Zip'] == '6355'
+    assert perturb_record(RECORD, 'house_number', rng)['Address1'].split(' ', 1)[1] == 'CHAPMAN ST APT 3'
+    assert perturb_record(RECORD, 'designator', rng)['Address1'] in ('15 CHAPMAN ST UNIT 3', '15 CHAPMAN ST APT 4')
+    typo = perturb_record(RECORD, 'typo', rng)
+    assert sum(typo[field] != RECORD[field] for field in RECORD) == 1
+
+
+
+def test_modes_without_requirements_are_skipped():
+    """The tfidf mode only runs when scikit-learn is installed."""
+    has_sklearn = importlib.util.find_spec('sklearn') is not None
+    assert available_modes(list(ENGINE_MODES)) == ['serial', 'blocked', 'parallel'] + (['tfidf'] if has_sklearn else [])
+
+
+if __name__ == "__main__":
+    test_sheets_preprocess_and_repeat()
+    test_perturbations()
+    test_modes_without_requirements_are_skipped()
+    print("✅ Synthetic benchmark sheets work")
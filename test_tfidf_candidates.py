@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""Test the TF-IDF character n-gram candidate generator."""
+
+import pytest
+
+pytest.importorskip('sklearn')
+
+from fuzzy_matcher import TfidfCandidateGenerator, preprocess_data, run_all_matches
+from test_single_pass import INPUT, MASTER
+
+
+def test_tfidf_candidates_rescored_and_ordered():
+    """Neighbors come back with token_set_ratio scores, best first, above the cutoff."""
+    choices = ['15 CHAPMAN DR, MYSTIC, CT 06355', '16 CHAPMAN DR, MYSTIC, CT 06355', '8 ALICE ST, NEW LONDON, CT 06320']
+    generator = TfidfCandidateGenerator(choices)
+    candidates = next(generator.candidates(['15 CHAPMAN DRIVE, MYSTIC, CT 06355'], score_cutoff=50.0))
+    assert [position for position, _ in candidates][:2] == [0, 1]
+    assert all(score >= 50.0 for _, score in candidates)
+    assert [score for _, score in candidates] == sorted((score for _, score in candidates), reverse=True)
+
+
+def test_tfidf_empty_master():
+    """A master with no n-grams yields no candidates instead of failing."""
+    assert list(TfidfCandidateGenerator(['', '']).candidates(['JOHN SMITH'], 0.0)) == [[]]
+
+
+def test_tfidf_matches_cdist_on_small_master():
+    """When every master row is a neighbor, TF-IDF and cdist candidates give the same matches."""
+    df1 = preprocess_data(INPUT)
+    df2 = preprocess_data(MASTER)
+    exact = run_all_matches(df1, df2)
+    approximate = run_all_matches(df1, df2, candidate_method='tfidf')
+    for match_type in exact:
+        assert approximate[match_type].equals(exact[match_type]), match_type
+
+
+if __name__ == "__main__":
+    test_tfidf_candidates_rescored_and_ordered()
+    test_tfidf_empty_master()
+    test_tfidf_matches_cdist_on_small_master()
+    print("✅ TF-IDF candidate generator works")
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""Test reporting the top N matches per input row."""
+
+import pandas as pd
+import pytest
+
+from fuzzy_matcher import MATCH_TYPES, MasterIndex, preprocess_data, run_all_matches
+from table_reader import read_table
+
+THRESHOLDS = {'FullName': 60.0, 'LastNameAddress': 60.0, 'FullAddress': 60.0}
+
+
+def test_top_n_extends_the_best_match():
+    input_raw = read_table('temp_input.csv')
+    df1 = preprocess_data(pd.concat([input_raw, input_raw.iloc[:5]], ignore_index=True))
+    master = MasterIndex(preprocess_data(read_table('temp_master.csv')))
+    best = run_all_matches(df1, master, thresholds=THRESHOLDS, exact=False)
+    top = run_all_matches(df1, master, thresholds=THRESHOLDS, top_n=3)
+    for match_type in MATCH_TYPES:
+        ranked = top[match_type]
+        assert ranked.groupby('Sheet A Row')['Rank'].apply(list).map(lambda r: r == list(range(1, len(r) + 1))).all()
+        assert (ranked.groupby('Sheet A Row')['Match Score'].diff().dropna() <= 0).all()
+        assert (ranked['Match Score'] >= THRESHOLDS[match_type]).all()
+
+        # Rank 1 is the match top_n=1 reports
+        first = ranked[ranked['Rank'] == 1].drop(columns='Rank').set_index('Sheet A Row').sort_index()
+        assert first.equals(best[match_type].set_index('Sheet A Row').sort_index()), match_type
+        assert (ranked['Rank'] > 1).any(), match_type
+
+        parallel = run_all_matches(df1, master, thresholds=THRESHOLDS, top_n=3, workers=2)[match_type]
+        assert parallel.equals(ranked), match_type
+
+    with pytest.raises(ValueError):
+        run_all_matches(df1, master, top_n=0)
+
+
+if __name__ == "__main__":
+    test_top_n_extends_the_best_match()
+    print("✅ Top-N matches extend the best match")
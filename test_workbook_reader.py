@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Test the streaming workbook reader against pd.read_excel."""
+
+import os
+import tempfile
+
+import openpyxl
+import pandas as pd
+from workbook_reader import iter_sheet_chunks, read_data_sheets, read_result_sheets, text_columns
+
+
+def write_workbook(path):
+    """Workbook with a data sheet (blank rows, numeric zips, extra columns) and a results sheet."""
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.title = 'Input'
+    sheet.append(['First_Name', 'Last_Name', 'MD5', 'Address1', 'City', 'State', 'Zip'])
+    sheet.append(['JOHN', 'SMITH', 'abc', '15 CHAPMAN DR', 'MYSTIC', 'CT', 6355])
+    sheet.append([])
+    sheet.append(['MARY', 'JONES', 'def', '8 ALICE ST', 'NEW LONDON', 'CT', '06320'])
+    sheet.append([None, 'DOE', None, 1, 'BOSTON', 'MA', 2101.0])
+    sheet.append([])
+    sheet.append([])
+    results = workbook.create_sheet('results_FullName')
+    results.append(['Match Score', 'Sheet A Row'])
+    results.append([100.0, 2])
+    workbook.create_sheet('Unmatched_Rows').append(['Original_Row_Number'])
+    workbook.save(path)
+
+
+def test_reader_matches_read_excel_rows():
+    """Same rows and positions as pd.read_excel, but text values and only requested columns."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'book.xlsx')
+        write_workbook(path)
+        sheets = read_data_sheets(path)
+        assert list(sheets) == ['Input']
+        df = sheets['Input']
+        expected = pd.read_excel(path, sheet_name='Input')
+        assert list(df.index) == list(expected.index)
+        assert 'MD5' not in df.columns
+        assert df['Zip'].tolist() == ['6355', None, '06320', '2101']
+        assert df['Address1'].tolist()[3] == '1'
+
+        results = read_result_sheets(path, columns=['Sheet A Row'])
+        assert results['results_FullName']['Sheet A Row'].tolist() == [2]
+
+
+def test_reader_chunks_keep_row_positions():
+    """Small chunks concatenate back to the full sheet with continuous positions."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'book.xlsx')
+        write_workbook(path)
+        workbook = openpyxl.load_workbook(path, read_only=True)
+        chunks = list(iter_sheet_chunks(workbook, 'Input', columns=None, chunk_rows=2))
+        workbook.close()
+        assert len(chunks) == 2
+        assert pd.concat(chunks).index.tolist() == [0, 1, 2, 3]
+
+
+def test_text_columns_of_typed_sheet():
+    """A sheet read with Excel types converts to the same text columns as a text read."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'book.xlsx')
+        write_workbook(path)
+        typed = read_data_sheets(path, columns=None, as_text=False)['Input']
+        assert typed['Zip'].tolist()[0] == 6355
+        assert text_columns(typed).equals(read_data_sheets(path)['Input'])
+
+
+if __name__ == "__main__":
+    test_reader_matches_read_excel_rows()
+    test_reader_chunks_keep_row_positions()
+    test_text_columns_of_typed_sheet()
+    print("✅ Streaming reader matches pd.read_excel")
@@ -0,0 +1,181 @@
+"""
+Streaming workbook reader for the fuzzy matcher.
+
+Reads data sheets with openpyxl in read-only mode, so large workbooks are parsed row by
+row instead of loaded whole. Sheets written by earlier runs (results_*, Unmatched_*,
+Source_Reference) are skipped, only the requested columns are kept, and every value is read
+as text so zip codes keep their leading zeros.
+"""
+
+import datetime
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import openpyxl
+import pandas as pd
+
+from fuzzy_matcher import SOURCE_COLUMNS
+from instrumentation import stage
+
+# Sheets written by the matcher itself rather than holding source data
+RESULT_SHEET_PREFIXES = ('results_', 'Unmatched_', 'Source_Reference')
+READ_CHUNK_ROWS = 50_000  # Rows per DataFrame chunk when streaming a sheet
+
+
+def is_result_sheet(sheet_name: str) -> bool:
+    """Return True for sheets written by the matcher (results_*, Unmatched_*, Source_Reference)."""
+    return sheet_name.startswith(RESULT_SHEET_PREFIXES)
+
+
+def cell_to_text(value) -> Optional[str]:
+    """Convert a cell value to text the way it reads in Excel (6355.0 -> '6355').
+
+    Args:
+        value: Cell value from openpyxl.
+
+    Returns:
+        Optional[str]: Text value, or None for an empty cell.
+    """
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, bool):
+        return 'TRUE' if value else 'FALSE'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, datetime.datetime) and value.time() == datetime.time():
+        return value.date().isoformat()
+    return str(value)
+
+
+def text_columns(df: pd.DataFrame, columns: Sequence[str] = SOURCE_COLUMNS) -> pd.DataFrame:
+    """Keep the given columns of a sheet read with as_text=False, as text like as_text=True reads them.
+
+    Lets one read of a workbook serve both the matcher (text) and copies of the sheets
+    that keep Excel value types.
+
+    Args:
+        df (pd.DataFrame): Sheet read with as_text=False.
+        columns (Sequence[str]): Column names to keep.
+
+    Returns:
+        pd.DataFrame: The kept columns, in sheet order, with text (str or None) values.
+    """
+    kept = [name for name in df.columns if name in columns]
+    return pd.DataFrame({name: df[name].map(cell_to_text) for name in kept}, index=df.index, dtype=object)
+
+
+def header_names(header_row: Sequence) -> List[str]:
+    """Name each header cell, using pandas' 'Unnamed: <i>' for blank headers."""
+    return [f'Unnamed: {i}' if value is None else str(value) for i, value in enumerate(header_row)]
+
+
+def iter_sheet_chunks(workbook, sheet_name: str, columns: Sequence[str] = SOURCE_COLUMNS,
+                      as_text: bool = True, chunk_rows: int = READ_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """Stream a sheet from an open read-only workbook as DataFrame chunks.
+
+    Blank rows between data rows are kept and trailing blank rows are dropped, the same
+    as pd.read_excel, so row positions still map to Excel row numbers (position + 2).
+
+    Args:
+        workbook: Workbook opened with openpyxl.load_workbook(..., read_only=True).
+        sheet_name (str): Sheet to read.
+        columns (Sequence[str]): Column names to keep; others are skipped. None keeps all.
+        as_text (bool): Read every value as text (str or None) instead of its Excel type.
+        chunk_rows (int): Rows per yielded chunk.
+
+    Yields:
+        pd.DataFrame: Consecutive chunks, indexed by row position within the sheet.
+    """
+    rows = workbook[sheet_name].iter_rows(values_only=True)
+    names = header_names(next(rows, ()))
+    keep = [i for i, name in enumerate(names) if columns is None or name in columns]
+    kept_names = [names[i] for i in keep]
+    convert = cell_to_text if as_text else (lambda value: value)
+
+    chunk = []
+    pending_blank = 0  # Blank rows are only kept once a later row has data
+    start = 0
+    for row in rows:
+        if all(value is None for value in row):
+            pending_blank += 1
+            continue
+        chunk.extend([[None] * len(keep)] * pending_blank)
+        pending_blank = 0
+        chunk.append([convert(row[i]) if i < len(row) else None for i in keep])
+        if len(chunk) >= chunk_rows:
+            yield pd.DataFrame(chunk, columns=kept_names, index=pd.RangeIndex(start, start + len(chunk)), dtype=object)
+            start += len(chunk)
+            chunk = []
+    if chunk or start == 0:
+        yield pd.DataFrame(chunk, columns=kept_names, index=pd.RangeIndex(start, start + len(chunk)), dtype=object)
+
+
+def read_sheet(path: str, sheet_name: str, columns: Sequence[str] = SOURCE_COLUMNS,
+               as_text: bool = True) -> pd.DataFrame:
+    """Read one sheet of a workbook with the streaming reader.
+
+    Args:
+        path (str): Workbook path (.xlsx or .xlsm).
+        sheet_name (str): Sheet to read.
+        columns (Sequence[str]): Column names to keep. None keeps all.
+        as_text (bool): Read every value as text.
+
+    Returns:
+        pd.DataFrame: The sheet, indexed by row position.
+    """
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        with stage('workbook_read', sheet=sheet_name):
+            return pd.concat(list(iter_sheet_chunks(workbook, sheet_name, columns, as_text)))
+    finally:
+        workbook.close()
+
+
+def read_data_sheets(path: str, columns: Sequence[str] = SOURCE_COLUMNS,
+                     as_text: bool = True) -> Dict[str, pd.DataFrame]:
+    """Read every data sheet of a workbook, skipping result sheets.
+
+    Args:
+        path (str): Workbook path (.xlsx or .xlsm).
+        columns (Sequence[str]): Column names to keep. None keeps all.
+        as_text (bool): Read every value as text.
+
+    Returns:
+        Dict[str, pd.DataFrame]: DataFrame per data sheet, in workbook order.
+
+    Example:
+        >>> sheets = read_data_sheets('FuzzyMatch_Tool.xlsm')
+        >>> list(sheets)
+        ['Input', 'Master']
+    """
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        sheets = {}
+        for sheet_name in workbook.sheetnames:
+            if not is_result_sheet(sheet_name):
+                with stage('workbook_read', sheet=sheet_name):
+                    sheets[sheet_name] = pd.concat(list(iter_sheet_chunks(workbook, sheet_name, columns, as_text)))
+        return sheets
+    finally:
+        workbook.close()
+
+
+def read_result_sheets(path: str, columns: Sequence[str] = None) -> Dict[str, pd.DataFrame]:
+    """Read the results_* sheets written by an earlier run, keeping Excel value types.
+
+    Args:
+        path (str): Workbook path (.xlsx or .xlsm).
+        columns (Sequence[str]): Column names to keep, e.g. ['Sheet A Row']. None keeps all.
+
+    Returns:
+        Dict[str, pd.DataFrame]: DataFrame per results sheet.
+    """
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        sheets = {}
+        for sheet_name in workbook.sheetnames:
+            if sheet_name.startswith('results_'):
+                with stage('workbook_read', sheet=sheet_name):
+                    sheets[sheet_name] = pd.concat(list(iter_sheet_chunks(workbook, sheet_name, columns, as_text=False)))
+        return sheets
+    finally:
+        workbook.close()